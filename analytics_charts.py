@@ -1,14 +1,27 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from collections import Counter
 import os
+import uuid
+
+import func_spec
+from llm_cache import stream_completion
+from llm_gateway import gateway_client
+from prompt_builder import build_prompt, format_qa, prompt_settings
+from scoring import get_engine
+from text_profile import TextProfile
 
 try:
     import openai
 except ImportError:
     openai = None
 
+def _llm_client():
+    # This session's handle on the shared LLM gateway
+    if "session_key" not in st.session_state:
+        st.session_state["session_key"] = uuid.uuid4().hex
+    return gateway_client(st.session_state["session_key"])
+
 def render_analytics_charts(answers):
     """
     Render analytics graphs and charts based on answers and gaps.
@@ -70,8 +83,8 @@ def render_analytics_charts(answers):
     
     # Example keywords for AI safety
     safety_keywords = ["bias", "fairness", "ethics", "content", "monitor", "red-team", "risk", "compliance", "security", "privacy"]
-    all_text = " ".join([str(q.get("answer", "")) for q in fixed] + [str(op.get("answer", "")) for op in open_blocks]).lower()
-    safety_hits = sum(1 for kw in safety_keywords if kw in all_text)
+    profile = TextProfile([q.get("answer", "") for q in fixed] + [op.get("answer", "") for op in open_blocks])
+    safety_hits = sum(1 for kw in safety_keywords if profile.mentions(kw))
     safety_score = min(1 + safety_hits * 3, 20)
     st.progress(safety_score / 20, text=f"AI Safety Posture: {safety_score}/20")
     if safety_score < 10:
@@ -95,39 +108,20 @@ def render_analytics_charts(answers):
     # --- Spider Web Chart (Radar) ---
     st.markdown("---")
     st.subheader("AI Maturity Spider Web Chart")
-    pillar_names = [
-        "Business & Strategic Alignment",
-        "Scope & Use Cases",
-        "Technology & Integration",
-        "Risk, Governance & Operations",
-        "Infrastructure, AI Readiness & Security",
-        "Model & Platform",
-        "Validation & Testing"
-    ]
-    
+    engine = get_engine()
+    pillar_names = engine.pillars
+
     # Try to get pillar scores from answers if present
     pillar_scores = None
     if isinstance(answers, dict) and "pillar_scores" in answers:
         pillar_scores = answers["pillar_scores"]
     else:
-        # Try to infer from text (simple keyword scan)
-        seeds = {
-            "Business & Strategic Alignment": ["kpi","csat","nps","journey","omni","target","conversion"],
-            "Scope & Use Cases": ["intent","journey","transfer","transaction","multilingual","language"],
-            "Technology & Integration": ["api","middleware","sso","otp","biometric","whatsapp","ivr"],
-            "Risk, Governance & Operations": ["handoff","sla","monitor","feedback","bias","fairness","ethics","content"],
-            "Infrastructure, AI Readiness & Security": ["gpu","h100","a100","mlops","databricks","sagemaker","vertex","gateway","apigee","kong","mulesoft","prometheus","grafana","elastic","dr","ha","sandbox"],
-            "Model & Platform": ["openai","azure","anthropic","cohere","dbrx","llama","embedding","fine-tune"],
-            "Validation & Testing": ["eval","dataset","metrics","red-team","test","qa","sign-off","sandbox"]
-        }
-        pillar_scores = []
-        for name, kws in seeds.items():
-            hits = sum(1 for kw in kws if kw in all_text)
-            score = min(1 + hits*2, 20)
-            pillar_scores.append(score)
+        # Infer from text with the shared keyword scorer
+        scored = engine.score_answers(answers)
+        pillar_scores = [p["score"] for p in scored["pillars"]]
 
     radar_df = pd.DataFrame({"Pillar": pillar_names, "Score": pillar_scores})
-    fig_radar = px.line_polar(radar_df, r="Score", theta="Pillar", line_close=True, title="AI Maturity Spider Web Chart", range_r=[0,20])
+    fig_radar = px.line_polar(radar_df, r="Score", theta="Pillar", line_close=True, title="AI Maturity Spider Web Chart", range_r=[0, engine.max_per_pillar])
     st.plotly_chart(fig_radar, use_container_width=True)
     st.info("This chart visualizes the AI maturity posture across key pillars. Scores are based on keyword analysis of answers.")
 
@@ -142,15 +136,12 @@ def render_analytics_charts(answers):
     st.write(f"**Shortest Answer:** {shortest if shortest else 'N/A'}")
 
     # Most frequent keywords
-    words = [w for a in all_answers for w in str(a).lower().split() if len(w) > 3]
-    common = Counter(words).most_common(5)
+    common = profile.top_terms(5, min_length=4)
     st.write("**Top 5 Keywords:**", ", ".join([f"{w} ({c})" for w, c in common]) if common else "N/A")
 
     # Sentiment analysis (simple)
-    pos_words = ["success","growth","positive","improve","efficient","secure","compliant"]
-    neg_words = ["risk","fail","blocker","issue","problem","bias","concern"]
-    pos_count = sum(1 for w in words if w in pos_words)
-    neg_count = sum(1 for w in words if w in neg_words)
+    pos_count = profile.term_counts["positive"]
+    neg_count = profile.term_counts["negative"]
     st.write(f"**Positive Sentiment Hits:** {pos_count}")
     st.write(f"**Negative Sentiment Hits:** {neg_count}")
     st.info("These analytics highlight interesting patterns and outliers in the survey responses.")
@@ -174,121 +165,122 @@ def render_analytics_charts(answers):
     # --- Expert AI Consolidated Analysis Section ---
     st.markdown("---")
     st.subheader("🤖 Expert AI Consolidated Analysis")
-    try:
-        import openai
-    except ImportError:
-        openai = None
-        
-    def get_expert_analysis(questions, answers, analytics_summary):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key or openai is None:
-            st.error("OpenAI API key not found or openai package missing.")
-            return ""
-        client = openai.OpenAI(api_key=api_key)
-        prompt = f"""
-You are an AI agent with the DNA of a top Business Requirements Expert and Technical Architect (think Google-level). Given the following survey questions, answers, and analytics, provide a consolidated analysis, requirements summary, and actionable recommendations for building a Conversational Banking Chatbot.
-
-Questions:
-{questions}
-
-Answers:
-{answers}
-
-Analytics Summary:
-{analytics_summary}
-
-Your response should be structured, insightful, and cover both business and technical perspectives.
-"""
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=800,
-                temperature=0.3
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            st.error(f"Error calling OpenAI API: {str(e)}")
-            return ""
 
     # Prepare data for expert analysis
     questions_list = [q.get("question", f"Q{q.get('id','')}") for q in fixed]
-    answers_list = [str(q.get("answer", "")) for q in fixed]
     open_questions = [op.get("prompt", f"Open {i+1}") for i, op in enumerate(open_blocks)]
     open_answers = [str(op.get("answer", "")) for op in open_blocks]
-    analytics_summary = f"Safety Score: {safety_score}/20, Top Keywords: {', '.join([w for w, c in common])}, Positive Sentiment: {pos_count}, Negative Sentiment: {neg_count}"
-    all_questions = questions_list + open_questions
-    all_answers = answers_list + open_answers
+    # Compact Q/A block shared by the expert-analysis and spec prompts, capped at the survey budget
+    survey_block = format_qa(
+        [(q, fq.get("answer")) for q, fq in zip(questions_list, fixed)] + list(zip(open_questions, open_answers)),
+        prompt_settings()["survey_budget_tokens"],
+    )
 
     expert_output = ""
     if st.button("Get Expert AI Analysis", key="get_expert_analysis"):
         if not openai:
             st.error("OpenAI package is not installed. Please install it first.")
             return
-        with st.spinner("Generating expert analysis..."):
-            try:
-                client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-                expert_prompt = f"""Analyze these survey responses and provide insights:\nQuestions: {questions_list}\nAnswers: {answers_list}\nOpen Questions: {open_questions}\nOpen Answers: {open_answers}"""
-                response = client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[{"role": "user", "content": expert_prompt}],
-                    max_tokens=1000
-                )
-                expert_output = response.choices[0].message.content
-                st.write(f"[DEBUG] OpenAI raw response: {repr(response)}")
-                if not expert_output or len(expert_output) < 10:
-                    st.error("OpenAI did not return a valid expert analysis. Please try again or check your API usage.")
-                    st.write(f"[DEBUG] OpenAI response: {repr(expert_output)}")
-                    return
-                st.session_state['expert_output'] = expert_output
-                st.markdown("### Expert AI Analysis")
-                st.write(expert_output)
-            except Exception as e:
-                st.error(f"Error generating expert analysis: {str(e)}")
-                st.write(f"[DEBUG] Exception: {repr(e)}")
+        try:
+            client = _llm_client()
+            if client is None:
+                st.error("OPENAI_API_KEY is not set.")
+                return
+            expert_prompt = build_prompt("expert_analysis", "Analyze these survey responses and provide insights:\n{survey}",
+                                         survey=survey_block)
+            st.markdown("### Expert AI Analysis")
+            expert_output = st.write_stream(stream_completion(client, "gpt-4", [{"role": "user", "content": expert_prompt}],
+                                                              max_tokens=1000, validate=lambda t: len(t) >= 10))
+            expert_output = expert_output.strip() if isinstance(expert_output, str) else ""
+            if len(expert_output) < 10:
+                st.error("OpenAI did not return a valid expert analysis. Please try again or check your API usage.")
+                return
+            st.session_state['expert_output'] = expert_output
+        except Exception as e:
+            st.error(f"Error generating expert analysis: {str(e)}")
 
     # Functional Specification Button
     st.markdown("---")
     st.subheader("Generate Functional Specification")
-    if st.button("Create Functional Specification", key="create_func_spec"):
+    spec_settings = func_spec.spec_settings()
+    modes = ["Sectioned (parallel)", "Single completion (streaming)"]
+    spec_mode = st.radio("Generation mode", modes, index=0 if spec_settings["mode"] == "sectioned" else 1,
+                         horizontal=True, key="func_spec_mode")
+    survey_data = survey_block[0]
+    stored_expert_output = st.session_state.get('expert_output', '')
+    # Sections from the last sectioned run, reused by "Retry Failed Sections" while the inputs are unchanged
+    spec_sig = hash((stored_expert_output, survey_data))
+    previous = st.session_state.get("func_spec_sections")
+    if previous and previous.get("sig") != spec_sig:
+        previous = None
+    create = st.button("Create Functional Specification", key="create_func_spec")
+    retry = bool(previous and previous["errors"]) and spec_mode == modes[0] and \
+        st.button(f"Retry Failed Sections ({len(previous['errors'])})", key="retry_func_spec")
+    if create or retry:
         if not openai:
             st.error("OpenAI package is not installed. Please install it first.")
             return
-        stored_expert_output = st.session_state.get('expert_output', '')
         if not stored_expert_output or not isinstance(stored_expert_output, str) or len(stored_expert_output.strip()) < 10:
             st.warning("Please generate Expert AI Analysis first! (No valid expert output found)")
-            st.write(f"[DEBUG] expert_output: {repr(stored_expert_output)}")
             return
-        with st.spinner("Generating functional specification..."):
-            try:
-                client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-                func_spec_prompt = f"""As a senior Business and Technical Analyst, create a comprehensive Functional Specification for a Conversational Banking application based on this analysis:\n\nExpert Analysis:\n{stored_expert_output}\n\nSurvey Data:\nQuestions: {questions_list}\nAnswers: {answers_list}\nOpen Questions: {open_questions}\nOpen Answers: {open_answers}\n\nInclude detailed sections for:\n1. System Overview\n2. User Requirements\n3. Functional Requirements\n4. Technical Architecture\n5. Security & Compliance\n6. Performance Requirements\n7. User Interface\n8. Testing Requirements\n9. Implementation Plan\n10. Success Metrics"""
-                func_spec = client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "You are a senior Business and Technical Analyst at a top-tier technology consulting firm, specializing in AI and Banking solutions."},
+        try:
+            client = _llm_client()
+            if client is None:
+                st.error("OPENAI_API_KEY is not set.")
+                return
+            st.markdown("### 📋 Functional Specification")
+            if spec_mode == modes[0]:
+                keep = previous["sections"] if retry else None
+                placeholders = [st.empty() for _ in func_spec.SPEC_SECTIONS]
+                for i, text in enumerate(keep or []):
+                    if text:
+                        placeholders[i].markdown(text)
+                for i, title in enumerate(func_spec.SPEC_SECTIONS):
+                    if not (keep and keep[i]):
+                        placeholders[i].caption(f"⏳ {i + 1}. {title} — generating…")
+
+                def show(i, text, error):
+                    if error is None:
+                        placeholders[i].markdown(text)
+                    else:
+                        placeholders[i].error(f"{i + 1}. {func_spec.SPEC_SECTIONS[i]} failed: {error}")
+
+                result = func_spec.generate_sections(client, stored_expert_output, survey_data, previous=keep,
+                                                     settings=spec_settings, on_section=show)
+                st.session_state["func_spec_sections"] = {"sig": spec_sig, **result}
+                if result["errors"]:
+                    st.warning(f"{len(result['errors'])} section(s) failed. Use \"Retry Failed Sections\" to regenerate only those.")
+                spec_output = func_spec.stitch(result["sections"])
+            else:
+                func_spec_prompt = build_prompt(
+                    "functional_spec",
+                    "As a senior Business and Technical Analyst, create a comprehensive Functional Specification for a Conversational Banking application based on this analysis:\n\nExpert Analysis:\n{expert}\n\nSurvey Data:\n{survey}\n\nInclude detailed sections for:\n1. System Overview\n2. User Requirements\n3. Functional Requirements\n4. Technical Architecture\n5. Security & Compliance\n6. Performance Requirements\n7. User Interface\n8. Testing Requirements\n9. Implementation Plan\n10. Success Metrics",
+                    expert=stored_expert_output,
+                    survey=survey_block,
+                )
+                spec_output = st.write_stream(stream_completion(
+                    client,
+                    spec_settings["model"],
+                    [
+                        {"role": "system", "content": func_spec.SYSTEM_PROMPT},
                         {"role": "user", "content": func_spec_prompt}
                     ],
+                    temperature=spec_settings["temperature"],
                     max_tokens=3000,
-                    temperature=0.2
-                )
-                spec_output = func_spec.choices[0].message.content.strip()
-                st.write(f"[DEBUG] OpenAI raw response: {repr(func_spec)}")
-                if not spec_output or len(spec_output) < 20:
+                    validate=lambda t: len(t) >= 20,
+                ))
+                spec_output = spec_output.strip() if isinstance(spec_output, str) else ""
+                if len(spec_output) < 20:
                     st.error("OpenAI did not return a valid functional specification. Please try again or check your API usage.")
-                    st.write(f"[DEBUG] OpenAI response: {repr(spec_output)}")
                     return
-                st.markdown("### 📋 Functional Specification")
-                st.markdown(spec_output)
-                from datetime import datetime
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                spec_filename = f"Functional_Spec_{timestamp}.md"
-                st.download_button(
-                    label="Download Functional Spec",
-                    data=spec_output,
-                    file_name=spec_filename,
-                    mime="text/markdown"
-                )
-            except Exception as e:
-                st.error(f"Error generating functional specification: {str(e)}")
-                st.write(f"[DEBUG] Exception: {repr(e)}")
+            from datetime import datetime
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            spec_filename = f"Functional_Spec_{timestamp}.md"
+            st.download_button(
+                label="Download Functional Spec",
+                data=spec_output,
+                file_name=spec_filename,
+                mime="text/markdown"
+            )
+        except Exception as e:
+            st.error(f"Error generating functional specification: {str(e)}")
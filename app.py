@@ -1,5 +1,5 @@
 import streamlit as st
-import os, json, time, configparser, re, string
+import os, json, time, configparser, re, functools, uuid
 from bson import ObjectId
 from dotenv import load_dotenv
 load_dotenv()
@@ -7,67 +7,23 @@ from datetime import datetime
 from typing import List, Dict, Any
 
 import pandas as pd
-import textwrap
-
-# Helper to wrap long words for FPDF
-def safe_multicell_text(text, width=40):
-    """
-    Aggressively sanitizes and wraps text for FPDF multi_cell to prevent FPDFException.
-    """
-    if not text:
-        return ""
-
-    # 1. Convert to string and normalize whitespace
-    text_str = str(text).strip()
-    text_str = re.sub(r'\s+', ' ', text_str.replace('\r\n', ' ').replace('\r', ' ').replace('\n', ' '))
-
-    # 2. Filter out any characters that are not standard printable ASCII
-    # This is more aggressive to prevent issues with characters FPDF can't handle.
-    printable = set(string.printable)
-    text_str = ''.join(filter(lambda x: x in printable, text_str))
-
-    # 3. Use textwrap for robust wrapping
-    wrapped_text = textwrap.fill(
-        text_str,
-        width=width,
-        break_long_words=True,
-        break_on_hyphens=False,
-        replace_whitespace=True # Ensures all whitespace is single spaces
-    )
-
-    # 4. Final truncation for safety
-    if len(wrapped_text) > 2000:
-        wrapped_text = wrapped_text[:2000] + "..."
-
-    return wrapped_text
-
-def render_text_in_cell(pdf, text, width):
-    """
-    Manually renders text in a cell, handling line breaks to avoid FPDFException.
-    """
-    lines = text.split('\n')
-    for line in lines:
-        if pdf.get_string_width(line) < width:
-            pdf.cell(0, 6, line, ln=True)
-        else:
-            # Line is too long, needs wrapping
-            words = line.split(' ')
-            current_line = ''
-            for word in words:
-                if pdf.get_string_width(current_line + word + ' ') < width:
-                    current_line += word + ' '
-                else:
-                    pdf.cell(0, 6, current_line, ln=True)
-                    current_line = word + ' '
-            pdf.cell(0, 6, current_line, ln=True) # Last line
 
 # Optional deps
-from db_client import get_db, mongo_ping
-
-try:
-    from openai import OpenAI
-except Exception:
-    OpenAI = None
+from bulk_export import export_file_path, export_pdf_zip, export_table, read_export, sweep_exports
+from db_client import get_db, mongo_ping, pool_stats
+from figure_cache import get_figure_cache
+from followup_prefetch import answer_hash, get_prefetcher
+from health_monitor import get_monitor, status_line
+from llm_cache import cached_completion, get_llm_cache
+from llm_client import client_stats
+from llm_gateway import gateway_client, get_gateway
+from local_followups import local_followups
+from pdf_worker import get_pdf_worker
+from pillar_stats import read_stats, rebuild, stats_collection
+from prompt_builder import PROMPT_STATS, build_prompt, prompt_settings, summarize
+from scoring import get_engine, score_answers
+from submissions import (ADMIN_SORT, build_admin_query, cache_stats, ensure_indexes_async, fetch_document,
+                         fetch_latest_scored, fetch_page, insert_submission, save_scores)
 
 st.set_page_config(page_title="Conversational Banking – Pre‑POC (v4)", layout="wide")
 
@@ -89,48 +45,98 @@ def get_questions(_cfg: configparser.ConfigParser) -> List[Dict[str, Any]]:
     data = _cfg["QUESTIONS"]["questions_json"]
     return json.loads(data)
 
-def openai_followups(k: int, sys_prompt: str, user_tmpl: str, answer: str, model: str, temperature: float, max_tokens: int) -> List[str]:
-    api_key = os.getenv("OPENAI_API_KEY", "")
-    if not api_key or OpenAI is None:
-        # deterministic fallback
-        return [
-            "Which systems/APIs are involved here?",
-            "How will you measure success in this area?",
-            "What security or compliance constraints apply?",
-            "Who owns this process end-to-end?",
-            "What is the main failure mode today?"
-        ][:k]
-    client = OpenAI(api_key=api_key)
+def strip_json_fence(raw_content: str) -> str:
+    if raw_content.startswith('```json'):
+        raw_content = raw_content[7:]
+    if raw_content.startswith('```'):
+        raw_content = raw_content[3:]
+    if raw_content.endswith('```'):
+        raw_content = raw_content[:-3]
+    match = re.search(r'(\[.*\])', raw_content, re.DOTALL)
+    if match:
+        raw_content = match.group(1)
+    return raw_content
+
+def parse_single_followup(raw_content: str) -> list:
     try:
-        content = client.chat.completions.create(
-            model=model,
-            temperature=temperature,
-            messages=[
-                {"role":"system","content":sys_prompt},
-                {"role":"user","content":user_tmpl.format(answer=answer)}
-            ],
-            max_tokens=max_tokens
-        ).choices[0].message.content.strip()
-        # Remove code block markers and filter out junk
-        content = re.sub(r"^```[a-zA-Z]*", "", content)
-        content = content.replace("```", "").strip()
-        # Try JSON parse first
-        try:
-            arr = json.loads(content)
-            if isinstance(arr, list):
-                arr = [str(x).strip() for x in arr if x and isinstance(x, str) and len(x.strip()) > 5]
-                if arr:
-                    return arr[:k]
-        except Exception:
-            pass
-        # Fallback: split lines, filter out short/junk lines
-        lines = [ln.strip("- •* ").strip() for ln in content.splitlines() if ln.strip()]
-        # Remove lines that are just '[', ']', 'ok', or too short
-        clean_lines = [ln for ln in lines if ln not in ("[", "]", "ok", "", "null") and len(ln) > 5]
-        if clean_lines:
-            return clean_lines[:k]
-        # Final fallback
-        return ["Please provide more details.","Any metrics?","Any blockers?","Owners?","Risks?"][:k]
+        followup = json.loads(strip_json_fence(raw_content))
+    except Exception:
+        return []
+    return followup if isinstance(followup, list) else []
+
+# Section 2 deep-dives start from "What is your goal in this POC?"; the local engine uses
+# this pillar/category for its gap questions when the answer hits no pillar keywords
+SECTION2_PILLAR = "Business & Strategic Alignment"
+SECTION2_CATEGORY = "Business/Strategy"
+
+SECTION2_SYSTEM_PROMPT = "You are a critical thinking AI consultant. Based on the user's last answer, ask a deeper, more probing follow-up question to clarify their true objectives and challenges for a banking chatbot POC. Avoid generic questions; be analytical and specific."
+
+def llm_client():
+    """
+    This session's handle on the shared LLM gateway, or None without an API key.
+    """
+    if "session_key" not in st.session_state:
+        st.session_state["session_key"] = uuid.uuid4().hex
+    return gateway_client(st.session_state["session_key"])
+
+def followup_engine(cfg) -> str:
+    """
+    "llm", "local" or "hybrid" (LLM with the local engine as an instant fallback), from config.ini.
+    """
+    engine = cfg["DYNAMIC_FOLLOWUPS"].get("engine", "llm").strip().lower()
+    return engine if engine in ("llm", "local", "hybrid") else "llm"
+
+def section2_followup(ans: str, cfg, session: str) -> list:
+    """
+    Generates the next Section 2 question for `ans`; returns a one-element list when valid.
+    Safe to call from a background thread (no Streamlit calls).
+    """
+    model = cfg["OPENAI"]["model"]
+    temperature = float(cfg["OPENAI"]["temperature"])
+    max_tokens = int(cfg["OPENAI"]["max_tokens"])
+    user_prompt = build_prompt("section2_followup", "User's previous answer: '{answer}'. Generate one deep, analytical follow-up question only as a JSON list of one string.",
+                               answer=summarize(ans, prompt_settings()["answer_budget_tokens"]))
+    client = gateway_client(session)
+    if client is None:
+        raise RuntimeError("OPENAI_API_KEY not set or openai package missing.")
+    messages = [{"role": "system", "content": SECTION2_SYSTEM_PROMPT}, {"role": "user", "content": user_prompt}]
+    raw_content = cached_completion(client, model, messages, temperature, max_tokens,
+                                    validate=lambda c: len(parse_single_followup(c)) == 1)
+    return parse_single_followup(raw_content)
+
+def parse_followups(content: str, k: int) -> List[str]:
+    # Remove code block markers and filter out junk
+    content = re.sub(r"^```[a-zA-Z]*", "", content)
+    content = content.replace("```", "").strip()
+    # Try JSON parse first
+    try:
+        arr = json.loads(content)
+        if isinstance(arr, list):
+            arr = [str(x).strip() for x in arr if x and isinstance(x, str) and len(x.strip()) > 5]
+            if arr:
+                return arr[:k]
+    except Exception:
+        pass
+    # Fallback: split lines, filter out short/junk lines
+    lines = [ln.strip("- •* ").strip() for ln in content.splitlines() if ln.strip()]
+    # Remove lines that are just '[', ']', 'ok', or too short
+    clean_lines = [ln for ln in lines if ln not in ("[", "]", "ok", "", "null") and len(ln) > 5]
+    return clean_lines[:k]
+
+def openai_followups(k: int, sys_prompt: str, user_tmpl: str, answer: str, model: str, temperature: float, max_tokens: int,
+                     engine: str = "llm", pillar: str = None, category: str = None) -> List[str]:
+    client = llm_client()
+    if client is None or engine == "local":
+        # Answer-specific questions from the local template engine
+        return local_followups(answer, k, pillar=pillar, category=category)
+    try:
+        messages = [
+            {"role":"system","content":sys_prompt},
+            {"role":"user","content":build_prompt("open_followups", user_tmpl, answer=summarize(answer, prompt_settings()["answer_budget_tokens"]))}
+        ]
+        content = cached_completion(client, model, messages, temperature, max_tokens,
+                                    validate=lambda c: bool(parse_followups(c, k)))
+        return parse_followups(content, k) or ["Please provide more details.","Any metrics?","Any blockers?","Owners?","Risks?"][:k]
     except Exception as e:
         st.warning(f"Follow-up generation failed; using defaults. ({e})")
         return ["Please provide more details.","Any metrics?","Any blockers?","Owners?","Risks?"][:k]
@@ -161,41 +167,20 @@ def login_screen(cfg):
             st.write(f"[DEBUG] Login failed. Credentials or username invalid.")
 
 def header_bar():
-    # MongoDB diagnostic block
+    # Connectivity comes from the background health monitor, so reruns never wait on the network
+    monitor = get_monitor()
     if st.session_state.get('role'):
-        try:
-            db = get_db()
-            if db is not None:
-                st.success("")
-            else:
-                st.error("MongoDB not connected.")
-        except Exception as e:
-            st.error(f"MongoDB connection test failed: {e}")
+        mongo = monitor.status("mongo")
+        if mongo["ok"] is False:
+            st.error(f"MongoDB not connected: {mongo['detail']}")
     left, mid, right = st.columns([0.25,0.5,0.25])
     with left:
         st.caption("Conversational Banking – Pre‑POC Discovery (v4)")
         st.write(f"**User:** {st.session_state.get('username','')} ({st.session_state.get('role','')})")
     with mid:
         # Connection status
-        openai_status = "❌ OpenAI Not Connected"
-        mongo_status = "❌ MongoDB Not Connected"
-        try:
-            api_key = os.getenv("OPENAI_API_KEY", "")
-            if OpenAI and api_key:
-                client = OpenAI(api_key=api_key)
-                models = client.models.list()
-                if hasattr(models, "data") and len(models.data) > 0:
-                    openai_status = "✅ OpenAI Connected"
-        except Exception:
-            pass
-        try:
-            db = get_db()
-            if db is not None:
-                mongo_status = "✅ MongoDB Connected"
-        except Exception:
-            pass
-        st.write(openai_status)
-        st.write(mongo_status)
+        st.write(status_line("openai", "OpenAI"))
+        st.write(status_line("mongo", "MongoDB"))
     with right:
         st.image("Logo.png", width=140)
         st.write("")
@@ -219,16 +204,10 @@ def help_bubble(text: str, key: str):
         question = f"Explain in simple, friendly language how someone should answer this banking survey question: '{q}'. Give practical tips and examples so anyone can understand what to write."
         tip = None
         try:
-            api_key = os.getenv("OPENAI_API_KEY", "")
-            if OpenAI and api_key:
-                client = OpenAI(api_key=api_key)
-                resp = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": question}],
-                    max_tokens=80,
-                    temperature=0.3
-                )
-                tip = resp.choices[0].message.content.strip()
+            client = llm_client()
+            if client is not None:
+                tip = cached_completion(client, "gpt-3.5-turbo", [{"role": "user", "content": question}],
+                                        temperature=0.3, max_tokens=80)
         except Exception:
             tip = None
         text = tip or "Provide clear, specific, and relevant details to help us understand your answer."
@@ -240,6 +219,26 @@ def help_bubble(text: str, key: str):
         with st.expander("ⓘ Details"):
             st.write(text)
 
+def _survey_pdf_pending(key: str):
+    if get_pdf_worker().wait(key, timeout=0.5) != "pending":
+        st.rerun()
+    st.caption("Preparing survey responses PDF…")
+
+def survey_pdf_download(key: str):
+    """
+    Serves the background-rendered survey PDF. While the worker is still rendering,
+    only a small polling fragment reruns, not the whole page.
+    """
+    worker = get_pdf_worker()
+    status = worker.wait(key, timeout=0.5)
+    if status == "pending":
+        st.fragment(_survey_pdf_pending, run_every=1.0)(key)
+    elif status == "failed":
+        st.warning(f"Survey PDF could not be generated: {worker.error(key) or 'file not found'}")
+    else:
+        st.download_button("Download Survey Responses PDF", worker.fetch(key), file_name="CB_Survey_Responses.pdf",
+                           mime="application/pdf", on_click="ignore", key="survey_pdf_download")
+
 def render_question(q: Dict[str, Any], key_prefix=""):
     qid = q["id"]
     label = f"{qid} — {q['text']}"
@@ -413,6 +412,16 @@ def page_survey(cfg, role):
         ans = st.text_area(section2_questions[section2_step], value=section2_answers[section2_step], key=f"section2_input_{section2_step}_{len(section2_questions)}_{id(section2_questions)}")
         section2_answers[section2_step] = ans
         st.session_state["section2_answers"] = section2_answers
+        # Start generating the next question in the background while the answer is unchanged
+        prefetcher = get_prefetcher(float(cfg["DYNAMIC_FOLLOWUPS"].get("prefetch_debounce_seconds", "1.0")))
+        if "session_key" not in st.session_state:
+            st.session_state["session_key"] = uuid.uuid4().hex
+        session_key = st.session_state["session_key"]
+        prefetch_slot = (session_key, section2_step)
+        engine = followup_engine(cfg)
+        use_llm = engine != "local" and llm_client() is not None
+        if use_llm and section2_step < 4 and ans.strip():
+            prefetcher.schedule(prefetch_slot, answer_hash(ans), functools.partial(section2_followup, ans, cfg, session_key))
         col1, col2 = st.columns([0.3,0.7])
         with col1:
             if section2_step > 0:
@@ -424,39 +433,20 @@ def page_survey(cfg, role):
             if section2_step < 4:
                 if st.button("Next (Section 2)", key=f"section2_next_{section2_step}"):
                     if ans.strip():
-                        # Generate next question using OpenAI
-                        import openai, configparser
-                        cfg = configparser.ConfigParser()
-                        cfg.read("config.ini")
-                        model = cfg["OPENAI"]["model"]
-                        temperature = float(cfg["OPENAI"]["temperature"])
-                        max_tokens = int(cfg["OPENAI"]["max_tokens"])
-                        system_prompt = "You are a critical thinking AI consultant. Based on the user's last answer, ask a deeper, more probing follow-up question to clarify their true objectives and challenges for a banking chatbot POC. Avoid generic questions; be analytical and specific."
-                        user_prompt = f"User's previous answer: '{ans}'. Generate one deep, analytical follow-up question only as a JSON list of one string."
                         try:
-                            client = openai.OpenAI()
-                            response = client.chat.completions.create(
-                                model=model,
-                                messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
-                                temperature=temperature,
-                                max_tokens=max_tokens
-                            )
-                            import json, re
-                            raw_content = response.choices[0].message.content.strip()
-                            if raw_content.startswith('```json'):
-                                raw_content = raw_content[7:]
-                            if raw_content.startswith('```'):
-                                raw_content = raw_content[3:]
-                            if raw_content.endswith('```'):
-                                raw_content = raw_content[:-3]
-                            match = re.search(r'(\[.*\])', raw_content, re.DOTALL)
-                            if match:
-                                raw_content = match.group(1)
-                            try:
-                                followup = json.loads(raw_content)
-                            except Exception as e:
-                                st.error(f"OpenAI did not return valid JSON. Raw response: {raw_content}")
-                                followup = []
+                            followup = None
+                            if use_llm:
+                                # Uses the prefetched question for this exact answer (starting it now if it is
+                                # still debouncing) or a fresh LLM call; hybrid mode waits only briefly for
+                                # either before falling back to the local engine
+                                wait = float(cfg["DYNAMIC_FOLLOWUPS"].get("hybrid_wait_seconds", "2.0")) if engine == "hybrid" else None
+                                followup = prefetcher.take(prefetch_slot, answer_hash(ans), timeout=wait,
+                                                           fn=functools.partial(section2_followup, ans, cfg, session_key))
+                                if followup is None and engine == "llm":
+                                    followup = section2_followup(ans, cfg, session_key)
+                            if not followup:
+                                followup = local_followups(ans, 1, pillar=SECTION2_PILLAR, category=SECTION2_CATEGORY,
+                                                           exclude=section2_questions)
                             if isinstance(followup, list) and len(followup) == 1:
                                 st.session_state["section2_questions"].append(followup[0])
                                 st.session_state["section2_answers"].append("")
@@ -546,7 +536,7 @@ def page_survey(cfg, role):
                     }
                     if col is not None:
                         try:
-                            res = col.insert_one(doc)
+                            res = insert_submission(col, doc)
                             st.session_state["current_doc_id"] = str(res.inserted_id)
                             st.success("Survey saved to MongoDB.")
                         except Exception as e:
@@ -558,101 +548,15 @@ def page_survey(cfg, role):
                     else:
                         st.info("MONGO_URI not set or pymongo missing — skipped DB save.")
 
-                    # PDF report generation and download link for user
-                    import io
-                    from fpdf import FPDF
-                    import base64
-                    
-                    import unicodedata
-                    def to_ascii(text):
-                        return unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
-                    
-                    pdf = FPDF()
-                    pdf.add_page()
-                    pdf.set_font("Arial", size=12)
-                    pdf.cell(0, 10, to_ascii("Conversational Banking Survey Responses"), ln=True, align="C")
-                    pdf.ln(5)
-                    # Effective page width for wrapping
-                    effective_width = pdf.w - pdf.l_margin - pdf.r_margin
-                    
-                    # Organization Info
-                    if org_name or contact:
-                        pdf.set_font("Arial", "B", 12)
-                        pdf.cell(0, 10, to_ascii("Organization Information"), ln=True)
-                        pdf.set_font("Arial", size=10)
-                        pdf.cell(0, 8, to_ascii(f"Organization: {org_name}"), ln=True)
-                        if contact:
-                            pdf.cell(0, 8, to_ascii(f"Contact: {contact}"), ln=True)
-                        pdf.ln(3)
-                    
-                    # Section 1: Fixed Questions
-                    pdf.set_font("Arial", "B", 12)
-                    pdf.cell(0, 10, to_ascii("Section 1: Fixed Questions"), ln=True)
-                    pdf.set_font("Arial", size=10)
-                    
-                    for i, q in enumerate(fixed, 1):
-                        pdf.ln(2)
-                        pdf.set_font("Arial", "B", 10)
-                        answer = str(q.get('answer', ''))
-                        if isinstance(q.get('answer'), list):
-                            answer = ', '.join(str(item) for item in q.get('answer', []))
-                        safe_answer = str(answer)
-                        if len(safe_answer) > 100:
-                            safe_answer = safe_answer[:100] + "..."
-                        # Render answer line robustly
-                        a_line = to_ascii(f"A{i}: {safe_answer}")
-                        a_line = safe_multicell_text(a_line)
-                        render_text_in_cell(pdf, a_line, effective_width)
-                        # Add question type information
-                        question_type = q.get('type', 'text')
-                        pdf.set_font("Arial", "I", 9)  # Italic font for type
-                        pdf.cell(0, 5, to_ascii(f"Type: {question_type}"), ln=True)
-                        
-                        pdf.set_font("Arial", size=10)
-                    
-                    # Section 2: Open-Ended Questions
-                    section2_questions = st.session_state.get("section2_questions", [])
-                    section2_answers = st.session_state.get("section2_answers", [])
-                    
-                    if section2_questions and section2_answers:
-                        pdf.ln(5)
-                        pdf.set_font("Arial", "B", 12)
-                        pdf.cell(0, 10, to_ascii("Section 2: Open-Ended Questions"), ln=True)
-                        pdf.set_font("Arial", size=10)
-                        
-                        for i, (question, answer) in enumerate(zip(section2_questions, section2_answers), 1):
-                            if question and answer:  # Only include answered questions
-                                pdf.ln(2)
-                                pdf.set_font("Arial", "B", 10)
-                                question_text = safe_multicell_text(to_ascii(question))
-                                render_text_in_cell(pdf, to_ascii(f"Q{i}: {question_text}"), effective_width)
-                                pdf.set_font("Arial", size=10)
-                                # Option 1: Truncate long answers
-                                safe_answer = str(answer)
-                                if len(safe_answer) > 100:
-                                    safe_answer = safe_answer[:100] + "..."
-                                a_line = to_ascii(f"A{i}: {safe_answer}")
-                                a_line = safe_multicell_text(a_line)
-                                render_text_in_cell(pdf, a_line, effective_width)
-                    
-                    # Section 3: Submission Information
-                    pdf.ln(5)
-                    pdf.set_font("Arial", "B", 12)
-                    pdf.cell(0, 10, to_ascii("Section 3: Submission Details"), ln=True)
-                    pdf.set_font("Arial", size=10)
-                    pdf.cell(0, 8, to_ascii(f"Submitted by: {st.session_state.get('username', 'N/A')}"), ln=True)
-                    pdf.cell(0, 8, to_ascii(f"Role: {role}"), ln=True)
-                    pdf.cell(0, 8, to_ascii(f"Submission Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"), ln=True)
-                    
-                    _out = pdf.output(dest='S')
-                    pdf_bytes = _out if isinstance(_out, (bytes, bytearray)) else _out.encode('latin1')
-                    b64 = base64.b64encode(pdf_bytes).decode()
-                    href = f'<a href="data:application/pdf;base64,{b64}" download="CB_Survey_Responses.pdf">Download Survey Responses PDF</a>'
-                    st.markdown(href, unsafe_allow_html=True)
-                    
+                    # PDF report is rendered in the background and served by survey_pdf_download()
+                    submission_id = str(doc["_id"]) if "_id" in doc else f"session-{st.session_state.setdefault('session_key', uuid.uuid4().hex)}"
+                    st.session_state["survey_pdf_key"] = get_pdf_worker().submit(submission_id, doc)
+
                     # Mark Step 3 as complete
                     st.session_state["step3_complete"] = True
                     st.success("✅ Survey submitted successfully! You can now view the Analytics Dashboard in Step 4.")
+        if st.session_state.get("survey_pdf_key"):
+            survey_pdf_download(st.session_state["survey_pdf_key"])
         # --- Optional: Compute Maturity & Save Report ---
         if st.session_state.get("step3_complete"):
             st.markdown("---")
@@ -670,37 +574,12 @@ def page_survey(cfg, role):
                     for j, _ in enumerate(ops, 1):
                         fu.append({"q": st.session_state.get(f"fu_{i}_{j-0}", ""), "a": st.session_state.get(f"fu_{i}_{j}", "")})
                     op_blocks.append({"prompt": "", "answer": st.session_state.get(f"open_ans_{i}", ""), "followups": fu})
-
-                # Simple scorer with broadened pillars
-                seeds = {
-                    "Business & Strategic Alignment": ["kpi","csat","nps","journey","omni","target","conversion"],
-                    "Scope & Use Cases": ["intent","journey","transfer","transaction","multilingual","language"],
-                    "Technology & Integration": ["api","middleware","sso","otp","biometric","whatsapp","ivr"],
-                    "Risk, Governance & Operations": ["handoff","sla","monitor","feedback","bias","fairness","ethics","content"],
-                    "Infrastructure, AI Readiness & Security": ["gpu","h100","a100","mlops","databricks","sagemaker","vertex","gateway","apigee","kong","mulesoft","prometheus","grafana","elastic","dr","ha","sandbox"],
-                    "Model & Platform": ["openai","azure","anthropic","cohere","dbrx","llama","embedding","fine-tune"],
-                    "Validation & Testing": ["eval","dataset","metrics","red-team","test","qa","sign-off","sandbox"]
-                }
-                text_blob = []
-                for f in fixed_list:
-                    text_blob.append(str(f.get("answer","")))
-                for op in op_blocks:
-                    text_blob.append(op.get("answer",""))
-                    for fu in op.get("followups", []):
-                        text_blob.append(fu.get("a",""))
-                full = " ".join(text_blob).lower()
-
-                pillars = []
-                total = 0
-                for name, kws in seeds.items():
-                    hits = sum(1 for kw in kws if kw in full)
-                    score = min(1 + hits*2, 20)
-                    total += score
-                    stage = "Nascent"
-                    for thr, lab in [(1,"Nascent"),(5,"Emerging"),(10,"Developing"),(15,"Advanced"),(20,"Leading")]:
-                        if score >= thr: stage = lab
-                    pillars.append({"name": name, "score": score, "stage": stage})
-                sc = {"pillars": pillars, "overall": total}
+                section2 = [
+                    {"question": q, "answer": a}
+                    for q, a in zip(st.session_state.get("section2_questions", []), st.session_state.get("section2_answers", []))
+                    if a and a.strip()
+                ]
+                sc = score_answers({"fixed": fixed_list, "section2": section2, "open": op_blocks})
 
             ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
             path = f"CB_Discovery_Report_{ts}.md"
@@ -718,15 +597,16 @@ def page_survey(cfg, role):
 
             # Save to Mongo if we have a current_doc_id and scores
             if "current_doc_id" in st.session_state and get_db() is not None and 'sc' in locals():
-                from bson import ObjectId
                 db = get_db()
                 col = db[cfg["MONGO"]["collection_name"]]
-                col.update_one({"_id": ObjectId(st.session_state["current_doc_id"])}, {"$set": {"scores": sc, "status":"analyzed"}})
+                save_scores(col, st.session_state["current_doc_id"], sc)
                 st.toast("Scores saved to MongoDB.")
 
     # --- Step 4: Analytics Dashboard ---
     if active_step == 3:
         st.subheader("Step 4 — Analytics Dashboard")
+        if st.session_state.get("survey_pdf_key"):
+            survey_pdf_download(st.session_state["survey_pdf_key"])
         
         if st.session_state.get("step3_complete"):
             # Show the spectacular analytics dashboard
@@ -802,27 +682,21 @@ def page_admin(cfg):
                             else:
                                 st.error("MongoDB not connected.")
                         with st.expander("Filters"):
-                            org = st.text_input("Organization contains")
-                            submitter = st.text_input("Submitted by contains")
+                            org = st.text_input("Organization starts with")
+                            submitter = st.text_input("Submitted by starts with")
                             status = st.multiselect("Status", ["submitted","analyzed"], default=[])
                             limit = st.number_input("Max records", 1, 1000, 100)
 
-                        query = {}
-                        if org: query["org.name"] = {"$regex": org, "$options":"i"}
-                        if submitter: query["submitted_by"] = {"$regex": submitter, "$options":"i"}
-                        if status: query["status"] = {"$in": status}
+                        query = build_admin_query(org, submitter, status)
 
                     # Only define and use query/limit once for filtering
-                    query = {}
-                    org = st.text_input("Organization contains", key="admin_org_filter")
-                    submitter = st.text_input("Submitted by contains", key="admin_submitter_filter")
+                    org = st.text_input("Organization starts with", key="admin_org_filter")
+                    submitter = st.text_input("Submitted by starts with", key="admin_submitter_filter")
                     status = st.multiselect("Status", ["submitted","analyzed"], default=[], key="admin_status_filter")
                     limit = st.number_input("Max records", 1, 1000, 100, key="admin_limit_filter")
-                    if org: query["org.name"] = {"$regex": org, "$options":"i"}
-                    if submitter: query["submitted_by"] = {"$regex": submitter, "$options":"i"}
-                    if status: query["status"] = {"$in": status}
+                    query = build_admin_query(org, submitter, status)
                     try:
-                        rows = list(col.find(query).sort("created_at",-1).limit(int(limit)))
+                        rows = list(col.find(query).sort(ADMIN_SORT).limit(int(limit)))
                     except Exception as e:
                         import pymongo
                         if isinstance(e, pymongo.errors.ServerSelectionTimeoutError):
@@ -839,20 +713,23 @@ def page_admin(cfg):
     tab_objs = st.tabs(tabs)
 
     # --- Filters and query definition ---
-    org = st.text_input("Organization contains", key="admin_org_filter")
-    submitter = st.text_input("Submitted by contains", key="admin_submitter_filter")
+    org = st.text_input("Organization starts with", key="admin_org_filter")
+    submitter = st.text_input("Submitted by starts with", key="admin_submitter_filter")
     status = st.multiselect("Status", ["submitted","analyzed"], default=[], key="admin_status_filter")
-    limit = st.number_input("Max records", 1, 1000, 100, key="admin_limit_filter")
-    query = {}
-    if org: query["org.name"] = {"$regex": org, "$options":"i"}
-    if submitter: query["submitted_by"] = {"$regex": submitter, "$options":"i"}
-    if status: query["status"] = {"$in": status}
-    rows = []
+    page_size = int(st.number_input("Records per page", 1, 200, 50, key="admin_page_size"))
+    query = build_admin_query(org, submitter, status)
+    # Keyset pagination: one (created_at, _id) key per visited page, reset when the filter changes
+    page_sig = repr((query, page_size))
+    if st.session_state.get("admin_page_sig") != page_sig:
+        st.session_state["admin_page_sig"] = page_sig
+        st.session_state["admin_page_keys"] = [None]
+    page_keys = st.session_state["admin_page_keys"]
+    rows, next_after = [], None
     if col is None:
         st.error("MongoDB collection is not available. Please check your configuration and connection.")
     else:
         try:
-            rows = list(col.find(query).sort("created_at",-1).limit(int(limit)))
+            rows, next_after = fetch_page(col, query, page_size, after=page_keys[-1])
         except Exception as e:
             import pymongo
             if isinstance(e, pymongo.errors.ServerSelectionTimeoutError):
@@ -865,7 +742,7 @@ def page_admin(cfg):
     # Records & Insights tab
     with tab_objs[tabs.index("Records & Insights")]:
         sel = ""
-        if rows and isinstance(rows, list) and len(rows) > 0:
+        if rows:
             df = pd.DataFrame([
                 {
                     "id": str(r.get("_id")),
@@ -876,45 +753,78 @@ def page_admin(cfg):
                 }
                 for r in rows
             ])
-            # st.dataframe(df, use_container_width=True)
-            # sel = st.selectbox("Open record", options=[""] + df["id"].tolist(), key="admin_open_record_selectbox")
+            st.dataframe(df, use_container_width=True)
+            prev_col, page_col, next_col = st.columns([0.2,0.6,0.2])
+            with prev_col:
+                if len(page_keys) > 1 and st.button("◀ Previous", key="admin_page_prev"):
+                    page_keys.pop()
+                    st.rerun()
+            with page_col:
+                st.caption(f"Page {len(page_keys)} · {len(rows)} records")
+            with next_col:
+                if next_after is not None and st.button("Next ▶", key="admin_page_next"):
+                    page_keys.append(next_after)
+                    st.rerun()
+            sel = st.selectbox("Open record", options=[""] + df["id"].tolist(), key="admin_open_record_selectbox")
+        elif col is not None:
+            st.info("No records match the current filters.")
+        if rows:
+            with st.expander("Export Survey PDFs (current filter)"):
+                st.caption("Renders one PDF per matching submission in a process pool and packs them into a ZIP.")
+                if st.button("Build PDF ZIP", key="admin_bulk_pdf_btn"):
+                    old_zip = st.session_state.pop("admin_pdf_zip", None)
+                    if old_zip and os.path.exists(old_zip):
+                        os.remove(old_zip)
+                    sweep_exports()
+                    zip_path = export_file_path("survey_pdfs", "zip")
+                    bar = st.progress(0.0, text="Starting…")
+                    def _pdf_progress(done, total, rate):
+                        bar.progress(min(done / max(total, 1), 1.0), text=f"{done}/{total} PDFs — {rate:.1f} docs/s")
+                    summary = export_pdf_zip(col, query, zip_path, progress=_pdf_progress)
+                    st.session_state["admin_pdf_zip"] = zip_path
+                    st.success(f"Exported {summary['exported']} PDFs in {summary['elapsed_s']}s ({summary['docs_per_s']} docs/s).")
+                    if summary["failed"]:
+                        st.warning(f"{len(summary['failed'])} submissions could not be rendered: "
+                                   + ", ".join(f["id"] for f in summary["failed"][:10]))
+                zip_path = st.session_state.get("admin_pdf_zip")
+                if zip_path and os.path.exists(zip_path):
+                    # The archive is read from disk only when the button is clicked; an unclicked
+                    # file is deleted by sweep_exports once it is older than EXPORT_MAX_AGE
+                    st.download_button("Download PDF ZIP", functools.partial(read_export, zip_path),
+                                       file_name="CB_Survey_PDFs.zip", mime="application/zip",
+                                       on_click="ignore", key="admin_bulk_pdf_download")
+            with st.expander("Export Data (current filter)"):
+                st.caption("Streams every matching submission to CSV (fixed answers by question id, score per pillar) or JSONL.")
+                export_fmt = st.radio("Format", ["csv", "jsonl"], horizontal=True, key="admin_export_format")
+                if st.button("Build Export", key="admin_export_btn"):
+                    old_export = st.session_state.pop("admin_export_file", None)
+                    if old_export and os.path.exists(old_export[0]):
+                        os.remove(old_export[0])
+                    sweep_exports()
+                    export_path = export_file_path("submissions", export_fmt)
+                    export_status = st.empty()
+                    def _export_progress(done, rate):
+                        export_status.caption(f"{done} documents — {rate:.0f} docs/s")
+                    summary = export_table(col, query, export_fmt, export_path, [q["id"] for q in get_questions(cfg)],
+                                           get_engine().pillars, progress=_export_progress)
+                    st.session_state["admin_export_file"] = (export_path, export_fmt)
+                    st.success(f"Exported {summary['exported']} submissions in {summary['elapsed_s']}s ({summary['docs_per_s']} docs/s).")
+                export_file = st.session_state.get("admin_export_file")
+                if export_file and os.path.exists(export_file[0]):
+                    st.download_button(f"Download {export_file[1].upper()}", functools.partial(read_export, export_file[0]),
+                                       file_name=f"CB_Submissions.{export_file[1]}",
+                                       mime="text/csv" if export_file[1] == "csv" else "application/x-ndjson",
+                                       on_click="ignore", key="admin_export_download")
         if sel:
-            doc = col.find_one({"_id": ObjectId(sel)})
+            doc = fetch_document(col, sel)
             st.json(doc)
 
             if st.button("Compute Scores (if missing)", key=f"compute_scores_{sel}"):
-                answers = doc.get("answers", {})
-                text_blob = []
-                for f in answers.get("fixed", []): text_blob.append(str(f.get("answer","")))
-                for op in answers.get("open", []):
-                    text_blob.append(op.get("answer",""))
-                    for fu in op.get("followups", []):
-                        text_blob.append(fu.get("a",""))
-                full = " ".join(text_blob).lower()
-                seeds = {
-                    "Business & Strategic Alignment": ["kpi","csat","journey","omni","nps","target","conversion"],
-                    "Scope & Use Cases": ["intent","journey","transfer","transaction","multilingual","language"],
-                    "Technology & Integration": ["api","middleware","sso","otp","biometric","whatsapp","ivr"],
-                    "Risk, Governance & Operations": ["handoff","sla","monitor","feedback","bias","fairness","ethics","content"],
-                    "Infrastructure, AI Readiness & Security": ["gpu","h100","a100","mlops","databricks","sagemaker","vertex","gateway","apigee","kong","mulesoft","prometheus","grafana","elastic","dr","ha","sandbox"],
-                    "Model & Platform": ["openai","azure","anthropic","cohere","dbrx","llama","embedding","fine-tune"],
-                    "Validation & Testing": ["eval","dataset","metrics","red-team","test","qa","sign-off","sandbox"]
-                }
-                pillars = []
-                total = 0
-                for name, kws in seeds.items():
-                    hits = sum(1 for kw in kws if kw in full)
-                    score = min(1 + hits*2, 20)
-                    total += score
-                    stage = "Nascent"
-                    for thr, lab in [(1,"Nascent"),(5,"Emerging"),(10,"Developing"),(15,"Advanced"),(20,"Leading")]:
-                        if score >= thr: stage = lab
-                    pillars.append({"name": name, "score": score, "stage": stage})
-                sc = {"pillars": pillars, "overall": total}
-                col.update_one({"_id": ObjectId(sel)}, {"$set":{"scores": sc, "status":"analyzed"}})
+                sc = score_answers(doc.get("answers", {}))
+                save_scores(col, sel, sc)
                 st.success("Scores computed and saved.")
                 st.markdown("---")
-                doc = col.find_one({"_id": ObjectId(sel)})
+                doc = fetch_document(col, sel)
                 st.json(doc)
 
             # Always show Discrepancy Check after record selection and score computation
@@ -966,36 +876,75 @@ def page_admin(cfg):
             st.text_area("Followup System Prompt", value=cfg["DYNAMIC_FOLLOWUPS"].get("followup_system_prompt",""), key="admin_followup_system_prompt")
             st.text_area("Followup User Template", value=cfg["DYNAMIC_FOLLOWUPS"].get("followup_user_template",""), key="admin_followup_user_template")
 
-        # Records & Insights tab
-        with tab_objs[tabs.index("Records & Insights")]:
-            try:
-                rows = list(col.find(query).sort("created_at",-1).limit(int(limit)))
-            except Exception as e:
-                import pymongo
-                if isinstance(e, pymongo.errors.ServerSelectionTimeoutError):
-                    st.error("MongoDB server is unreachable. Please check your network, URI, and Atlas cluster status.")
-                    rows = []
+            st.markdown("---")
+            st.markdown("### MongoDB Connection Pool")
+            stats = pool_stats()
+            if stats:
+                st.dataframe(pd.DataFrame(stats), use_container_width=True)
+                st.caption("Per-process counters. Multiply peak_checked_out by the number of Streamlit workers to size Atlas connections.")
+            else:
+                st.info("No MongoDB client has been created in this process yet.")
+
+            st.markdown("### Admin Query Cache")
+            st.dataframe(pd.DataFrame(cache_stats()).T, use_container_width=True)
+            st.caption("Filter pages expire after 15s and records after 60s; submits and score updates invalidate them immediately.")
+
+            st.markdown("### OpenAI Client")
+            st.dataframe(pd.DataFrame(client_stats()), use_container_width=True)
+            st.caption("Per-process: max_concurrent caps in-flight LLM calls; retries are 429/5xx/timeouts with jittered backoff.")
+
+            st.markdown("### LLM Gateway")
+            st.dataframe(pd.DataFrame([get_gateway().stats()]), use_container_width=True)
+            st.caption("Identical in-flight requests are coalesced; queued calls are admitted round-robin per session within the requests/min and tokens/min limits.")
+
+            st.markdown("### Prompt Sizes")
+            prompt_rows = PROMPT_STATS.rows()
+            if prompt_rows:
+                st.dataframe(pd.DataFrame(prompt_rows), use_container_width=True)
+            else:
+                st.info("No prompts built in this process yet.")
+
+            st.markdown("### LLM Response Cache")
+            st.dataframe(pd.DataFrame([get_llm_cache().stats()]), use_container_width=True)
+            if st.button("Clear LLM Cache", key="admin_clear_llm_cache"):
+                get_llm_cache().clear()
+                st.success("LLM response cache cleared.")
+
+            st.markdown("### Survey PDF Worker")
+            st.dataframe(pd.DataFrame([get_pdf_worker().stats()]), use_container_width=True)
+
+            st.markdown("### Dashboard Figure Cache")
+            st.dataframe(pd.DataFrame([get_figure_cache().stats()]), use_container_width=True)
+            if st.button("Clear Figure Cache", key="admin_clear_figure_cache"):
+                get_figure_cache().clear()
+                st.success("Dashboard figure cache cleared.")
+
+            st.markdown("---")
+            st.markdown("### Re-score All Submissions")
+            st.caption("Recomputes scores for the whole collection with the current scoring_rules.json. Resumes from the last checkpoint if interrupted.")
+            restart = st.checkbox("Start from scratch (ignore checkpoint)", key="admin_rescore_restart")
+            if st.button("Run Re-scoring Job", key="admin_rescore_btn"):
+                if col is None:
+                    st.error("MongoDB collection is not available.")
                 else:
-                    st.error(f"MongoDB error: {e}")
-                    rows = []
-            sel = ""
-            if rows:
-                df = pd.DataFrame([
-                    {
-                        "id": str(r.get("_id")),
-                        "org": (r.get("org") or {}).get("name", ""),
-                        "submitted_by": r.get("submitted_by", ""),
-                        "status": r.get("status", ""),
-                        "created_at": r.get("created_at", "")
-                    }
-                    for r in rows
-                ])
-                st.dataframe(df, use_container_width=True)
-                sel = st.selectbox("Open record", options=[""] + df["id"].tolist())
-            if sel:
-                doc = col.find_one({"_id": ObjectId(sel)})
-                st.json(doc)
-                # ...existing code for record details, scores, discrepancy check, etc...
+                    from rescore_job import CHECKPOINT_COLLECTION, rescore_collection, rules_fingerprint
+                    bar = st.progress(0.0, text="Starting…")
+                    total_docs = max(1, col.estimated_document_count())
+                    def _progress(processed, rate):
+                        bar.progress(min(processed / total_docs, 1.0), text=f"{processed}/{total_docs} docs — {rate:.0f} docs/s")
+                    summary = rescore_collection(col, db[CHECKPOINT_COLLECTION], f"rescore-{rules_fingerprint()}",
+                                                 restart=restart, progress=_progress)
+                    st.success(f"Re-scored {summary['this_run']} documents in {summary['elapsed_s']}s ({summary['docs_per_s']} docs/s).")
+                    if summary["stats_rebuilt"]:
+                        st.info("The previous run stopped mid-batch, so pillar statistics were rebuilt before resuming.")
+
+            st.markdown("### Pillar Statistics")
+            st.caption("pillar_stats is updated on every score write. Rebuild it from the submissions if it was edited out of band.")
+            if st.button("Rebuild Pillar Statistics", key="admin_rebuild_stats_btn"):
+                if col is None:
+                    st.error("MongoDB collection is not available.")
+                else:
+                    st.success(f"Rebuilt pillar statistics from {rebuild(col)} scored submissions.")
 
         # Admin Settings tab
         if "Admin Settings" in tabs:
@@ -1005,11 +954,29 @@ def page_admin(cfg):
 
         # Insights & Next Steps Section
         st.subheader("Insights & Next Steps")
-        if rows:
-            # Find the most recent analyzed record with scores
-            analyzed = [r for r in rows if r.get("scores")]
-            if analyzed:
-                latest = analyzed[0]
+        if col is not None:
+            # Cross-submission view from the materialized pillar_stats collection
+            agg = read_stats(stats_collection(col), get_engine().pillars)
+            if agg["overall"]["count"]:
+                ov = agg["overall"]
+                st.markdown("### Across All Scored Submissions")
+                m1, m2, m3, m4 = st.columns(4)
+                m1.metric("Scored", ov["count"])
+                m2.metric("Mean Overall", ov["mean"])
+                m3.metric("Min Overall", ov["min"])
+                m4.metric("Max Overall", ov["max"])
+                stage_labels = [lab for _, lab in get_engine().thresholds]
+                st.dataframe(pd.DataFrame([
+                    {"Pillar": p["name"], "Scored": p["count"], "Mean": p["mean"], "Min": p["min"], "Max": p["max"],
+                     **{lab: p["stages"].get(lab, 0) for lab in stage_labels}}
+                    for p in agg["pillars"]
+                ]), use_container_width=True)
+                st.caption("Overall score distribution")
+                st.bar_chart(pd.Series(ov["hist"], name="submissions"))
+                st.markdown("---")
+            # Most recent analyzed record with scores for the current filter
+            latest = fetch_latest_scored(col, query)
+            if latest:
                 scores = latest["scores"]
                 pillars = scores.get("pillars", [])
                 overall = scores.get("overall", 0)
@@ -1019,23 +986,17 @@ def page_admin(cfg):
                     st.markdown(f"- **{p['name']}**: {p['score']} ({p['stage']})")
                 st.markdown("---")
                 st.markdown("#### How Overall Score is Calculated")
-                st.info("""
+                engine = get_engine()
+                stages = ", ".join(f"{lab} ({thr}+)" for thr, lab in engine.thresholds)
+                st.info(f"""
 **Score Calculation Logic:**
-- For each pillar, answers are scanned for pillar-specific keywords.
-- Each keyword hit adds 2 points to the pillar, with a base score of 1 per pillar.
-- The total score per pillar is capped at 20.
-- Pillar stages are assigned based on thresholds: Nascent (1+), Emerging (5+), Developing (10+), Advanced (15+), Leading (20).
+- For each pillar, answers are scanned for whole-word matches of the pillar keywords in scoring_rules.json.
+- Each distinct keyword hit adds {engine.hit_points} points to the pillar, with a base score of {engine.base} per pillar, scaled by the pillar weight.
+- The total score per pillar is capped at {engine.max_per_pillar}.
+- Pillar stages are assigned based on thresholds: {stages}.
 - The **Overall Score** is the sum of all pillar scores.
                 """)
-                # Next Steps from scoring_rules.json if available
-                scoring_path = os.path.join(os.path.dirname(__file__), "scoring_rules.json")
-                next_steps = {}
-                try:
-                    with open(scoring_path, "r", encoding="utf-8") as f:
-                        scoring = json.load(f)
-                        next_steps = scoring.get("next_steps", {})
-                except Exception:
-                    next_steps = {}
+                next_steps = engine.next_steps
                 st.markdown("### Recommended Next Steps:")
                 for p in pillars:
                     steps = next_steps.get(p["name"], [])
@@ -1055,22 +1016,12 @@ def page_admin(cfg):
 # --- MAIN PAGE ROUTING ---
 if __name__ == "__main__":
     cfg = load_cfg()
-    # Show MongoDB and OpenAI connection status at the top
-    db = get_db()
-    mongo_status = "✅ MongoDB Connected" if db is not None else "❌ MongoDB Not Connected"
-    try:
-        api_key = os.getenv("OPENAI_API_KEY", "")
-        openai_status = "❌ OpenAI Not Connected"
-        if api_key:
-            from openai import OpenAI
-            client = OpenAI(api_key=api_key)
-            models = client.models.list()
-            if hasattr(models, "data") and len(models.data) > 0:
-                openai_status = "✅ OpenAI Connected"
-    except Exception:
-        openai_status = "❌ OpenAI Not Connected"
-    #st.markdown(f"**MongoDB Status:** {mongo_status}")
-    #st.markdown(f"**OpenAI Status:** {openai_status}")
+    # Start probing MongoDB and OpenAI in the background; the header reads the cached status
+    get_monitor()
+    # Declare indexes once per process without blocking the first render
+    _db = get_db()
+    if _db is not None:
+        ensure_indexes_async(_db[cfg["MONGO"]["collection_name"]])
 
     if not st.session_state.get("role"):
         login_screen(cfg)
@@ -0,0 +1,116 @@
+# Generated files (survey PDFs) stored once, keyed by submission id and content hash
+import configparser
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.ini")
+
+_VOLATILE_FIELDS = ("_id", "search")
+
+
+def content_hash(doc: Dict[str, Any]) -> str:
+    """
+    Stable hash of a submission's content; fields added by the database are ignored.
+    """
+    payload = {k: v for k, v in doc.items() if k not in _VOLATILE_FIELDS}
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def artifact_key(kind: str, submission_id: str, doc: Dict[str, Any]) -> str:
+    return f"{kind}-{submission_id}-{content_hash(doc)[:16]}"
+
+
+class LocalArtifactStore:
+    """
+    One file per key under `root`. Writes go to a temp file and are renamed into place,
+    so readers never see a partial artifact.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def put(self, key: str, data: bytes, metadata: Dict[str, Any] = None) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+class GridFSArtifactStore:
+    """
+    Artifacts in a GridFS bucket of the app database, shared by every app instance.
+    """
+
+    def __init__(self, db, bucket: str = "artifacts"):
+        import gridfs
+        self.bucket = gridfs.GridFSBucket(db, bucket_name=bucket)
+        self.files = db[f"{bucket}.files"]
+
+    def exists(self, key: str) -> bool:
+        return self.files.find_one({"filename": key}, {"_id": 1}) is not None
+
+    def put(self, key: str, data: bytes, metadata: Dict[str, Any] = None) -> None:
+        if not self.exists(key):
+            self.bucket.upload_from_stream(key, data, metadata=metadata or {})
+
+    def get(self, key: str) -> Optional[bytes]:
+        import gridfs
+        try:
+            return self.bucket.open_download_stream_by_name(key).read()
+        except gridfs.errors.NoFile:
+            return None
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_artifact_store():
+    """
+    Process-wide store from [ARTIFACTS] in config.ini: backend = local (default) or
+    gridfs. GridFS falls back to local disk when MongoDB is not configured.
+    """
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                cfg = configparser.ConfigParser()
+                cfg.read(CONFIG_PATH, encoding="utf-8")
+                sec = cfg["ARTIFACTS"] if cfg.has_section("ARTIFACTS") else {}
+                store = None
+                if sec.get("backend", "local") == "gridfs":
+                    from db_client import get_db
+                    db = get_db()
+                    if db is not None:
+                        store = GridFSArtifactStore(db, sec.get("bucket", "artifacts"))
+                if store is None:
+                    path = sec.get("path", ".artifacts")
+                    if not os.path.isabs(path):
+                        path = os.path.join(os.path.dirname(CONFIG_PATH), path)
+                    store = LocalArtifactStore(path)
+                _STORE = store
+    return _STORE
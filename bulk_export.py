@@ -0,0 +1,370 @@
+# Bulk exports of submissions: survey-PDF ZIPs rendered in a process pool, and streaming CSV/JSONL
+import argparse
+import configparser
+import csv
+import io
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+import uuid
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List
+
+from db_client import close_clients, get_db
+from submissions import ADMIN_SORT, build_admin_query
+from survey_pdf import build_survey_pdf
+
+# Everything build_survey_pdf reads; scores and search fields stay on the server
+EXPORT_PROJECTION = {"org": 1, "answers": 1, "submitted_by": 1, "role": 1, "submitted_at": 1, "created_at": 1}
+
+# Export files handed to the admin download buttons; anything older is swept before a new build
+# (this is also what removes files whose download button was never clicked)
+EXPORT_FILE = re.compile(r"^(survey_pdfs|submissions)_[0-9a-f]{32}\.(zip|csv|jsonl)$")
+EXPORT_MAX_AGE = 6 * 3600
+
+
+def export_file_path(prefix: str, ext: str) -> str:
+    return os.path.join(tempfile.gettempdir(), f"{prefix}_{uuid.uuid4().hex}.{ext}")
+
+
+def read_export(path: str) -> bytes:
+    """
+    Reads a finished export for a deferred download button. Streamlit does not close
+    file objects returned by the callable, so the handle is closed here.
+    """
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def sweep_exports(max_age: float = EXPORT_MAX_AGE, directory: str = None) -> int:
+    """
+    Deletes export files older than `max_age` seconds, left behind by sessions that
+    ended before building another export or never clicked their download button.
+    Returns the number of files removed.
+    """
+    directory = directory or tempfile.gettempdir()
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(directory):
+        if not EXPORT_FILE.match(entry.name):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            pass  # already removed by another session
+    return removed
+
+
+def pdf_filename(doc: Dict[str, Any]) -> str:
+    org = re.sub(r"[^A-Za-z0-9]+", "_", str((doc.get("org") or {}).get("name") or "submission")).strip("_")
+    return f"{org[:60] or 'submission'}_{doc['_id']}.pdf"
+
+
+def _render(doc: Dict[str, Any]):
+    # Runs in a worker process
+    return pdf_filename(doc), build_survey_pdf(doc)
+
+
+def export_pdf_zip(col, query: Dict[str, Any], out, workers: int = 4, batch_size: int = 50,
+                   limit: int = 0, progress=None) -> dict:
+    """
+    Renders a survey PDF for every submission matching `query` and writes them into a
+    ZIP at `out` (a path or a writable binary file). Documents are read with a batched
+    cursor and at most 2 x `workers` PDFs are pending at once; each one is written to
+    the archive as soon as it is ready and then dropped, so memory does not grow with
+    the number of submissions. `progress(done, total, docs_per_s)` is called per PDF.
+    """
+    total = col.count_documents(query)
+    if limit:
+        total = min(total, limit)
+    cursor = col.find(query, projection=EXPORT_PROJECTION).sort(ADMIN_SORT).batch_size(batch_size)
+    if limit:
+        cursor = cursor.limit(limit)
+    started = time.perf_counter()
+    done, failed, size = 0, [], 0
+    window = max(1, workers) * 2
+    # Spawned, not forked: this runs inside the app server next to monitor, gateway and driver threads
+    pool = (ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            if workers > 1 else None)
+
+    def finish(name, data):
+        nonlocal done, size
+        # PDFs are already compressed; storing them keeps the archive step cheap
+        zf.writestr(name, data, compress_type=zipfile.ZIP_STORED)
+        done += 1
+        size += len(data)
+        if progress:
+            elapsed = time.perf_counter() - started
+            progress(done, total, done / elapsed if elapsed > 0 else 0.0)
+
+    def settle(_id, result):
+        try:
+            finish(*result())
+        except Exception as e:
+            failed.append({"id": _id, "error": str(e)})
+
+    try:
+        with zipfile.ZipFile(out, "w") as zf:
+            pending = {}
+            for doc in cursor:
+                doc["_id"] = str(doc["_id"])
+                if pool is None:
+                    settle(doc["_id"], lambda: _render(doc))
+                    continue
+                pending[pool.submit(_render, doc)] = doc["_id"]
+                if len(pending) >= window:
+                    ready, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in ready:
+                        settle(pending.pop(fut), fut.result)
+            for fut in list(pending):
+                settle(pending.pop(fut), fut.result)
+    finally:
+        cursor.close()
+        if pool is not None:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "exported": done,
+        "failed": failed,
+        "pdf_bytes": size,
+        "elapsed_s": round(elapsed, 2),
+        "docs_per_s": round(done / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def export_cursor(col, query: Dict[str, Any], batch_size: int = 500):
+    """
+    Matching submissions in admin order, fetched `batch_size` documents per round trip.
+    """
+    return col.find(query, projection={"search": 0}).sort(ADMIN_SORT).batch_size(batch_size)
+
+
+# Leading characters that make spreadsheet apps evaluate a cell as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def csv_cell(value: Any) -> Any:
+    """
+    Quotes text cells that would be read as formulas by prefixing "'" (CSV injection).
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_header(question_ids: List[str], pillars: List[str]) -> List[str]:
+    return (["id", "org", "contact", "submitted_by", "role", "status", "created_at", "submitted_at"]
+            + list(question_ids) + ["overall"] + list(pillars))
+
+
+def csv_row(doc: Dict[str, Any], question_ids: List[str], pillars: List[str]) -> List[Any]:
+    """
+    One flat row: fixed answers by question id (lists joined with "; ") and the score
+    per pillar. Missing answers and unscored submissions give empty cells; text that
+    would start a formula is escaped with csv_cell.
+    """
+    org = doc.get("org") or {}
+    answers = {}
+    for q in (doc.get("answers") or {}).get("fixed") or []:
+        a = q.get("answer")
+        answers[q.get("id")] = "; ".join(str(x) for x in a) if isinstance(a, list) else ("" if a is None else a)
+    scores = doc.get("scores") or {}
+    by_pillar = {p.get("name"): p.get("score") for p in scores.get("pillars") or []}
+    row = ([str(doc.get("_id", "")), org.get("name", ""), org.get("contact", ""), doc.get("submitted_by", ""),
+            doc.get("role", ""), doc.get("status", ""), doc.get("created_at", ""), doc.get("submitted_at", "")]
+           + [answers.get(qid, "") for qid in question_ids]
+           + [scores.get("overall", "")] + [by_pillar.get(p, "") for p in pillars])
+    return [csv_cell(v) for v in row]
+
+
+def iter_csv(docs: Iterable[Dict[str, Any]], question_ids: List[str], pillars: List[str],
+             rows_per_chunk: int = 500) -> Iterator[str]:
+    """
+    Yields the CSV export in chunks of `rows_per_chunk` rows, header first. Only one
+    chunk is held at a time, so memory is flat for any number of documents.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(csv_header(question_ids, pillars))
+    n = 0
+    for doc in docs:
+        writer.writerow(csv_row(doc, question_ids, pillars))
+        n += 1
+        if n % rows_per_chunk == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def iter_jsonl(docs: Iterable[Dict[str, Any]], rows_per_chunk: int = 500) -> Iterator[str]:
+    """
+    Yields one JSON object per line (ObjectIds and dates as strings), `rows_per_chunk`
+    documents per chunk.
+    """
+    lines = []
+    for doc in docs:
+        lines.append(json.dumps(doc, ensure_ascii=False, default=str))
+        if len(lines) >= rows_per_chunk:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def write_chunks(chunks: Iterable[str], out) -> int:
+    """
+    Writes text chunks to `out` (a path or a writable text file) as they are produced.
+    Returns the number of characters written.
+    """
+    if isinstance(out, str):
+        with open(out, "w", encoding="utf-8", newline="") as f:
+            return write_chunks(chunks, f)
+    written = 0
+    for chunk in chunks:
+        out.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def export_table(col, query: Dict[str, Any], fmt: str, out, question_ids: List[str] = (),
+                 pillars: List[str] = (), batch_size: int = 500, progress=None) -> dict:
+    """
+    Streams the submissions matching `query` to `out` as "csv" or "jsonl".
+    `progress(done, docs_per_s)` is called after every chunk.
+    """
+    started = time.perf_counter()
+    counted = {"docs": 0}
+
+    def docs():
+        cursor = export_cursor(col, query, batch_size)
+        try:
+            for doc in cursor:
+                counted["docs"] += 1
+                yield doc
+        finally:
+            cursor.close()
+
+    def report(chunks):
+        for chunk in chunks:
+            yield chunk
+            if progress:
+                elapsed = time.perf_counter() - started
+                progress(counted["docs"], counted["docs"] / elapsed if elapsed > 0 else 0.0)
+
+    if fmt == "csv":
+        chunks = iter_csv(docs(), list(question_ids), list(pillars), batch_size)
+    elif fmt == "jsonl":
+        chunks = iter_jsonl(docs(), batch_size)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    chars = write_chunks(report(chunks), out)
+    elapsed = time.perf_counter() - started
+    return {
+        "exported": counted["docs"],
+        "chars": chars,
+        "elapsed_s": round(elapsed, 2),
+        "docs_per_s": round(counted["docs"] / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def _synthetic_docs(n: int, question_ids: List[str], pillars: List[str]) -> Iterator[Dict[str, Any]]:
+    from bson import ObjectId
+    for i in range(n):
+        yield {
+            "_id": ObjectId(),
+            "org": {"name": f"Bank {i}", "contact": f"owner{i}@example.com"},
+            "answers": {
+                "fixed": [{"id": qid, "question": f"Question {qid}?", "type": "text",
+                           "answer": ["Mobile App", "WhatsApp"] if j % 3 == 0 else f"Answer {j} for {i} " * 4}
+                          for j, qid in enumerate(question_ids)],
+                "section2": [{"question": "Pain points?", "answer": "Long queues and manual KYC. " * 8, "step": 1}],
+            },
+            "scores": {"overall": 42 + i % 50,
+                       "pillars": [{"name": p, "score": 5 + (i + k) % 10, "stage": "Developing"}
+                                   for k, p in enumerate(pillars)]},
+            "status": "analyzed", "submitted_by": "bench", "role": "User",
+            "created_at": "2026-01-01T00:00:00", "submitted_at": "2026-01-01 00:00:00",
+        }
+
+
+def benchmark(n: int, out: str) -> None:
+    import tracemalloc
+
+    question_ids = [f"Q{i:02d}" for i in range(1, 31)]
+    pillars = [f"Pillar {i}" for i in range(1, 8)]
+    for fmt in ("csv", "jsonl"):
+        def chunks(count):
+            docs = _synthetic_docs(count, question_ids, pillars)
+            return iter_csv(docs, question_ids, pillars) if fmt == "csv" else iter_jsonl(docs)
+
+        t0 = time.perf_counter()
+        chars = write_chunks(chunks(n), out)
+        elapsed = time.perf_counter() - t0
+        peaks = []
+        for count in (n // 100, n // 10):
+            tracemalloc.start()
+            write_chunks(chunks(count), out)
+            peaks.append(tracemalloc.get_traced_memory()[1] / 2 ** 20)
+            tracemalloc.stop()
+        print(f"{fmt:5}  {n} docs  {chars / 2 ** 20:7.1f} MB  {elapsed:6.2f}s  {n / elapsed:9.0f} docs/s  "
+              f"peak traced memory {peaks[0]:.1f} MB at {n // 100} docs, {peaks[1]:.1f} MB at {n // 10} docs")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export submissions as a ZIP of survey PDFs, CSV or JSONL.")
+    parser.add_argument("out", help="Path of the file to write.")
+    parser.add_argument("--format", choices=["pdf", "csv", "jsonl"], default="",
+                        help="Defaults to the extension of OUT (.zip means pdf).")
+    parser.add_argument("--org", default="", help="Organization name prefix.")
+    parser.add_argument("--submitter", default="", help="Submitted-by prefix.")
+    parser.add_argument("--status", action="append", default=[], help="Status to include (repeatable).")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=0, help="Maximum number of PDFs.")
+    parser.add_argument("--bench", type=int, default=0,
+                        help="Benchmark CSV/JSONL export of N synthetic documents to OUT; no database needed.")
+    args = parser.parse_args(argv)
+    if args.bench:
+        return benchmark(args.bench, args.out)
+
+    cfg = configparser.ConfigParser()
+    cfg.read("config.ini", encoding="utf-8")
+    db = get_db()
+    if db is None:
+        raise SystemExit("MONGO_URI not set — nothing to export.")
+    col = db[cfg["MONGO"]["collection_name"]]
+    query = build_admin_query(args.org, args.submitter, args.status)
+    ext = args.out.rsplit(".", 1)[-1].lower()
+    fmt = args.format or ("pdf" if ext == "zip" else ext)
+
+    def report(done, total, rate):
+        print(f"{done:>6}/{total} PDFs  {rate:6.1f} docs/s", flush=True)
+
+    def report_rows(done, rate):
+        print(f"{done:>8} docs  {rate:8.1f} docs/s", flush=True)
+
+    try:
+        if fmt == "pdf":
+            summary = export_pdf_zip(col, query, args.out, args.workers, limit=args.limit, progress=report)
+            print(f"exported {summary['exported']} PDFs ({len(summary['failed'])} failed) "
+                  f"in {summary['elapsed_s']}s, {summary['docs_per_s']} docs/s")
+        else:
+            from scoring import get_engine
+            question_ids = [q["id"] for q in json.loads(cfg["QUESTIONS"]["questions_json"])]
+            summary = export_table(col, query, fmt, args.out, question_ids, get_engine().pillars,
+                                   progress=report_rows)
+            print(json.dumps(summary))
+    finally:
+        close_clients()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,222 @@
 # MongoDB helper for Conversational Banking
-from pymongo import MongoClient
 import os
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
 
-def get_db():
-    import streamlit as st
-    uri = st.secrets.get("MONGO_URI", "")
+import certifi
+from pymongo import MongoClient, monitoring
+from pymongo.errors import ServerSelectionTimeoutError
+
+# One MongoClient per (uri, pool settings) for the whole process. Streamlit runs
+# every session in its own script thread, so clients must be shared explicitly or
+# each rerun pays a fresh TLS handshake and leaves another idle pool behind.
+_CLIENTS: dict = {}
+_POOL_STATS: dict = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _secret(name: str, default=None):
+    """
+    Reads a setting from Streamlit secrets, falling back to the environment.
+    """
+    try:
+        import streamlit as st
+        value = st.secrets.get(name)
+        if value not in (None, ""):
+            return value
+    except Exception:
+        pass
+    return os.getenv(name, default)
+
+
+def pool_settings() -> tuple[int, int]:
+    """
+    Returns (max_pool, min_pool). Explicit MONGODB_MAX_POOL_SIZE / MONGODB_MIN_POOL_SIZE
+    win; otherwise the max pool is sized from the CPU count, since one Streamlit server
+    process serves all of its sessions from script threads.
+    """
+    cpus = os.cpu_count() or 1
+    max_pool = _secret("MONGODB_MAX_POOL_SIZE")
+    max_pool = int(max_pool) if max_pool not in (None, "") else min(100, max(10, cpus * 4))
+    min_pool = _secret("MONGODB_MIN_POOL_SIZE")
+    min_pool = int(min_pool) if min_pool not in (None, "") else min(2, max_pool)
+    return max_pool, min(min_pool, max_pool)
+
+
+def _uses_tls(uri: str) -> bool:
+    """
+    Whether the driver will use TLS for this URI: an explicit tls=/ssl= option wins,
+    otherwise mongodb+srv:// implies TLS and mongodb:// does not.
+    """
+    parts = urlsplit(uri)
+    options = {k.lower(): v[-1].lower() for k, v in parse_qs(parts.query).items()}
+    explicit = options.get("tls", options.get("ssl"))
+    if explicit is not None:
+        return explicit == "true"
+    return parts.scheme == "mongodb+srv"
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """
+    Connection pool counters for one shared client (checked-out connections,
+    check-out wait time, handshakes) used to size Atlas connections per worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pools = 0
+        self.open_connections = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.handshakes = 0
+        self.wait_total_s = 0.0
+        self.wait_max_s = 0.0
+        self._started = {}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "pools": self.pools,
+                "open_connections": self.open_connections,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "handshakes": self.handshakes,
+                "wait_avg_ms": round(1000 * self.wait_total_s / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(1000 * self.wait_max_s, 3),
+            }
+
+    # -- pool events --
+    def pool_created(self, event):
+        with self._lock:
+            self.pools += 1
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        with self._lock:
+            self.pools = max(0, self.pools - 1)
+
+    # -- connection events --
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_ready(self, event):
+        # A connection becomes ready once its TLS + MongoDB handshake completes.
+        with self._lock:
+            self.handshakes += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections = max(0, self.open_connections - 1)
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            self._started[threading.get_ident()] = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self._started.pop(threading.get_ident(), None)
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            started = self._started.pop(threading.get_ident(), None)
+            waited = getattr(event, "duration", None)
+            if waited is None:
+                waited = time.perf_counter() - started if started is not None else 0.0
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            self.wait_total_s += waited
+            self.wait_max_s = max(self.wait_max_s, waited)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+
+def get_mongo_client() -> MongoClient:
+    """
+    Returns the process-wide Mongo client, creating it lazily on first use. TLS follows
+    the URI; when it is on, certificates are verified against certifi's CA bundle.
+    Returns None when MONGO_URI is not configured.
+    """
+    uri = _secret("MONGO_URI", "")
     if not uri:
         return None
-    client = MongoClient(uri, serverSelectionTimeoutMS=3000)
-    db_name = st.secrets.get("MONGO_DATABASE", "conversational_banking")
+    max_pool, min_pool = pool_settings()
+    selection_ms = int(_secret("MONGODB_SERVER_SELECTION_TIMEOUT_MS", 3000))
+    key = (uri, max_pool, min_pool)
+    client = _CLIENTS.get(key)
+    if client is not None:
+        return client
+    with _CLIENTS_LOCK:
+        if key not in _CLIENTS:
+            stats = PoolStats()
+            tls_options = {"tlsCAFile": certifi.where()} if _uses_tls(uri) else {}
+            _CLIENTS[key] = MongoClient(
+                uri,
+                maxPoolSize=max_pool,
+                minPoolSize=min_pool,
+                serverSelectionTimeoutMS=selection_ms,
+                connectTimeoutMS=10000,
+                socketTimeoutMS=20000,
+                event_listeners=[stats],
+                **tls_options,
+            )
+            _POOL_STATS[key] = stats
+        return _CLIENTS[key]
+
+
+def get_db():
+    client = get_mongo_client()
+    if client is None:
+        return None
+    db_name = _secret("MONGO_DATABASE", "conversational_banking")
     return client[db_name]
 
-def mongo_ping():
-    import streamlit as st
-    uri = st.secrets.get("MONGO_URI", "")
-    if not uri:
+
+def pool_stats() -> list[dict]:
+    """
+    Pool counters for every shared client in this process.
+    """
+    out = []
+    for (uri, max_pool, min_pool), stats in list(_POOL_STATS.items()):
+        snap = stats.snapshot()
+        snap.update({"host": uri.split("@")[-1].split("/")[0], "max_pool": max_pool, "min_pool": min_pool})
+        out.append(snap)
+    return out
+
+
+def close_clients():
+    """
+    Closes all shared clients (used by CLI jobs on exit).
+    """
+    with _CLIENTS_LOCK:
+        for client in _CLIENTS.values():
+            client.close()
+        _CLIENTS.clear()
+        _POOL_STATS.clear()
+
+
+def mongo_ping() -> tuple[bool, str]:
+    client = get_mongo_client()
+    if client is None:
         return False, "MONGO_URI not set"
     try:
-        client = MongoClient(uri, serverSelectionTimeoutMS=3000)
-        client.server_info()
-        return True, "MongoDB connection successful"
+        client.admin.command("ping")
+        return True, "MongoDB ping OK"
+    except ServerSelectionTimeoutError as e:
+        return False, f"Server selection timeout: {e}"
     except Exception as e:
-        return False, str(e)
+        return False, f"{type(e).__name__}: {e}"
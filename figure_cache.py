@@ -0,0 +1,210 @@
+# Content-addressed cache for the Step 4 dashboard figures
+import configparser
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import plotly
+import plotly.graph_objects as go
+
+from caching import TTLCache
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.ini")
+
+
+def source_version(*paths: str) -> str:
+    """
+    Short hash of the source files a set of figure builders depends on, so editing any of
+    them invalidates the cached specs.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as fh:
+            digest.update(fh.read())
+    return digest.hexdigest()[:12]
+
+
+def figure_key(name: str, question_data: List[Dict[str, Any]], version: str = "") -> str:
+    """
+    sha256 of the visualization name, builder version and the answers it is drawn from.
+    """
+    payload = json.dumps(
+        {"name": name, "version": version, "data": question_data},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FigureCache:
+    """
+    Two-tier cache of built Plotly figures plus the metric values shown next to them.
+    The in-memory LRU keeps the Figure objects themselves: st.plotly_chart serializes a
+    Figure without re-validating it, which a plain dict spec would cost on every rerun.
+    The optional SQLite tier stores figure JSON and is shared by every session and worker
+    on the host. Cached figures are shared, so callers must not mutate them.
+    """
+
+    def __init__(self, path: Optional[str], ttl: float = 7 * 24 * 3600, max_entries: int = 2000,
+                 memory_entries: int = 64):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory = TTLCache(maxsize=memory_entries, ttl=ttl)
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS figures ("
+                " key TEXT PRIMARY KEY, name TEXT, spec TEXT NOT NULL,"
+                " created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS figures_last_used ON figures (last_used)")
+            self._conn.commit()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.build_seconds = 0.0
+
+    def get(self, key: str) -> Optional[Tuple[go.Figure, Dict[str, Any]]]:
+        value = self.memory.get(key)
+        if value is not None:
+            with self._lock:
+                self.memory_hits += 1
+            return value
+        if self._conn is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT spec, created_at FROM figures WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] + self.ttl <= now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM figures WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self.evictions += 1
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE figures SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.disk_hits += 1
+        entry = json.loads(row[0])
+        # The spec was produced by a validated Figure, so skip plotly's per-property checks
+        value = (go.Figure(entry["figure"], _validate=False), entry["stats"])
+        self.memory.set(key, value, ttl=row[1] + self.ttl - now)
+        return value
+
+    def set(self, key: str, fig: go.Figure, stats: Dict[str, Any], name: str = "") -> None:
+        self.memory.set(key, (fig, stats))
+        if self._conn is None:
+            with self._lock:
+                self.writes += 1
+            return
+        spec = '{"figure":%s,"stats":%s}' % (fig.to_json(), json.dumps(stats, default=str))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO figures (key, name, spec, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, name, spec, now, now),
+            )
+            self.writes += 1
+            cur = self._conn.execute("DELETE FROM figures WHERE created_at <= ?", (now - self.ttl,))
+            self.evictions += cur.rowcount
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM figures").fetchone()
+            if count > self.max_entries:
+                cur = self._conn.execute(
+                    "DELETE FROM figures WHERE key IN (SELECT key FROM figures ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+                self.evictions += cur.rowcount
+            self._conn.commit()
+
+    def record_build(self, seconds: float) -> None:
+        with self._lock:
+            self.build_seconds += seconds
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM figures")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self.memory)
+            if self._conn is not None:
+                (entries,) = self._conn.execute("SELECT COUNT(*) FROM figures").fetchone()
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "disk": self._conn is not None,
+                "entries": entries,
+                "memory_entries": len(self.memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "build_seconds": round(self.build_seconds, 3),
+            }
+
+
+_CACHE: Optional[FigureCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_figure_cache() -> FigureCache:
+    """
+    Process-wide cache configured from the [FIGURE_CACHE] section of config.ini.
+    With disk = false only the in-memory tier is used.
+    """
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                cfg = configparser.ConfigParser()
+                cfg.read(CONFIG_PATH, encoding="utf-8")
+                sec = cfg["FIGURE_CACHE"] if cfg.has_section("FIGURE_CACHE") else {}
+                path = None
+                if str(sec.get("disk", "true")).strip().lower() in ("1", "true", "yes", "on"):
+                    path = sec.get("path", ".figure_cache.sqlite3")
+                    if not os.path.isabs(path):
+                        path = os.path.join(os.path.dirname(CONFIG_PATH), path)
+                _CACHE = FigureCache(
+                    path,
+                    ttl=float(sec.get("ttl_hours", 168)) * 3600,
+                    max_entries=int(sec.get("max_entries", 2000)),
+                    memory_entries=int(sec.get("memory_entries", 64)),
+                )
+    return _CACHE
+
+
+def cached_figure(name: str, question_data: List[Dict[str, Any]],
+                  builder: Callable[..., Tuple[go.Figure, Dict[str, Any]]], *args,
+                  version: str = "") -> Tuple[go.Figure, Dict[str, Any]]:
+    """
+    Returns `(figure, stats)` for `builder(question_data, *args)`, building only on a miss.
+    `builder` must be a pure function of `question_data` (extra args derived from it) and
+    return a Plotly figure plus a JSON-serializable dict of metric values.
+    """
+    cache = get_figure_cache()
+    # Disk hits are rehydrated unvalidated, so a plotly upgrade must retire them too
+    key = figure_key(name, question_data, f"{version}:plotly-{plotly.__version__}")
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+    started = time.perf_counter()
+    fig, stats = builder(question_data, *args)
+    cache.record_build(time.perf_counter() - started)
+    cache.set(key, fig, stats, name)
+    return fig, stats
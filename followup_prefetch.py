@@ -0,0 +1,134 @@
+# Speculative background generation of the next Section 2 follow-up question
+import hashlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+def answer_hash(answer: str) -> str:
+    return hashlib.sha256(" ".join(str(answer).split()).encode("utf-8")).hexdigest()
+
+
+class _Job:
+    __slots__ = ("hash", "fn", "future", "timer", "started", "created_at")
+
+    def __init__(self, h: str, fn: Callable[[], Any]):
+        self.hash = h
+        self.fn = fn
+        self.future = Future()
+        self.timer = None
+        self.started = False
+        self.created_at = time.monotonic()
+
+
+class FollowupPrefetcher:
+    """
+    One speculative job per slot (session + question index). A job starts only after
+    its answer has stayed unchanged for `debounce` seconds, or as soon as take() asks
+    for it; scheduling a different answer for the same slot discards the previous job
+    and its result.
+    """
+
+    def __init__(self, debounce: float = 1.0, max_workers: int = 4, ttl: float = 900.0):
+        self.debounce = debounce
+        self.ttl = ttl
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="followup-prefetch")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.started = 0
+        self.used = 0
+        self.discarded = 0
+
+    def schedule(self, slot, h: str, fn: Callable[[], Any]) -> None:
+        with self._lock:
+            job = self._jobs.get(slot)
+            if job is not None and job.hash == h:
+                return
+            if job is not None:
+                self._discard(job)
+            self._expire()
+            job = _Job(h, fn)
+            job.timer = threading.Timer(self.debounce, self._start, args=(slot, job))
+            job.timer.daemon = True
+            self._jobs[slot] = job
+        job.timer.start()
+
+    def _start(self, slot, job: _Job) -> None:
+        with self._lock:
+            if self._jobs.get(slot) is not job:
+                return
+            self._submit(job)
+
+    def _submit(self, job: _Job) -> None:
+        # Caller holds self._lock
+        job.started = True
+        self.started += 1
+        self._pool.submit(self._run, job)
+
+    @staticmethod
+    def _run(job: _Job) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            return
+        try:
+            job.future.set_result(job.fn())
+        except Exception as e:
+            job.future.set_exception(e)
+
+    def _discard(self, job: _Job) -> None:
+        if job.timer is not None:
+            job.timer.cancel()
+        job.future.cancel()
+        self.discarded += 1
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        for slot in [s for s, j in self._jobs.items() if j.created_at < cutoff]:
+            self._discard(self._jobs.pop(slot))
+
+    def take(self, slot, h: str, timeout: Optional[float] = None,
+             fn: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Returns the result for `h`, waiting up to `timeout` seconds for it. A matching job
+        still inside its debounce window is started immediately; with `fn`, a missing or
+        stale job is replaced by `fn` started now. Returns None if there is nothing to
+        wait for, the wait times out or the job failed; the caller then falls back.
+        """
+        with self._lock:
+            job = self._jobs.pop(slot, None)
+            if job is not None and job.hash != h:
+                self._discard(job)
+                job = None
+            if job is None:
+                if fn is None:
+                    return None
+                job = _Job(h, fn)
+            if not job.started:
+                if job.timer is not None:
+                    job.timer.cancel()
+                self._submit(job)
+        try:
+            result = job.future.result(timeout)
+        except Exception:
+            return None
+        with self._lock:
+            self.used += 1
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"pending": len(self._jobs), "started": self.started, "used": self.used,
+                    "discarded": self.discarded}
+
+
+_PREFETCHER: Optional[FollowupPrefetcher] = None
+_PREFETCHER_LOCK = threading.Lock()
+
+
+def get_prefetcher(debounce: float = 1.0) -> FollowupPrefetcher:
+    global _PREFETCHER
+    if _PREFETCHER is None:
+        with _PREFETCHER_LOCK:
+            if _PREFETCHER is None:
+                _PREFETCHER = FollowupPrefetcher(debounce=debounce)
+    return _PREFETCHER
@@ -0,0 +1,100 @@
+# Functional specification generated one section per request, in parallel
+import configparser
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+from llm_cache import cached_completion
+from prompt_builder import build_prompt
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.ini")
+
+SPEC_SECTIONS = [
+    "System Overview",
+    "User Requirements",
+    "Functional Requirements",
+    "Technical Architecture",
+    "Security & Compliance",
+    "Performance Requirements",
+    "User Interface",
+    "Testing Requirements",
+    "Implementation Plan",
+    "Success Metrics",
+]
+
+SYSTEM_PROMPT = "You are a senior Business and Technical Analyst at a top-tier technology consulting firm, specializing in AI and Banking solutions."
+
+
+def spec_settings() -> Dict[str, Any]:
+    cfg = configparser.ConfigParser()
+    cfg.read(CONFIG_PATH, encoding="utf-8")
+    sec = cfg["FUNCTIONAL_SPEC"] if cfg.has_section("FUNCTIONAL_SPEC") else {}
+    return {
+        "mode": sec.get("mode", "sectioned"),
+        "model": sec.get("model", "gpt-4"),
+        "max_parallel": int(sec.get("max_parallel", 4)),
+        "section_max_tokens": int(sec.get("section_max_tokens", 700)),
+        "temperature": float(sec.get("temperature", 0.2)),
+    }
+
+
+def section_messages(index: int, expert_analysis: str, survey_data: str) -> List[Dict[str, str]]:
+    title = SPEC_SECTIONS[index]
+    outline = ", ".join(f"{i + 1}. {s}" for i, s in enumerate(SPEC_SECTIONS))
+    prompt = build_prompt(
+        "spec_section",
+        "You are writing one section of a comprehensive Functional Specification for a Conversational "
+        f"Banking application. The full document has these sections: {outline}.\n\n"
+        f"Write ONLY section {index + 1}, \"{title}\", starting with the heading \"## {index + 1}. {title}\". "
+        "Do not repeat material that belongs in the other sections.\n\n"
+        "Expert Analysis:\n{expert}\n\nSurvey Data:\n{survey}",
+        expert=expert_analysis,
+        survey=survey_data,
+    )
+    return [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": prompt}]
+
+
+def stitch(sections: List[Optional[str]]) -> str:
+    parts = ["# Functional Specification"]
+    for i, text in enumerate(sections):
+        parts.append(text if text else f"## {i + 1}. {SPEC_SECTIONS[i]}\n\n_This section could not be generated._")
+    return "\n\n".join(parts)
+
+
+def generate_sections(client, expert_analysis: str, survey_data: str, previous: List[Optional[str]] = None,
+                      settings: Dict[str, Any] = None,
+                      on_section: Callable[[int, Optional[str], Optional[Exception]], None] = None) -> Dict[str, Any]:
+    """
+    Requests every section not already present in `previous` concurrently, at most
+    `max_parallel` at a time. Each section is its own cached completion, so a retry only
+    pays for the sections that failed. `on_section(index, text, error)` is called on the
+    caller's thread as each one finishes. Returns {"sections": [...], "errors": {index: str}}.
+    """
+    settings = settings or spec_settings()
+    sections = list(previous) if previous and len(previous) == len(SPEC_SECTIONS) else [None] * len(SPEC_SECTIONS)
+    todo = [i for i, text in enumerate(sections) if not text]
+    errors = {}
+
+    def run(i):
+        return cached_completion(client, settings["model"], section_messages(i, expert_analysis, survey_data),
+                                 temperature=settings["temperature"], max_tokens=settings["section_max_tokens"],
+                                 validate=lambda t: len(t) >= 20)
+
+    with ThreadPoolExecutor(max_workers=max(1, settings["max_parallel"]), thread_name_prefix="func-spec") as pool:
+        futures = {pool.submit(run, i): i for i in todo}
+        for fut in as_completed(futures):
+            i = futures[fut]
+            text, error = None, None
+            try:
+                text = fut.result()
+                if len(text) < 20:
+                    error = ValueError("empty response")
+                    text = None
+            except Exception as e:
+                error = e
+            sections[i] = text
+            if error is not None:
+                errors[i] = str(error)
+            if on_section:
+                on_section(i, text, error)
+    return {"sections": sections, "errors": errors}
@@ -0,0 +1,108 @@
+# Background connectivity monitor for OpenAI and MongoDB
+import threading
+import time
+
+from db_client import mongo_ping
+from llm_client import get_openai_client
+
+
+def probe_openai() -> tuple[bool, str]:
+    client = get_openai_client()
+    if client is None:
+        return False, "OPENAI_API_KEY not set or openai package missing"
+    # Shares the pooled connection but fails fast instead of retrying
+    models = client.raw.with_options(timeout=5.0, max_retries=0).models.list()
+    if hasattr(models, "data") and len(models.data) > 0:
+        return True, "OpenAI reachable"
+    return False, "OpenAI returned no models"
+
+
+def probe_mongo() -> tuple[bool, str]:
+    return mongo_ping()
+
+
+class HealthMonitor:
+    """
+    Probes external services on a daemon thread and caches the result.
+    Healthy services are re-probed every `ttl` seconds; failing ones back off
+    exponentially up to `max_backoff`, so readers never wait on the network.
+    """
+
+    def __init__(self, probes: dict, ttl: float = 60.0, base_backoff: float = 5.0, max_backoff: float = 300.0):
+        self.probes = probes
+        self.ttl = ttl
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._status = {name: {"ok": None, "detail": "checking…", "checked_at": 0.0, "failures": 0} for name in probes}
+        self._due = {name: 0.0 for name in probes}
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+                self._thread.start()
+        return self
+
+    def refresh(self, name: str = None):
+        """
+        Requests an immediate re-probe of one service (or all) without blocking.
+        """
+        with self._lock:
+            for n in ([name] if name else self._due):
+                self._due[n] = 0.0
+        self._wake.set()
+
+    def status(self, name: str = None) -> dict:
+        with self._lock:
+            if name:
+                return dict(self._status[name])
+            return {n: dict(s) for n, s in self._status.items()}
+
+    def _probe(self, name: str):
+        try:
+            ok, detail = self.probes[name]()
+        except Exception as e:
+            ok, detail = False, f"{type(e).__name__}: {e}"
+        now = time.time()
+        with self._lock:
+            failures = 0 if ok else self._status[name]["failures"] + 1
+            self._status[name] = {"ok": ok, "detail": detail, "checked_at": now, "failures": failures}
+            delay = self.ttl if ok else min(self.max_backoff, self.base_backoff * 2 ** (failures - 1))
+            self._due[name] = now + delay
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            now = time.time()
+            with self._lock:
+                due = [n for n, t in self._due.items() if t <= now]
+            for name in due:
+                self._probe(name)
+            with self._lock:
+                next_due = min(self._due.values()) if self._due else now + self.ttl
+            self._wake.wait(max(0.0, next_due - time.time()))
+
+
+_MONITOR = None
+_MONITOR_LOCK = threading.Lock()
+
+
+def get_monitor() -> HealthMonitor:
+    """
+    Returns the process-wide monitor, starting its thread on first use.
+    """
+    global _MONITOR
+    with _MONITOR_LOCK:
+        if _MONITOR is None:
+            _MONITOR = HealthMonitor({"openai": probe_openai, "mongo": probe_mongo}).start()
+        return _MONITOR
+
+
+def status_line(name: str, label: str) -> str:
+    s = get_monitor().status(name)
+    if s["ok"] is None:
+        return f"⏳ {label} checking…"
+    return f"✅ {label} Connected" if s["ok"] else f"❌ {label} Not Connected"
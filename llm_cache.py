@@ -0,0 +1,203 @@
+# Content-addressed cache for OpenAI chat completions
+import configparser
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from caching import TTLCache
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.ini")
+
+
+def cache_key(model: str, temperature: Optional[float], max_tokens: Optional[int], messages: List[Dict[str, Any]]) -> str:
+    """
+    sha256 of the request fields that determine the completion.
+    """
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "max_tokens": max_tokens, "messages": messages},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Two-tier response cache: an in-memory LRU in front of a local SQLite table.
+    Entries expire after `ttl` seconds; the table is trimmed to `max_entries` by
+    least recent use whenever a new response is stored.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, max_entries: int = 5000, memory_entries: int = 256):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory = TTLCache(maxsize=memory_entries, ttl=ttl)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, model TEXT, response TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used)")
+        self._conn.commit()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            with self._lock:
+                self.memory_hits += 1
+            return value
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] + self.ttl <= now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self.evictions += 1
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.disk_hits += 1
+        # Only the remaining lifetime carries over to the memory tier
+        self.memory.set(key, row[0], ttl=row[1] + self.ttl - now)
+        return row[0]
+
+    def set(self, key: str, response: str, model: str = "") -> None:
+        now = time.time()
+        self.memory.set(key, response)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now),
+            )
+            self.writes += 1
+            cur = self._conn.execute("DELETE FROM llm_cache WHERE created_at <= ?", (now - self.ttl,))
+            self.evictions += cur.rowcount
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            if count > self.max_entries:
+                cur = self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+                self.evictions += cur.rowcount
+            self._conn.commit()
+
+    def pop(self, key: str) -> None:
+        self.memory.pop(key)
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        self.memory.clear()
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "entries": entries,
+                "memory_entries": len(self.memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            }
+
+
+_CACHE: Optional[LLMCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """
+    Process-wide cache configured from the [LLM_CACHE] section of config.ini.
+    """
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                cfg = configparser.ConfigParser()
+                cfg.read(CONFIG_PATH, encoding="utf-8")
+                sec = cfg["LLM_CACHE"] if cfg.has_section("LLM_CACHE") else {}
+                path = sec.get("path", ".llm_cache.sqlite3")
+                if not os.path.isabs(path):
+                    path = os.path.join(os.path.dirname(CONFIG_PATH), path)
+                _CACHE = LLMCache(
+                    path,
+                    ttl=float(sec.get("ttl_hours", 168)) * 3600,
+                    max_entries=int(sec.get("max_entries", 5000)),
+                    memory_entries=int(sec.get("memory_entries", 256)),
+                )
+    return _CACHE
+
+
+def cached_completion(client, model: str, messages: List[Dict[str, Any]], temperature: Optional[float] = None,
+                      max_tokens: Optional[int] = None, validate: Callable[[str], bool] = None) -> str:
+    """
+    Returns the completion text for the request, calling `client` only on a cache miss.
+    Responses rejected by `validate` are returned but not stored, so a retry asks again.
+    """
+    cache = get_llm_cache()
+    key = cache_key(model, temperature, max_tokens, messages)
+    text = cache.get(key)
+    if text is not None:
+        return text
+    kwargs = {"model": model, "messages": messages}
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    if max_tokens is not None:
+        kwargs["max_tokens"] = max_tokens
+    text = (client.chat.completions.create(**kwargs).choices[0].message.content or "").strip()
+    if text and (validate is None or validate(text)):
+        cache.set(key, text, model)
+    return text
+
+
+def stream_completion(client, model: str, messages: List[Dict[str, Any]], temperature: Optional[float] = None,
+                      max_tokens: Optional[int] = None, validate: Callable[[str], bool] = None) -> Iterator[str]:
+    """
+    Streaming counterpart of cached_completion(): yields text deltas as they arrive and
+    stores the assembled response once the stream completes. A cache hit yields the
+    stored text in one piece.
+    """
+    cache = get_llm_cache()
+    key = cache_key(model, temperature, max_tokens, messages)
+    text = cache.get(key)
+    if text is not None:
+        yield text
+        return
+    kwargs = {"model": model, "messages": messages, "stream": True}
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    if max_tokens is not None:
+        kwargs["max_tokens"] = max_tokens
+    parts = []
+    for chunk in client.chat.completions.create(**kwargs):
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            yield delta
+    text = "".join(parts).strip()
+    if text and (validate is None or validate(text)):
+        cache.set(key, text, model)
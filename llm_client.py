@@ -0,0 +1,202 @@
+# Shared OpenAI client: one keep-alive connection pool, timeouts, retry and a concurrency cap
+import configparser
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+try:
+    import openai
+    from openai import OpenAI
+except Exception:
+    openai = None
+    OpenAI = None
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.ini")
+
+DEFAULTS = {
+    "connect_timeout": 5.0,
+    "read_timeout": 60.0,
+    "max_retries": 4,
+    "retry_base_delay": 0.5,
+    "retry_max_delay": 20.0,
+    "max_concurrent": 8,
+}
+
+
+def client_settings() -> Dict[str, float]:
+    """
+    Reads the client knobs from [OPENAI] in config.ini, falling back to DEFAULTS.
+    """
+    cfg = configparser.ConfigParser()
+    cfg.read(CONFIG_PATH, encoding="utf-8")
+    sec = cfg["OPENAI"] if cfg.has_section("OPENAI") else {}
+    return {k: type(v)(sec.get(k, v)) for k, v in DEFAULTS.items()}
+
+
+def _retryable(e: Exception) -> bool:
+    if isinstance(e, (openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    return isinstance(e, openai.APIStatusError) and e.status_code >= 500
+
+
+def _retry_after(e: Exception) -> Optional[float]:
+    response = getattr(e, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except Exception:
+        return None
+
+
+class _Completions:
+    def __init__(self, owner: "LLMClient"):
+        self._owner = owner
+
+    def create(self, **kwargs):
+        return self._owner.chat_completion(**kwargs)
+
+
+class _Chat:
+    def __init__(self, owner: "LLMClient"):
+        self.completions = _Completions(owner)
+
+
+class _HeldStream:
+    """
+    Iterates an SDK stream while holding a concurrency slot. The slot is released exactly
+    once: when the stream is exhausted or raises, on close(), or when the object is
+    garbage-collected. That last case covers a caller that drops the stream before the
+    first next(), e.g. when a Streamlit rerun interrupts the script in between.
+    """
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._iter = iter(stream)
+        self._release = release
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.closed:
+            raise StopIteration
+        try:
+            return next(self._iter)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+        try:
+            close = getattr(self._stream, "close", None)
+            if close:
+                close()
+        finally:
+            self._release()
+
+    def __del__(self):
+        self.close()
+
+
+class LLMClient:
+    """
+    Wraps one OpenAI client for the whole process. Exposes `chat.completions.create`
+    like the SDK, but every call first takes a slot from a process-wide semaphore and
+    retries 429/5xx/timeouts with full-jitter exponential backoff (honouring Retry-After).
+    Streaming calls hold their slot until the stream is exhausted, closed or dropped.
+    """
+
+    def __init__(self, api_key: str, settings: Dict[str, float]):
+        self.settings = settings
+        # One SDK client per process keeps its HTTP connection pool alive between calls.
+        # The SDK's own retries are disabled; _call() owns the retry policy.
+        self.raw = OpenAI(api_key=api_key, max_retries=0,
+                          timeout=openai.Timeout(settings["read_timeout"], connect=settings["connect_timeout"]))
+        self.slots = threading.BoundedSemaphore(int(settings["max_concurrent"]))
+        self.chat = _Chat(self)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+
+    def _acquire(self):
+        self.slots.acquire()
+        with self._lock:
+            self.in_flight += 1
+
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self.slots.release()
+
+    def _call(self, fn, *args, **kwargs):
+        attempts = int(self.settings["max_retries"]) + 1
+        for attempt in range(attempts):
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if attempt + 1 >= attempts or not _retryable(e):
+                    with self._lock:
+                        self.failures += 1
+                    raise
+                delay = random.uniform(0, min(self.settings["retry_max_delay"],
+                                              self.settings["retry_base_delay"] * 2 ** attempt))
+                delay = max(delay, _retry_after(e) or 0.0)
+                with self._lock:
+                    self.retries += 1
+                time.sleep(delay)
+
+    def chat_completion(self, **kwargs):
+        with self._lock:
+            self.calls += 1
+        self._acquire()
+        if not kwargs.get("stream"):
+            try:
+                return self._call(self.raw.chat.completions.create, **kwargs)
+            finally:
+                self._release()
+        try:
+            stream = self._call(self.raw.chat.completions.create, **kwargs)
+        except Exception:
+            self._release()
+            raise
+        return _HeldStream(stream, self._release)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"in_flight": self.in_flight, "max_concurrent": int(self.settings["max_concurrent"]),
+                    "calls": self.calls, "retries": self.retries, "failures": self.failures}
+
+
+_CLIENTS: Dict[str, LLMClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_openai_client() -> Optional[LLMClient]:
+    """
+    Returns the process-wide client for the current OPENAI_API_KEY, or None when the key
+    or the openai package is missing.
+    """
+    api_key = os.getenv("OPENAI_API_KEY", "")
+    if not api_key or OpenAI is None:
+        return None
+    client = _CLIENTS.get(api_key)
+    if client is None:
+        with _CLIENTS_LOCK:
+            client = _CLIENTS.get(api_key)
+            if client is None:
+                client = LLMClient(api_key, client_settings())
+                _CLIENTS[api_key] = client
+    return client
+
+
+def client_stats() -> list:
+    return [c.stats() for c in list(_CLIENTS.values())]
@@ -0,0 +1,358 @@
+# Process-wide LLM gateway: single-flight, token-bucket rate limits and per-session fair queueing
+import asyncio
+import configparser
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from llm_client import client_settings, get_openai_client
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.ini")
+
+
+class TokenBucket:
+    """
+    Refills continuously at `per_minute` / 60 per second up to `per_minute`; a limit of 0
+    means unlimited. Only used from the gateway's event loop.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.unlimited = self.capacity <= 0
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def take(self, n: float) -> float:
+        """
+        Waits until `n` tokens are available and takes them; returns the seconds waited.
+        """
+        if self.unlimited:
+            return 0.0
+        n = min(n, self.capacity)
+        waited = 0.0
+        while True:
+            self._refill()
+            if self.tokens >= n:
+                self.tokens -= n
+                return waited
+            delay = (n - self.tokens) / self.rate
+            waited += delay
+            await asyncio.sleep(delay)
+
+    def adjust(self, n: float):
+        # Positive n returns over-estimated tokens, negative n charges the difference
+        if self.unlimited:
+            return
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + n)
+
+
+def estimate_tokens(kwargs: Dict[str, Any]) -> int:
+    prompt_chars = sum(len(str(m.get("content", ""))) for m in kwargs.get("messages", []))
+    return prompt_chars // 4 + int(kwargs.get("max_tokens") or 1024)
+
+
+def request_key(kwargs: Dict[str, Any]) -> str:
+    payload = json.dumps(kwargs, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def wait_timeout(settings: Dict[str, float]) -> float:
+    """
+    How long a caller waits on its flight before giving up: every attempt the shared
+    client may make at `read_timeout`, plus its longest backoff between them.
+    """
+    retries = int(settings["max_retries"])
+    return settings["read_timeout"] * (retries + 1) + settings["retry_max_delay"] * retries
+
+
+def _check_limits(name: str, limits) -> None:
+    try:
+        rpm, tpm = limits
+        ok = float(rpm) >= 0 and float(tpm) >= 0
+    except (TypeError, ValueError):
+        ok = False
+    if not ok:
+        raise ValueError(f"LLM gateway: {name} limits must be [requests/min, tokens/min] >= 0 "
+                         f"(0 = unlimited), got {limits!r}")
+
+
+class _Flight:
+    """
+    One upstream request and everyone waiting on it. Stream chunks are kept so callers
+    that join late replay the stream from the start.
+    """
+
+    def __init__(self, key: str, kwargs: Dict[str, Any]):
+        self.key = key
+        self.kwargs = kwargs
+        self.model = kwargs.get("model", "")
+        self.estimate = estimate_tokens(kwargs)
+        self.chunks = []
+        self.response = None
+        self.error = None
+        self.done = False
+        self.cond = threading.Condition()
+
+    def push(self, chunk):
+        with self.cond:
+            self.chunks.append(chunk)
+            self.cond.notify_all()
+
+    def finish(self, response=None, error: Exception = None):
+        with self.cond:
+            self.response = response
+            self.error = error
+            self.done = True
+            self.cond.notify_all()
+
+    def result(self, timeout: float = None):
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.done, timeout):
+                raise TimeoutError(f"LLM gateway: no response within {timeout:.0f}s")
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+    def iter_chunks(self, timeout: float = None):
+        # `timeout` bounds each wait for the next chunk, not the whole stream
+        i = 0
+        while True:
+            with self.cond:
+                if not self.cond.wait_for(lambda: self.done or i < len(self.chunks), timeout):
+                    raise TimeoutError(f"LLM gateway: no stream chunk within {timeout:.0f}s")
+                batch = self.chunks[i:]
+                finished = self.done
+            yield from batch
+            i += len(batch)
+            if finished and i >= len(self.chunks):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class _Limits:
+    def __init__(self, rpm: float, tpm: float):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+
+
+class LLMGateway:
+    """
+    Runs an asyncio loop on a daemon thread that admits LLM calls from all Streamlit
+    script threads. Identical in-flight requests share one upstream call; admitted
+    calls are taken round-robin across sessions and held until the per-model
+    requests/min and tokens/min buckets allow them, instead of failing with 429s.
+    The SDK call itself runs on a worker pool through the shared llm_client; callers
+    wait at most `wait_timeout` seconds for it (per chunk when streaming).
+    """
+
+    def __init__(self, rpm: float = 500, tpm: float = 200000, model_limits: Dict[str, list] = None,
+                 max_concurrent: int = 8, wait_timeout: float = 300.0):
+        self.default_limits = (rpm, tpm)
+        self.model_limits = model_limits or {}
+        _check_limits("default", self.default_limits)
+        for model, limits in self.model_limits.items():
+            _check_limits(model, limits)
+        self.max_concurrent = max_concurrent
+        self.wait_timeout = wait_timeout
+        self._limits = {}
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self._queues = {}
+        self._ready = deque()
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="llm-gateway")
+        self.counters = {"requests": 0, "coalesced": 0, "dispatched": 0, "rate_wait_s": 0.0}
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name="llm-gateway", daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._work = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._loop.create_task(self._dispatch())
+        self._started.set()
+        self._loop.run_forever()
+
+    def _limits_for(self, model: str) -> _Limits:
+        limits = self._limits.get(model)
+        if limits is None:
+            rpm, tpm = self.model_limits.get(model, self.default_limits)
+            limits = self._limits[model] = _Limits(rpm, tpm)
+        return limits
+
+    # -- caller side (any thread) --
+
+    def request(self, session: str, kwargs: Dict[str, Any]):
+        """
+        Same contract as `chat.completions.create(**kwargs)`: returns the response, or
+        an iterator of chunks when kwargs has stream=True.
+        """
+        key = request_key(kwargs)
+        with self._flights_lock:
+            self.counters["requests"] += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.counters["coalesced"] += 1
+            else:
+                flight = self._flights[key] = _Flight(key, dict(kwargs))
+                self._loop.call_soon_threadsafe(self._enqueue, session or "", flight)
+        if kwargs.get("stream"):
+            return flight.iter_chunks(self.wait_timeout)
+        return flight.result(self.wait_timeout)
+
+    def client(self, session: str) -> "GatewayClient":
+        return GatewayClient(self, session)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._flights_lock:
+            out = dict(self.counters, in_flight=len(self._flights))
+        out["queued"] = sum(len(q) for q in list(self._queues.values()))
+        out["sessions_waiting"] = len(self._queues)
+        out["rate_wait_s"] = round(out["rate_wait_s"], 2)
+        return out
+
+    # -- event loop side --
+
+    def _enqueue(self, session: str, flight: _Flight):
+        queue = self._queues.get(session)
+        if queue is None:
+            queue = self._queues[session] = deque()
+            self._ready.append(session)
+        queue.append(flight)
+        self._work.set()
+
+    def _next_flight(self) -> _Flight:
+        # Round-robin: one request per waiting session per turn
+        session = self._ready.popleft()
+        queue = self._queues[session]
+        flight = queue.popleft()
+        if queue:
+            self._ready.append(session)
+        else:
+            del self._queues[session]
+        return flight
+
+    async def _dispatch(self):
+        while True:
+            if not self._ready:
+                self._work.clear()
+                await self._work.wait()
+                continue
+            await self._slots.acquire()
+            flight = None
+            try:
+                flight = self._next_flight()
+                limits = self._limits_for(flight.model)
+                waited = await limits.requests.take(1)
+                waited += await limits.tokens.take(flight.estimate)
+                self.counters["rate_wait_s"] += waited
+                self.counters["dispatched"] += 1
+                fut = self._loop.run_in_executor(self._pool, self._execute, flight)
+            except Exception as e:
+                # Fail this flight's callers, not every later request
+                self._slots.release()
+                if flight is not None:
+                    flight.finish(error=e)
+                    self._drop(flight)
+                continue
+            fut.add_done_callback(lambda f, fl=flight, lim=limits: self._finished(f, fl, lim))
+
+    def _finished(self, fut, flight: _Flight, limits: _Limits):
+        self._slots.release()
+        usage = getattr(flight.response, "usage", None)
+        if usage is not None and getattr(usage, "total_tokens", None):
+            limits.tokens.adjust(flight.estimate - usage.total_tokens)
+
+    def _execute(self, flight: _Flight):
+        try:
+            client = get_openai_client()
+            if client is None:
+                raise RuntimeError("OPENAI_API_KEY not set or openai package missing.")
+            if flight.kwargs.get("stream"):
+                for chunk in client.chat.completions.create(**flight.kwargs):
+                    flight.push(chunk)
+                flight.finish()
+            else:
+                flight.finish(response=client.chat.completions.create(**flight.kwargs))
+        except Exception as e:
+            flight.finish(error=e)
+        finally:
+            self._drop(flight)
+
+    def _drop(self, flight: _Flight):
+        with self._flights_lock:
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+
+
+class _GatewayCompletions:
+    def __init__(self, gateway: LLMGateway, session: str):
+        self._gateway = gateway
+        self._session = session
+
+    def create(self, **kwargs):
+        return self._gateway.request(self._session, kwargs)
+
+
+class _GatewayChat:
+    def __init__(self, gateway: LLMGateway, session: str):
+        self.completions = _GatewayCompletions(gateway, session)
+
+
+class GatewayClient:
+    """
+    Per-session handle with the SDK's `chat.completions.create` shape, so llm_cache and
+    the call sites work unchanged.
+    """
+
+    def __init__(self, gateway: LLMGateway, session: str):
+        self.chat = _GatewayChat(gateway, session)
+
+
+_GATEWAY: Optional[LLMGateway] = None
+_GATEWAY_LOCK = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """
+    Process-wide gateway configured from [OPENAI] in config.ini.
+    """
+    global _GATEWAY
+    if _GATEWAY is None:
+        with _GATEWAY_LOCK:
+            if _GATEWAY is None:
+                cfg = configparser.ConfigParser()
+                cfg.read(CONFIG_PATH, encoding="utf-8")
+                sec = cfg["OPENAI"] if cfg.has_section("OPENAI") else {}
+                _GATEWAY = LLMGateway(
+                    rpm=float(sec.get("requests_per_minute", 500)),
+                    tpm=float(sec.get("tokens_per_minute", 200000)),
+                    model_limits=json.loads(sec.get("model_rate_limits", "{}")),
+                    max_concurrent=int(sec.get("max_concurrent", 8)),
+                    wait_timeout=wait_timeout(client_settings()),
+                )
+    return _GATEWAY
+
+
+def gateway_client(session: str) -> Optional[GatewayClient]:
+    """
+    Returns the session's gateway handle, or None when no OpenAI client can be built.
+    """
+    if get_openai_client() is None:
+        return None
+    return get_gateway().client(session)
@@ -0,0 +1,263 @@
+# Local follow-up question generator driven by scoring_rules.json keywords and a template bank
+import re
+from typing import Dict, Iterable, List, Optional
+
+from scoring import ScoringEngine, get_engine, tokenize
+
+# {term} is a pillar keyword or entity found in the answer, {metric} a number the answer quotes.
+TEMPLATES: Dict[str, Dict[str, List[str]]] = {
+    "Business & Strategic Alignment": {
+        "term": [
+            "You mentioned {term} — what is the baseline today, and what target would make the POC a success?",
+            "Who owns {term} on the business side, and how will they sign off on the POC results?",
+        ],
+        "gap": [
+            "Which two or three KPIs (e.g. containment, CSAT, AHT) will decide whether this POC moves to production?",
+            "Which customer persona and journey should the POC prove value for first, and why that one?",
+        ],
+    },
+    "Scope & Use Cases": {
+        "term": [
+            "How does {term} shape the POC scope — which intents are in, and which are explicitly out?",
+            "Should the bot complete {term} requests end to end, or stay informational for the POC?",
+        ],
+        "gap": [
+            "Which five to seven customer intents generate the most contact volume today?",
+            "Which languages and regulatory regimes (e.g. MAS, PDPA, PCI) bound the POC scope?",
+        ],
+    },
+    "Technology & Integration": {
+        "term": [
+            "You mentioned {term} — which systems behind it must the bot integrate with, and are those APIs production-ready?",
+            "How does {term} affect authentication and session handling for the bot?",
+        ],
+        "gap": [
+            "Which core banking, CRM or payments APIs must the POC integrate with, and who owns them?",
+            "Which channels (app, web, WhatsApp, IVR) should the first release run on?",
+        ],
+    },
+    "Risk, Governance & Operations": {
+        "term": [
+            "How will {term} be governed during the POC — who monitors it, and what happens when it goes wrong?",
+            "Which SLA or escalation rule applies to {term}, and who is accountable for it?",
+        ],
+        "gap": [
+            "How will conversations be monitored and reviewed for bias, fairness and harmful content during the POC?",
+            "What is the human hand-off process when the bot cannot resolve a request?",
+        ],
+    },
+    "Infrastructure, AI Readiness & Security": {
+        "term": [
+            "Is {term} already approved by your security team for customer data, or does it need a new assessment?",
+            "Where will {term} run — on-prem, private cloud or a public region — and does data residency allow it?",
+        ],
+        "gap": [
+            "Which hosting environment and MLOps platform will the POC be deployed on?",
+            "Which GenAI-specific security controls (prompt-injection defence, data masking, logging) are already in place?",
+        ],
+    },
+    "Model & Platform": {
+        "term": [
+            "Is {term} on your approved model list, and can customer data be sent to it?",
+            "Would you ground {term} with retrieval over bank content, fine-tune it, or use it as-is?",
+        ],
+        "gap": [
+            "Which LLM providers or platforms are approved for use with customer data today?",
+            "How will the bot be grounded in bank policies and product content to avoid hallucinated answers?",
+        ],
+    },
+    "Validation & Testing": {
+        "term": [
+            "What evaluation data and pass criteria will you use for {term} before sign-off?",
+            "Who signs off on {term}, and is red-team testing part of that gate?",
+        ],
+        "gap": [
+            "Will a sandbox environment with realistic test data be available from week one?",
+            "How will answer quality be measured during the POC — eval sets, human review or live metrics?",
+        ],
+    },
+}
+
+GENERIC = {
+    "term": ["Can you say more about {term} — who is involved, and what does success look like?"],
+    "metric": ["You quoted {metric} — is that a measured baseline, a target or a hard constraint, and how will the POC track it?"],
+    "gap": [
+        "What is the single biggest risk that could stop this POC from going live?",
+        "Who owns this process end to end, and who needs to approve the POC?",
+    ],
+}
+
+_NAME_RE = re.compile(r"\b[A-Z][A-Za-z0-9&/-]+(?:\s+[A-Z][A-Za-z0-9&/-]+)*\b")
+_SENTENCE_START_RE = re.compile(r"(?:^|[.!?;:]\s+)$")
+_METRIC_RE = re.compile(
+    r"\b\d+(?:[.,]\d+)?\s*(?:%|percent|ms|milliseconds?|seconds?|secs?|minutes?|mins?|hours?|hrs?|days?|weeks?"
+    r"|months?|years?|k|m|million|users|customers|calls|transactions|tps|rps)\b",
+    re.IGNORECASE,
+)
+_STOP_PROPER = frozenset("I We Our The This That It They Yes No We're I'm".split())
+
+
+def detect_entities(answer: str) -> Dict[str, List[str]]:
+    """
+    Capitalized names and acronyms ("Azure OpenAI", "MAS TRM") and quoted figures found
+    in the answer, in order of appearance. A lone capitalized word that starts a sentence
+    is not treated as a name.
+    """
+    text = str(answer)
+    seen, entities = set(), []
+    for m in _NAME_RE.finditer(text):
+        value = m.group(0).strip()
+        if value in _STOP_PROPER or value.lower() in seen:
+            continue
+        if " " not in value and not value.isupper() and _SENTENCE_START_RE.search(text[:m.start()]):
+            continue
+        seen.add(value.lower())
+        entities.append(value)
+    metrics = []
+    for m in _METRIC_RE.finditer(text):
+        if m.group(0) not in metrics:
+            metrics.append(m.group(0))
+    return {"entities": entities, "metrics": metrics}
+
+
+def _surface(answer: str, keyword: str) -> str:
+    # The keyword as the user wrote it ("WhatsApp", not "whatsapp")
+    m = re.search(r"(?<![A-Za-z0-9])" + re.escape(keyword) + r"(?![A-Za-z0-9])", answer, re.IGNORECASE)
+    return m.group(0) if m else keyword
+
+
+class LocalFollowupEngine:
+    """
+    Produces answer-specific follow-ups without a network call: pillar keywords the
+    answer hits (via the compiled ScoringEngine) and entities it names fill slots in
+    per-pillar templates; the question's own pillar contributes gap questions.
+    """
+
+    def __init__(self, engine: ScoringEngine = None):
+        self.engine = engine or get_engine()
+
+    def _bank(self, pillar: str) -> Dict[str, List[str]]:
+        return TEMPLATES.get(pillar, GENERIC)
+
+    def generate(self, answer: str, k: int = 5, pillar: Optional[str] = None, category: Optional[str] = None,
+                 exclude: Iterable[str] = ()) -> List[str]:
+        found = detect_entities(answer)
+        tokens = tokenize(answer)
+        hits = []  # (pillar, keyword) in keyword order
+        for kid in sorted(self.engine.match(tokens)):
+            kw, owners = self.engine.keywords[kid]
+            for pi in owners:
+                hits.append((self.engine.pillars[pi], kw))
+        # Keywords that appear in the answer verbatim read better than the normalized form
+        pos = {kw: str(answer).lower().find(kw.lower()) for _, kw in hits}
+        hits.sort(key=lambda h: (h[0] != pillar, pos.get(h[1], 0)))
+
+        primary = pillar or (hits[0][0] if hits else None)
+        answer = str(answer)
+        entities = found["entities"]
+
+        def term_for(kw):
+            # Prefer a detected name that contains the keyword ("Azure OpenAI" over "azure")
+            for ent in entities:
+                if kw.lower() in ent.lower().split():
+                    return ent
+            return _surface(answer, kw)
+
+        candidates = []
+        used_terms = set()
+        for p, kw in hits:
+            term = term_for(kw)
+            if term.lower() in used_terms:
+                continue
+            used_terms.add(term.lower())
+            candidates.append(self._bank(p)["term"][0].format(term=term))
+        for ent in entities:
+            if ent.lower() in used_terms:
+                continue
+            used_terms.add(ent.lower())
+            candidates.append(GENERIC["term"][0].format(term=ent))
+        if not candidates and category:
+            candidates.append(GENERIC["term"][0].format(term=category.split("/")[0].strip().lower()))
+        for metric in found["metrics"]:
+            candidates.append(GENERIC["metric"][0].format(metric=metric))
+        for p, kw in hits[:2]:
+            candidates.extend(t.format(term=term_for(kw)) for t in self._bank(p)["term"][1:])
+        candidates.extend(self._bank(primary)["gap"])
+        # Pillars the answer never touches are the most useful gaps to probe next
+        touched = {p for p, _ in hits}
+        for p in self.engine.pillars:
+            if p not in touched and p != primary:
+                candidates.append(self._bank(p)["gap"][0])
+        candidates.extend(GENERIC["gap"])
+
+        excluded = {" ".join(str(q).lower().split()) for q in exclude}
+        out = []
+        for q in candidates:
+            norm = " ".join(q.lower().split())
+            if norm in excluded:
+                continue
+            excluded.add(norm)
+            out.append(q)
+            if len(out) >= k:
+                break
+        return out
+
+
+_ENGINE: Optional[LocalFollowupEngine] = None
+
+
+def get_local_engine() -> LocalFollowupEngine:
+    global _ENGINE
+    if _ENGINE is None or _ENGINE.engine is not get_engine():
+        _ENGINE = LocalFollowupEngine()
+    return _ENGINE
+
+
+def local_followups(answer: str, k: int = 5, pillar: str = None, category: str = None,
+                    exclude: Iterable[str] = ()) -> List[str]:
+    return get_local_engine().generate(answer, k, pillar, category, exclude)
+
+
+if __name__ == "__main__":
+    import os
+    import statistics
+    import time
+
+    samples = [
+        "We want to cut call-centre volume by 30% using a WhatsApp bot for card block and fund transfer journeys.",
+        "Our core banking APIs sit behind Apigee; authentication is OTP today and we target 99.9% availability.",
+        "Compliance with MAS TRM and PDPA is mandatory, and the Risk team needs a human handoff within 2 minutes.",
+        "We plan to use Azure OpenAI with retrieval over product FAQs and evaluate with a red-team dataset.",
+        "Budget is approved for 3 months; success means CSAT above 4.2 and containment over 40%.",
+    ]
+    engine = get_local_engine()
+    for s in samples:
+        print(f"\n> {s}")
+        for q in engine.generate(s, 3):
+            print(f"  - {q}")
+    reps = 2000
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        for s in samples:
+            engine.generate(s, 5)
+    local_us = (time.perf_counter() - t0) / (reps * len(samples)) * 1e6
+    print(f"\nlocal engine: {local_us:.1f} µs per answer")
+
+    from llm_client import get_openai_client
+    client = get_openai_client()
+    if client is None:
+        print("LLM path: skipped (OPENAI_API_KEY not set)")
+    else:
+        timings = []
+        for s in samples:
+            t0 = time.perf_counter()
+            client.chat.completions.create(
+                model=os.getenv("FOLLOWUP_BENCH_MODEL", "gpt-4o-mini"),
+                messages=[{"role": "user", "content": f"User's previous answer: '{s}'. Generate one deep, analytical "
+                                                      "follow-up question only as a JSON list of one string."}],
+                max_tokens=120,
+            )
+            timings.append(time.perf_counter() - t0)
+        print(f"LLM path: median {statistics.median(timings) * 1000:.0f} ms, "
+              f"max {max(timings) * 1000:.0f} ms per answer "
+              f"({statistics.median(timings) * 1e6 / local_us:.0f}x the local engine)")
@@ -0,0 +1,103 @@
+# Background rendering of survey PDFs into the artifact store
+import copy
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Any, Dict, Optional
+
+from artifact_store import artifact_key, get_artifact_store
+from survey_pdf import build_survey_pdf
+
+
+class PDFWorker:
+    """
+    Renders survey PDFs on a small thread pool so the submit click returns as soon as
+    the document is saved. Each PDF is written once to the artifact store under a key
+    derived from the submission id and its content; submitting the same content again
+    reuses the stored file or the job already in flight.
+    """
+
+    def __init__(self, store, max_workers: int = 2, max_jobs: int = 256):
+        self.store = store
+        self.max_jobs = max_jobs
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdf-worker")
+        self._jobs: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.rendered = 0
+        self.reused = 0
+        self.failed = 0
+
+    def submit(self, submission_id: str, doc: Dict[str, Any]) -> str:
+        """
+        Queues the PDF for `doc` and returns its artifact key immediately.
+        """
+        snapshot = copy.deepcopy(doc)
+        key = artifact_key("survey-pdf", submission_id, snapshot)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not (job.done() and job.exception() is not None):
+                return key
+            if len(self._jobs) >= self.max_jobs:
+                # Finished jobs are only bookkeeping; the store still has their PDFs
+                for k in [k for k, j in self._jobs.items() if j.done()]:
+                    del self._jobs[k]
+            self._jobs[key] = self._pool.submit(self._render, key, submission_id, snapshot)
+        return key
+
+    def _render(self, key: str, submission_id: str, doc: Dict[str, Any]) -> None:
+        try:
+            if self.store.exists(key):
+                with self._lock:
+                    self.reused += 1
+                return
+            self.store.put(key, build_survey_pdf(doc), {"submission_id": submission_id, "kind": "survey-pdf"})
+            with self._lock:
+                self.rendered += 1
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+
+    def wait(self, key: str, timeout: Optional[float] = None) -> str:
+        """
+        Waits up to `timeout` seconds and returns "ready", "pending" or "failed".
+        Keys with no job in this process are "ready" if the store already has them.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is None:
+            return "ready" if self.store.exists(key) else "failed"
+        try:
+            job.result(timeout)
+        except TimeoutError:
+            return "pending"
+        except Exception:
+            return "failed"
+        return "ready"
+
+    def error(self, key: str) -> Optional[str]:
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is None or not job.done() or job.exception() is None:
+            return None
+        return str(job.exception())
+
+    def fetch(self, key: str) -> Optional[bytes]:
+        return self.store.get(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values() if not j.done())
+            return {"pending": pending, "rendered": self.rendered, "reused": self.reused, "failed": self.failed}
+
+
+_WORKER: Optional[PDFWorker] = None
+_WORKER_LOCK = threading.Lock()
+
+
+def get_pdf_worker() -> PDFWorker:
+    global _WORKER
+    if _WORKER is None:
+        with _WORKER_LOCK:
+            if _WORKER is None:
+                _WORKER = PDFWorker(get_artifact_store())
+    return _WORKER
@@ -0,0 +1,147 @@
+# Materialized per-pillar score statistics for the admin insights page
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import ReplaceOne, UpdateOne
+
+STATS_COLLECTION = "pillar_stats"
+OVERALL_ID = "overall"
+
+# One document per pillar plus one for the overall score:
+#   {_id: "pillar:<name>", name, count, sum, hist: {"<score>": n}, stages: {"<label>": n}}
+#   {_id: "overall", count, sum, hist: {"<overall>": n}}
+# Scores are small integers, so an exact value histogram gives min/max without ever
+# rescanning submissions, and every change is a plain $inc that can be undone.
+
+
+def stats_collection(col):
+    return col.database[STATS_COLLECTION]
+
+
+def _pillar_id(name: str) -> str:
+    return f"pillar:{name}"
+
+
+def _add(delta: Dict[str, Counter], scores: Optional[Dict[str, Any]], sign: int) -> None:
+    if not scores or not scores.get("pillars"):
+        return
+    inc = delta.setdefault(OVERALL_ID, Counter())
+    overall = scores.get("overall", 0)
+    inc["count"] += sign
+    inc["sum"] += sign * overall
+    inc[f"hist.{overall}"] += sign
+    for p in scores["pillars"]:
+        inc = delta.setdefault(_pillar_id(p["name"]), Counter())
+        inc["count"] += sign
+        inc["sum"] += sign * p.get("score", 0)
+        inc[f"hist.{p.get('score', 0)}"] += sign
+        inc[f"stages.{p.get('stage', '')}"] += sign
+
+
+def score_delta(changes: Iterable[tuple]) -> Dict[str, Counter]:
+    """
+    Folds (old_scores, new_scores) pairs into one $inc per stats document.
+    `old_scores` is None for documents that were not scored before.
+    """
+    delta = {}
+    for old, new in changes:
+        _add(delta, old, -1)
+        _add(delta, new, 1)
+    return delta
+
+
+def apply_delta(stats_col, delta: Dict[str, Counter]) -> None:
+    ops = []
+    for _id, inc in delta.items():
+        inc = {k: v for k, v in inc.items() if v}
+        if not inc:
+            continue
+        update = {"$inc": inc}
+        if _id != OVERALL_ID:
+            update["$set"] = {"name": _id.split(":", 1)[1]}
+        ops.append(UpdateOne({"_id": _id}, update, upsert=True))
+    if ops:
+        stats_col.bulk_write(ops, ordered=False)
+
+
+def record_scores(stats_col, new_scores: Dict[str, Any], old_scores: Optional[Dict[str, Any]] = None) -> None:
+    apply_delta(stats_col, score_delta([(old_scores, new_scores)]))
+
+
+REBUILD_PIPELINE = [
+    {"$match": {"scores.pillars.0": {"$exists": True}}},
+    {"$project": {"_id": 0, "overall": "$scores.overall", "pillars": "$scores.pillars"}},
+    {"$facet": {
+        "overall": [
+            {"$group": {"_id": "$overall", "n": {"$sum": 1}}},
+        ],
+        "pillars": [
+            {"$unwind": "$pillars"},
+            {"$group": {
+                "_id": {"name": "$pillars.name", "score": "$pillars.score", "stage": "$pillars.stage"},
+                "n": {"$sum": 1},
+            }},
+        ],
+    }},
+]
+
+
+def rebuild(col) -> int:
+    """
+    Recomputes pillar_stats from scratch with one aggregation over `col`, for repair
+    after out-of-band writes. Each stats document is replaced in place and only then
+    are pillars that no longer occur removed, so readers never see an empty collection.
+    Returns the number of scored documents counted.
+    """
+    result = next(col.aggregate(REBUILD_PIPELINE, allowDiskUse=True), {"overall": [], "pillars": []})
+    docs = {OVERALL_ID: {"_id": OVERALL_ID, "count": 0, "sum": 0, "hist": {}}}
+    for row in result["overall"]:
+        value, n = row["_id"] or 0, row["n"]
+        d = docs[OVERALL_ID]
+        d["count"] += n
+        d["sum"] += value * n
+        d["hist"][str(value)] = d["hist"].get(str(value), 0) + n
+    for row in result["pillars"]:
+        key, n = row["_id"], row["n"]
+        d = docs.setdefault(_pillar_id(key["name"]), {"_id": _pillar_id(key["name"]), "name": key["name"],
+                                                     "count": 0, "sum": 0, "hist": {}, "stages": {}})
+        score = key.get("score") or 0
+        d["count"] += n
+        d["sum"] += score * n
+        d["hist"][str(score)] = d["hist"].get(str(score), 0) + n
+        d["stages"][key.get("stage") or ""] = d["stages"].get(key.get("stage") or "", 0) + n
+    stats_col = stats_collection(col)
+    stats_col.bulk_write([ReplaceOne({"_id": _id}, doc, upsert=True) for _id, doc in docs.items()], ordered=False)
+    stats_col.delete_many({"_id": {"$nin": list(docs)}})
+    return docs[OVERALL_ID]["count"]
+
+
+def _summarize(doc: Dict[str, Any]) -> Dict[str, Any]:
+    hist = {int(k): n for k, n in (doc.get("hist") or {}).items() if n > 0}
+    count = doc.get("count", 0)
+    return {
+        "count": count,
+        "mean": round(doc.get("sum", 0) / count, 2) if count else 0.0,
+        "min": min(hist) if hist else None,
+        "max": max(hist) if hist else None,
+        "hist": dict(sorted(hist.items())),
+    }
+
+
+def read_stats(stats_col, pillar_order: List[str] = None) -> Dict[str, Any]:
+    """
+    Returns {"overall": {...}, "pillars": [{name, count, mean, min, max, hist, stages}]}.
+    Reads one small document per pillar, independent of the number of submissions.
+    """
+    overall = {"count": 0, "mean": 0.0, "min": None, "max": None, "hist": {}}
+    pillars = []
+    for doc in stats_col.find({}):
+        if doc["_id"] == OVERALL_ID:
+            overall = _summarize(doc)
+        elif doc.get("count", 0) > 0:
+            pillars.append({"name": doc.get("name", ""), **_summarize(doc),
+                            "stages": {k: n for k, n in (doc.get("stages") or {}).items() if n > 0}})
+    if pillar_order:
+        rank = {name: i for i, name in enumerate(pillar_order)}
+        pillars.sort(key=lambda p: rank.get(p["name"], len(rank)))
+    return {"overall": overall, "pillars": pillars}
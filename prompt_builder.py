@@ -0,0 +1,190 @@
+# Compact, token-budgeted serialization of survey Q/A pairs for LLM prompts
+import configparser
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.ini")
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the their this to was we will with "
+    "our you your i not but can if into than then there these they so such do does".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Token count with tiktoken when installed, otherwise ~4 characters per token.
+    """
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return math.ceil(len(text) / 4)
+
+
+def prompt_settings() -> Dict[str, int]:
+    cfg = configparser.ConfigParser()
+    cfg.read(CONFIG_PATH, encoding="utf-8")
+    sec = cfg["PROMPTS"] if cfg.has_section("PROMPTS") else {}
+    return {
+        "survey_budget_tokens": int(sec.get("survey_budget_tokens", 2500)),
+        "answer_budget_tokens": int(sec.get("answer_budget_tokens", 600)),
+    }
+
+
+def clip(text: str, max_tokens: int) -> str:
+    """
+    Cuts `text` at a word boundary so it fits in `max_tokens`.
+    """
+    text = " ".join(str(text).split())
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    # Characters scale roughly linearly with tokens; shrink until it fits
+    cut = max(1, int(len(text) * max_tokens / estimate_tokens(text)))
+    while cut > 1:
+        head = text[:cut].rsplit(" ", 1)[0] if " " in text[:cut] else text[:cut]
+        if estimate_tokens(head) + 1 <= max_tokens:
+            return head + "…"
+        cut = int(cut * 0.9)
+    return "…"
+
+
+def summarize(text: str, max_tokens: int) -> str:
+    """
+    Extractive summary: keeps the sentences with the densest content words, in their
+    original order, until `max_tokens` is reached. Falls back to clip() for text
+    that is one long sentence.
+    """
+    text = str(text).strip()
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    sentences = [s.strip() for s in _SENTENCE_RE.split(text) if s.strip()]
+    if len(sentences) < 2:
+        return clip(text, max_tokens)
+    freq = Counter(w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS)
+    scored = []
+    for i, s in enumerate(sentences):
+        words = [w for w in _WORD_RE.findall(s.lower()) if w not in _STOPWORDS]
+        score = sum(freq[w] for w in words) / (len(words) + 1)
+        scored.append((score, i))
+    keep, used = [], 1
+    for _, i in sorted(scored, reverse=True):
+        cost = estimate_tokens(sentences[i]) + 1
+        if used + cost <= max_tokens:
+            keep.append(i)
+            used += cost
+    if not keep:
+        return clip(sentences[sorted(scored, reverse=True)[0][1]], max_tokens)
+    return " … ".join(sentences[i] for i in sorted(keep))
+
+
+def _cap_for_budget(sizes: List[int], budget: int) -> Optional[int]:
+    # Largest per-answer cap c with sum(min(size, c)) <= budget (shrinks the longest answers first)
+    if sum(sizes) <= budget:
+        return None
+    ordered = sorted(sizes)
+    remaining = budget
+    for i, size in enumerate(ordered):
+        left = len(ordered) - i
+        if size * left > remaining:
+            return max(8, remaining // left)
+        remaining -= size
+    return None
+
+
+def format_qa(pairs: Iterable[Tuple[str, Any]], budget_tokens: int = None) -> Tuple[str, Dict[str, int]]:
+    """
+    Serializes (question, answer) pairs as numbered "Qn: ..." / "A: ..." lines. Lists
+    are joined with commas and unanswered questions are marked. If the block would
+    exceed `budget_tokens`, the longest answers are summarized down to a common cap.
+    Returns (text, {"tokens", "raw_tokens", "shortened"}).
+    """
+    rows = []
+    for q, a in pairs:
+        if isinstance(a, (list, tuple)):
+            a = ", ".join(str(x) for x in a)
+        a = " ".join(str(a if a is not None else "").split()) or "(no answer)"
+        rows.append((" ".join(str(q).split()), a))
+
+    def render(items):
+        return "\n".join(f"Q{i}: {q}\nA: {a}" for i, (q, a) in enumerate(items, 1))
+
+    text = render(rows)
+    raw = estimate_tokens(text)
+    shortened = 0
+    if budget_tokens is not None and raw > budget_tokens:
+        overhead = estimate_tokens(render([(q, "") for q, _ in rows]))
+        sizes = [estimate_tokens(a) for _, a in rows]
+        cap = _cap_for_budget(sizes, max(len(rows) * 8, budget_tokens - overhead))
+        if cap is not None:
+            out = []
+            for (q, a), size in zip(rows, sizes):
+                if size > cap:
+                    a = summarize(a, cap)
+                    shortened += 1
+                out.append((q, a))
+            rows = out
+            text = render(rows)
+    return text, {"tokens": estimate_tokens(text), "raw_tokens": raw, "shortened": shortened}
+
+
+class PromptStats:
+    """
+    Per-prompt counters of estimated prompt tokens, before and after budgeting.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}
+
+    def record(self, name: str, tokens: int, raw_tokens: int = None, shortened: int = 0):
+        with self._lock:
+            row = self._rows.setdefault(name, {"prompt": name, "calls": 0, "tokens": 0, "raw_tokens": 0,
+                                               "max_tokens": 0, "shortened_answers": 0})
+            row["calls"] += 1
+            row["tokens"] += tokens
+            row["raw_tokens"] += raw_tokens if raw_tokens is not None else tokens
+            row["max_tokens"] = max(row["max_tokens"], tokens)
+            row["shortened_answers"] += shortened
+
+    def rows(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            out = []
+            for row in self._rows.values():
+                r = dict(row)
+                r["avg_tokens"] = round(r["tokens"] / r["calls"], 1)
+                out.append(r)
+            return out
+
+
+PROMPT_STATS = PromptStats()
+
+
+def build_prompt(name: str, template: str, **fields) -> str:
+    """
+    Formats `template` with `fields` and records its estimated size under `name`.
+    Values that are (text, info) tuples from format_qa() contribute their budgeting info.
+    """
+    raw, shortened, values = 0, 0, {}
+    for key, value in fields.items():
+        if isinstance(value, tuple):
+            value, info = value
+            raw += info["raw_tokens"] - info["tokens"]
+            shortened += info["shortened"]
+        values[key] = value
+    prompt = template.format(**values)
+    tokens = estimate_tokens(prompt)
+    PROMPT_STATS.record(name, tokens, tokens + raw, shortened)
+    return prompt
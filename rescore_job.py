@@ -0,0 +1,149 @@
+# Bulk re-scoring of every submission in the PrePOC collection
+import argparse
+import configparser
+import hashlib
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from pymongo import ASCENDING, UpdateOne
+
+from db_client import close_clients, get_db
+from scoring import RULES_PATH, score_answers
+from pillar_stats import apply_delta, rebuild, score_delta, stats_collection
+from submissions import invalidate
+
+CHECKPOINT_COLLECTION = "job_checkpoints"
+
+
+def rules_fingerprint(path: str = RULES_PATH) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def _score_batch(batch):
+    # Runs in a worker process; each worker compiles the rules once on first use
+    return [(_id, score_answers(answers)) for _id, answers in batch]
+
+
+def _chunks(items, n):
+    size = max(1, -(-len(items) // n))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def rescore_collection(col, checkpoints, job: str, batch_size: int = 500, workers: int = 4,
+                       restart: bool = False, progress=None) -> dict:
+    """
+    Streams `col` in _id order and rewrites `scores` for every document (status is left
+    as it is), checkpointing the last written _id in `checkpoints` so an interrupted run
+    resumes where it stopped. pillar_stats is moved by each batch's score changes,
+    computed from the scores read with the batch. A batch is marked pending in the
+    checkpoint before anything is written; a run that died mid-batch may have written
+    scores without their delta, so the next run rebuilds pillar_stats before resuming.
+    `progress(processed, docs_per_s)` is called after every bulk write.
+    """
+    state = checkpoints.find_one({"_id": job}) or {}
+    stats_rebuilt = False
+    if state.get("pending") is not None:
+        rebuild(col)
+        checkpoints.update_one({"_id": job}, {"$unset": {"pending": ""}})
+        stats_rebuilt = True
+    if restart:
+        checkpoints.delete_one({"_id": job})
+        state = {}
+    last_id = state.get("last_id")
+    query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+    cursor = (col.find(query, projection={"answers": 1, "scores": 1})
+                 .sort("_id", ASCENDING)
+                 .batch_size(batch_size))
+
+    stats_col = stats_collection(col)
+    totals = {"processed": state.get("processed", 0), "this_run": 0}
+    started = time.perf_counter()
+    # Spawned, not forked: the admin button runs this inside the app server next to its background threads
+    pool = (ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            if workers > 1 else None)
+
+    def flush(batch):
+        work = [(_id, answers) for _id, answers, _ in batch]
+        if pool is not None:
+            results = [r for part in pool.map(_score_batch, _chunks(work, workers)) for r in part]
+        else:
+            results = _score_batch(work)
+        old = {_id: prev for _id, _, prev in batch}
+        delta = score_delta((old[_id], sc) for _id, sc in results)
+        checkpoints.update_one({"_id": job}, {"$set": {"pending": batch[-1][0]}}, upsert=True)
+        ops = [UpdateOne({"_id": _id}, {"$set": {"scores": sc}}) for _id, sc in results]
+        col.bulk_write(ops, ordered=False)
+        invalidate(col, all_documents=True)
+        apply_delta(stats_col, delta)
+        totals["processed"] += len(batch)
+        totals["this_run"] += len(batch)
+        checkpoints.update_one(
+            {"_id": job},
+            {"$set": {"last_id": batch[-1][0], "processed": totals["processed"],
+                      "updated_at": datetime.utcnow().isoformat()},
+             "$unset": {"pending": ""}},
+            upsert=True,
+        )
+        if progress:
+            elapsed = time.perf_counter() - started
+            progress(totals["processed"], totals["this_run"] / elapsed if elapsed > 0 else 0.0)
+
+    try:
+        batch = []
+        for doc in cursor:
+            batch.append((doc["_id"], doc.get("answers", {}), doc.get("scores")))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    finally:
+        cursor.close()
+        if pool is not None:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - started
+    checkpoints.update_one({"_id": job}, {"$set": {"finished_at": datetime.utcnow().isoformat()}}, upsert=True)
+    return {
+        "job": job,
+        "processed": totals["processed"],
+        "this_run": totals["this_run"],
+        "elapsed_s": round(elapsed, 2),
+        "docs_per_s": round(totals["this_run"] / elapsed, 1) if elapsed > 0 else 0.0,
+        "stats_rebuilt": stats_rebuilt,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score every submission with the current scoring_rules.json.")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--job", default="", help="Checkpoint name (defaults to rescore-<rules hash>).")
+    parser.add_argument("--restart", action="store_true", help="Ignore any saved checkpoint.")
+    args = parser.parse_args(argv)
+
+    cfg = configparser.ConfigParser()
+    cfg.read("config.ini", encoding="utf-8")
+    db = get_db()
+    if db is None:
+        raise SystemExit("MONGO_URI not set — nothing to re-score.")
+    col = db[cfg["MONGO"]["collection_name"]]
+    job = args.job or f"rescore-{rules_fingerprint()}"
+
+    def report(processed, rate):
+        print(f"{processed:>8} docs  {rate:8.1f} docs/s", flush=True)
+
+    try:
+        summary = rescore_collection(col, db[CHECKPOINT_COLLECTION], job, args.batch_size, args.workers,
+                                     args.restart, progress=report)
+    finally:
+        close_clients()
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+# Data access helpers for the PrePOC submissions collection
+import json
+import re
+import threading
+from typing import Any, Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
+
+from caching import TTLCache
+from pillar_stats import record_scores, stats_collection
+
+# Indexes the app relies on. Every admin filter is an equality or anchored prefix on a
+# normalized field followed by the (created_at, _id) sort, so each one gets a compound
+# index ending in both sort keys. An equality filter (or no filter) reads rows in sort
+# order straight from the index; an org/submitter prefix matching several values, or a
+# status $in, still needs a SORT (or SORT_MERGE) over the index-selected rows, bounded
+# by the page limit. The explain check only forbids COLLSCAN.
+INDEXES = [
+    IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+    IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="status_created_at"),
+    IndexModel([("search.submitted_by", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+               name="search_submitted_by_created_at_id"),
+    IndexModel([("search.org", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+               name="search_org_created_at_id"),
+]
+
+# Earlier versions of the search indexes without the _id tie-break; dropped by ensure_indexes()
+SUPERSEDED_INDEXES = ["search_submitted_by_created_at", "search_org_created_at"]
+
+_ENSURED = set()
+_PENDING = set()
+_ENSURED_LOCK = threading.Lock()
+
+
+def normalize(value: Any) -> str:
+    return " ".join(str(value or "").split()).lower()
+
+
+def search_fields(doc: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Lowercased copies of the fields admins filter on, stored under `search` at insert time.
+    """
+    return {
+        "org": normalize((doc.get("org") or {}).get("name", "")),
+        "submitted_by": normalize(doc.get("submitted_by", "")),
+    }
+
+
+def prepare_for_insert(doc: Dict[str, Any]) -> Dict[str, Any]:
+    doc["search"] = search_fields(doc)
+    return doc
+
+
+def ensure_indexes(col) -> None:
+    """
+    Creates the declared indexes and backfills `search` on older documents.
+    Runs once per collection per process.
+    """
+    key = (col.database.name, col.name)
+    if key in _ENSURED:
+        return
+    with _ENSURED_LOCK:
+        if key in _ENSURED:
+            return
+        col.create_indexes(INDEXES)
+        existing = col.index_information()
+        for name in SUPERSEDED_INDEXES:
+            if name in existing:
+                col.drop_index(name)
+        # Backfill with the same normalize() used at insert time
+        ops = []
+        for doc in col.find({"search": {"$exists": False}}, {"org.name": 1, "submitted_by": 1}).batch_size(500):
+            ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"search": search_fields(doc)}}))
+            if len(ops) >= 500:
+                col.bulk_write(ops, ordered=False)
+                ops = []
+        if ops:
+            col.bulk_write(ops, ordered=False)
+        _ENSURED.add(key)
+
+
+def ensure_indexes_async(col) -> None:
+    """
+    Starts ensure_indexes() on a daemon thread unless it already ran (or is running)
+    for this collection, so app startup never waits on index builds.
+    """
+    key = (col.database.name, col.name)
+    with _ENSURED_LOCK:
+        if key in _ENSURED or key in _PENDING:
+            return
+        _PENDING.add(key)
+
+    def _run():
+        try:
+            ensure_indexes(col)
+        except Exception as e:
+            print(f"[WARN] ensure_indexes failed for {col.name}: {e}")
+        finally:
+            with _ENSURED_LOCK:
+                _PENDING.discard(key)
+
+    threading.Thread(target=_run, name="ensure-indexes", daemon=True).start()
+
+
+def build_admin_query(org: str = "", submitter: str = "", status: List[str] = None) -> Dict[str, Any]:
+    """
+    Admin filter as index-backed predicates: anchored, case-folded prefixes on the
+    normalized search fields and an $in on status.
+    """
+    query = {}
+    if normalize(org):
+        query["search.org"] = {"$regex": "^" + re.escape(normalize(org))}
+    if normalize(submitter):
+        query["search.submitted_by"] = {"$regex": "^" + re.escape(normalize(submitter))}
+    if status:
+        query["status"] = {"$in": list(status)}
+    return query
+
+
+ADMIN_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+
+# Fields shown in the admin records grid; full documents are loaded only when a row is opened
+LIST_PROJECTION = {"org.name": 1, "submitted_by": 1, "status": 1, "created_at": 1}
+
+
+def keyset_query(query: Dict[str, Any], after=None) -> Dict[str, Any]:
+    """
+    Adds the "strictly after (created_at, _id)" predicate for descending keyset pagination.
+    """
+    if after is None:
+        return query
+    created_at, _id = after
+    page_pred = {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": _id}},
+    ]}
+    return {"$and": [query, page_pred]} if query else page_pred
+
+
+# Process-level read caches for the admin console. Page results are keyed by the
+# collection's write generation, so any write through this module invalidates every
+# cached page in O(1); documents are keyed by _id and dropped on their own writes.
+_PAGE_CACHE = TTLCache(maxsize=512, ttl=15.0)
+_DOC_CACHE = TTLCache(maxsize=1024, ttl=60.0)
+_GENERATION = {}
+_GENERATION_LOCK = threading.Lock()
+
+
+def _col_key(col):
+    return (col.database.name, col.name)
+
+
+def _generation(col) -> int:
+    return _GENERATION.get(_col_key(col), 0)
+
+
+def invalidate(col, doc_id=None, all_documents: bool = False) -> None:
+    """
+    Drops cached pages for `col` and the cached copy of `doc_id`, if given.
+    Bulk writers pass all_documents=True to drop every cached document as well.
+    """
+    with _GENERATION_LOCK:
+        _GENERATION[_col_key(col)] = _generation(col) + 1
+    if doc_id is not None:
+        _DOC_CACHE.pop((_col_key(col), str(doc_id)))
+    if all_documents:
+        _DOC_CACHE.clear()
+
+
+def _query_key(query: Dict[str, Any]) -> str:
+    return json.dumps(query, sort_keys=True, default=str)
+
+
+def fetch_page(col, query: Dict[str, Any], page_size: int = 50, after=None):
+    """
+    Returns (rows, next_after) for one page of the admin grid. `next_after` is the
+    (created_at, _id) key to pass back for the following page, or None on the last one.
+    The cost of a page does not depend on how deep into the collection it is.
+    """
+    key = ("page", _col_key(col), _generation(col), _query_key(query), int(page_size), repr(after))
+    return _PAGE_CACHE.get_or_set(key, lambda: _fetch_page(col, query, int(page_size), after))
+
+
+def _fetch_page(col, query, page_size, after):
+    cursor = (col.find(keyset_query(query, after), projection=LIST_PROJECTION)
+                 .sort(ADMIN_SORT)
+                 .limit(page_size + 1))
+    rows = list(cursor)
+    next_after = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_after = (last.get("created_at"), last["_id"])
+    return rows, next_after
+
+
+def fetch_document(col, doc_id) -> Dict[str, Any]:
+    from bson import ObjectId
+    oid = ObjectId(doc_id) if isinstance(doc_id, str) else doc_id
+    return _DOC_CACHE.get_or_set((_col_key(col), str(oid)), lambda: col.find_one({"_id": oid}))
+
+
+def fetch_latest_scored(col, query: Dict[str, Any]) -> Dict[str, Any]:
+    key = ("latest_scored", _col_key(col), _generation(col), _query_key(query))
+    return _PAGE_CACHE.get_or_set(key, lambda: col.find_one({**query, "scores": {"$exists": True}}, sort=ADMIN_SORT))
+
+
+def insert_submission(col, doc: Dict[str, Any]):
+    res = col.insert_one(prepare_for_insert(doc))
+    invalidate(col)
+    return res
+
+
+def save_scores(col, doc_id, scores: Dict[str, Any]):
+    """
+    Stores `scores` on the submission and moves pillar_stats by the difference
+    from whatever scores it had before.
+    """
+    from bson import ObjectId
+    oid = ObjectId(doc_id) if isinstance(doc_id, str) else doc_id
+    before = col.find_one_and_update({"_id": oid}, {"$set": {"scores": scores, "status": "analyzed"}},
+                                     projection={"scores": 1})
+    invalidate(col, oid)
+    if before is not None:
+        record_scores(stats_collection(col), scores, before.get("scores"))
+    return before
+
+
+def cache_stats() -> Dict[str, dict]:
+    return {"pages": _PAGE_CACHE.stats(), "documents": _DOC_CACHE.stats()}
+
+
+def plan_stages(explain: Dict[str, Any]) -> List[str]:
+    """
+    Flattens the winning plan of an explain() result into its stage names.
+    """
+    plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+    plan = plan.get("queryPlan", plan)  # SBE plans nest the classic tree
+    stages = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        if "stage" in node:
+            stages.append(node["stage"])
+        stack.extend(node.get("inputStages", []))
+        if "inputStage" in node:
+            stack.append(node["inputStage"])
+    return stages
+
+
+def assert_index_backed(col, query: Dict[str, Any], sort=ADMIN_SORT, limit: int = 100) -> List[str]:
+    """
+    Raises AssertionError if the admin query's winning plan contains a COLLSCAN.
+    Returns the plan stages otherwise.
+    """
+    stages = plan_stages(col.find(query).sort(sort).limit(limit).explain())
+    assert "COLLSCAN" not in stages, f"COLLSCAN for {query}: {stages}"
+    return stages
+
+
+ADMIN_QUERY_SAMPLES = [
+    build_admin_query(),
+    build_admin_query(org="acme"),
+    build_admin_query(submitter="alice"),
+    build_admin_query(status=["submitted", "analyzed"]),
+    build_admin_query(org="acme", status=["analyzed"]),
+]
+
+
+if __name__ == "__main__":
+    import configparser
+    import sys
+
+    from db_client import close_clients, get_db
+
+    cfg = configparser.ConfigParser()
+    cfg.read("config.ini", encoding="utf-8")
+    db = get_db()
+    if db is None:
+        raise SystemExit("MONGO_URI not set.")
+    col = db[cfg["MONGO"]["collection_name"]]
+    ensure_indexes(col)
+    failed = False
+    for q in ADMIN_QUERY_SAMPLES:
+        try:
+            print(f"OK   {q}: {assert_index_backed(col, q)}")
+        except AssertionError as e:
+            print(f"FAIL {e}")
+            failed = True
+    close_clients()
+    sys.exit(1 if failed else 0)
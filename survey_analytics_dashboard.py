@@ -11,6 +11,136 @@ import time
 import random
 import math
 
+from figure_cache import cached_figure, figure_key, source_version
+import text_profile
+from text_profile import TextProfile
+
+# Any edit to the builders below, or to the term sets and labels they read from
+# text_profile, changes this and retires their cached figures
+FIGURE_VERSION = source_version(__file__, text_profile.__file__)
+
+
+def _join_paths(paths):
+    """Concatenates (xs, ys, zs) paths into None-separated lists so they draw as one line trace"""
+    xs, ys, zs = [], [], []
+    for px, py, pz in paths:
+        xs.extend(px)
+        ys.extend(py)
+        zs.extend(pz)
+        xs.append(None)
+        ys.append(None)
+        zs.append(None)
+    return xs, ys, zs
+
+
+
+def _pairs_within(points, radius, max_cells=2_000_000):
+    """
+    Index pairs (i < j) of rows in the (n, 3) array `points` that are closer than `radius`,
+    with their distances. Squared distances are computed with matrix products over blocks
+    of rows against the rows after them, so memory stays within ~max_cells floats.
+    """
+    n = len(points)
+    found_i, found_j, found_d2 = [], [], []
+    squared = (points ** 2).sum(axis=1)
+    block = max(1, max_cells // max(n, 1))
+    for start in range(0, n, block):
+        rows = points[start:start + block]
+        d2 = squared[start:start + block, None] + squared[None, start:] - 2 * rows @ points[start:].T
+        ii, jj = np.nonzero(d2 < radius * radius)
+        upper = jj > ii  # columns start at `start`, so this keeps j > i and drops self-pairs
+        found_i.append(ii[upper] + start)
+        found_j.append(jj[upper] + start)
+        found_d2.append(d2[ii[upper], jj[upper]])
+    if not found_i:
+        empty = np.zeros(0, dtype=int)
+        return empty, empty, np.zeros(0)
+    return np.concatenate(found_i), np.concatenate(found_j), np.sqrt(np.maximum(np.concatenate(found_d2), 0))
+
+# Triangles of an 8-vertex box (bottom face vertices 0-3, top face 4-7)
+_BOX_I = [7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2]
+_BOX_J = [3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3]
+_BOX_K = [0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6]
+
+
+def _box_mesh(boxes):
+    """Merges (x_center, y_center, width, height) boxes standing on z=0 into one Mesh3d's x, y, z, i, j, k"""
+    x, y, z, i, j, k = [], [], [], [], [], []
+    for n, (cx, cy, width, height) in enumerate(boxes):
+        half = width / 2
+        x += [cx - half, cx + half, cx + half, cx - half] * 2
+        y += [cy - half, cy - half, cy + half, cy + half] * 2
+        z += [0, 0, 0, 0, height, height, height, height]
+        i += [v + 8 * n for v in _BOX_I]
+        j += [v + 8 * n for v in _BOX_J]
+        k += [v + 8 * n for v in _BOX_K]
+    return x, y, z, i, j, k
+
+
+def _scene_rng(name, question_data):
+    """NumPy generator seeded from the submission's hash, so a scene's jitter is identical on every rebuild"""
+    return np.random.default_rng(int(figure_key(name, question_data)[:16], 16))
+
+
+# ===== STATIC SCENE GEOMETRY =====
+# Built once per process; the figure builders only scale, offset or add seeded noise to these arrays
+
+# Helix: unit circles for the business (0), technical (π) and functional (2π/3) strands
+_HELIX_T = np.linspace(0, 6*np.pi, 200)
+_HELIX_Z = _HELIX_T * 0.5
+_HELIX_STRANDS = [(np.cos(_HELIX_T + phase), np.sin(_HELIX_T + phase)) for phase in (0, np.pi, 2*np.pi/3)]
+
+# Galaxy: one 20-point planet orbit around the origin, scaled and moved per planet
+_ORBIT_THETA = np.linspace(0, 2*np.pi, 20)
+_ORBIT_COS, _ORBIT_SIN, _ORBIT_WAVE = np.cos(_ORBIT_THETA), np.sin(_ORBIT_THETA), 0.1 * np.sin(_ORBIT_THETA * 3)
+
+# Space station: hologram grid and the globe
+_HOLOGRAM_X, _HOLOGRAM_Y = np.meshgrid(np.linspace(-2, 2, 20), np.linspace(-2, 2, 20))
+_SPHERE_U, _SPHERE_V = np.linspace(0, 2 * np.pi, 50), np.linspace(0, np.pi, 50)
+_SPHERE_X = np.outer(np.cos(_SPHERE_U), np.sin(_SPHERE_V))
+_SPHERE_Y = np.outer(np.sin(_SPHERE_U), np.sin(_SPHERE_V))
+_SPHERE_Z = np.outer(np.ones(np.size(_SPHERE_U)), np.cos(_SPHERE_V))
+
+# Ocean: wavy floor, flat water surface and the coral branch parameter
+_FLOOR_X, _FLOOR_Y = np.meshgrid(np.linspace(-10, 10, 20), np.linspace(-10, 10, 20))
+_FLOOR_Z = -8 + 0.5 * np.sin(_FLOOR_X/2) * np.cos(_FLOOR_Y/2)
+_WATER_X, _WATER_Y = np.meshgrid(np.linspace(-10, 10, 10), np.linspace(-10, 10, 10))
+_WATER_Z = np.zeros_like(_WATER_X)
+_CORAL_T = np.linspace(0, 1, 10)
+
+# Volcano: 50×20 cone surface, the six strata discs and the tapering magma core, before noise
+_cone_t, _cone_r = np.meshgrid(np.linspace(0, 2*np.pi, 50), np.linspace(2, 8, 20), indexing='ij')
+_VOLCANO_X, _VOLCANO_Y = (_cone_r * np.cos(_cone_t)).ravel(), (_cone_r * np.sin(_cone_t)).ravel()
+_VOLCANO_Z = (6 - (_cone_r - 2) * 1.5).ravel()
+_STRATA = []
+for _layer in range(6):
+    _layer_t, _layer_r = np.meshgrid(np.linspace(0, 2*np.pi, 30), np.linspace(1, 6 - _layer * 0.5, 15), indexing='ij')
+    _STRATA.append(((_layer_r * np.cos(_layer_t)).ravel(), (_layer_r * np.sin(_layer_t)).ravel()))
+_core_z, _core_t = np.meshgrid(np.linspace(0, 7, 30), np.linspace(0, 2*np.pi, 20)[::2], indexing='ij')
+_core_r = np.maximum(0.5, 2 - _core_z * 0.2)
+_MAGMA_X, _MAGMA_Y, _MAGMA_Z = (_core_r * np.cos(_core_t)).ravel(), (_core_r * np.sin(_core_t)).ravel(), _core_z.ravel()
+del _cone_t, _cone_r, _layer, _layer_t, _layer_r, _core_z, _core_t, _core_r
+
+# Theater: 10×6 stage, side curtains and a 5×8 audience
+_STAGE_WIDTH, _STAGE_DEPTH, _STAGE_HEIGHT = 10, 6, 0.5
+_CURTAINS = _join_paths([
+    ([-_STAGE_WIDTH/2 - 1, -_STAGE_WIDTH/2 - 1], [-_STAGE_DEPTH/2, _STAGE_DEPTH/2], [0, 8]),  # Left curtain
+    ([_STAGE_WIDTH/2 + 1, _STAGE_WIDTH/2 + 1], [-_STAGE_DEPTH/2, _STAGE_DEPTH/2], [0, 8])     # Right curtain
+])
+_seat_col, _seat_row = np.meshgrid(np.arange(8), np.arange(5))
+_AUDIENCE_X = ((_seat_col - 8/2 + 0.5) * 1.2).ravel()
+_AUDIENCE_Y = (-_STAGE_DEPTH/2 - 2 - _seat_row * 0.8).ravel()
+_AUDIENCE_Z = np.zeros(_AUDIENCE_X.size)
+del _seat_col, _seat_row
+
+# Castle: curtain-wall posts (10 per wall between the corner towers) and the moat ring
+_CASTLE_WALLS = _join_paths(
+    ([x, x], [y, y], [0, 3])
+    for (x0, y0), (x1, y1) in [((-4, -4), (4, -4)), ((4, -4), (4, 4)), ((4, 4), (-4, 4)), ((-4, 4), (-4, -4))]
+    for x, y in ((x0 + s / 10 * (x1 - x0), y0 + s / 10 * (y1 - y0)) for s in range(10))
+)
+_MOAT_THETA = np.linspace(0, 2*np.pi, 50)
+
 def render_survey_analytics_dashboard(fixed_answers, section2_questions, section2_answers, org_name="", contact="", role="", username=""):
     """
     Display a mega-spectacular analytics dashboard with 8 different visualization experiences
@@ -87,10 +217,9 @@ def render_survey_analytics_dashboard(fixed_answers, section2_questions, section
     """, unsafe_allow_html=True)
     
     # Prepare comprehensive data analysis
-    all_text_data = []
     question_data = []
     
-    # Collect all text and metadata
+    # Collect all answers and metadata
     for answer_data in fixed_answers:
         answer = answer_data.get('answer', '')
         question_data.append({
@@ -100,11 +229,6 @@ def render_survey_analytics_dashboard(fixed_answers, section2_questions, section
             'pillar': answer_data.get('pillar', 'General'),
             'category': answer_data.get('category', 'Standard')
         })
-        
-        if isinstance(answer, list):
-            all_text_data.extend([str(item) for item in answer])
-        else:
-            all_text_data.append(str(answer))
     
     # Add section 2 data
     for i, (question, answer) in enumerate(zip(section2_questions, section2_answers)):
@@ -116,10 +240,9 @@ def render_survey_analytics_dashboard(fixed_answers, section2_questions, section
                 'pillar': 'Strategic',
                 'category': 'Deep-Dive'
             })
-            all_text_data.append(str(answer))
     
-    combined_text = ' '.join(all_text_data).lower()
-    words = re.findall(r'\b\w+\b', combined_text)
+    # Tokens, term counts and answer labels for every scene, one pass per submission
+    profile = TextProfile(item['answer'] for item in question_data)
     
     # ===== VISUALIZATION SELECTOR =====
     st.markdown("""
@@ -166,63 +289,54 @@ def render_survey_analytics_dashboard(fixed_answers, section2_questions, section
     
     # Render selected visualization
     if selected_viz == "🧬 Knowledge DNA Double Helix (3D Molecular)":
-        render_dna_double_helix(question_data, words, combined_text)
+        render_dna_double_helix(question_data, profile)
     elif selected_viz == "🌟 Standard Dashboard (Current 5 Features)":
-        render_standard_dashboard(question_data, all_text_data, words, combined_text, fixed_answers, section2_answers, org_name, contact, role, username)
+        render_standard_dashboard(question_data, profile, fixed_answers, section2_answers, org_name, contact, role, username)
     elif selected_viz == "🌌 Knowledge Galaxy Explorer (3D Universe)":
-        render_galaxy_explorer(question_data, words, combined_text)
+        render_galaxy_explorer(question_data, profile)
     elif selected_viz == "🧠 Neural Network Brain (3D Synaptic)":
-        render_neural_brain(question_data, words, combined_text)
+        render_neural_brain(question_data, profile)
     elif selected_viz == "🚀 Space Station Command Center (Sci-Fi)":
-        render_space_station(question_data, words, combined_text)
+        render_space_station(question_data, profile)
     elif selected_viz == "🏗️ Knowledge Architecture Builder (3D City)":
-        render_architecture_builder(question_data, words, combined_text)
+        render_architecture_builder(question_data, profile)
     elif selected_viz == "🌊 Knowledge Ocean Depths (Underwater)":
-        render_ocean_depths(question_data, words, combined_text)
+        render_ocean_depths(question_data, profile)
     elif selected_viz == "🌋 Knowledge Volcano Cross-Section (Geological)":
-        render_volcano_section(question_data, words, combined_text)
+        render_volcano_section(question_data, profile)
     elif selected_viz == "🎭 Knowledge Theater Stage (Performance)":
-        render_theater_stage(question_data, words, combined_text)
+        render_theater_stage(question_data, profile)
     elif selected_viz == "🏰 Knowledge Castle Fortress (Medieval)":
-        render_castle_fortress(question_data, words, combined_text)
+        render_castle_fortress(question_data, profile)
 
-def render_dna_double_helix(question_data, words, combined_text):
-    """🧬 Knowledge DNA Double Helix - 3D Molecular Visualization"""
-    
-    st.markdown("## 🧬 KNOWLEDGE DNA DOUBLE HELIX")
-    st.markdown("*The genetic code of your organizational expertise*")
+def build_dna_double_helix_figure(question_data, profile):
+    """Triple helix scene for render_dna_double_helix(); returns (fig, strand scores)"""
     
-    # Enhanced data analysis including all Q&A and functional specifications
-    business_terms = ['strategy', 'customer', 'business', 'process', 'system', 'technology', 'digital', 'innovation', 'experience', 'solution', 'service', 'value', 'market', 'competitive', 'growth']
-    tech_terms = ['api', 'integration', 'platform', 'cloud', 'data', 'analytics', 'ai', 'automation', 'security', 'infrastructure', 'database', 'software', 'application', 'interface', 'architecture']
-    
-    # Enhanced analysis including functional specifications
-    functional_terms = ['requirement', 'specification', 'function', 'feature', 'capability', 'performance', 'scalability', 'reliability', 'availability', 'usability']
-    
-    business_score = sum(1 for word in words if word in business_terms)
-    tech_score = sum(1 for word in words if word in tech_terms)
-    functional_score = sum(1 for word in words if word in functional_terms)
+    # Strand scores count business, technical and functional terms (text_profile.TERM_SETS)
+    business_score = profile.term_counts['business']
+    tech_score = profile.term_counts['tech']
+    functional_score = profile.term_counts['functional']
     
     # Create enhanced double helix visualization
     fig = go.Figure()
     
-    # Generate helix parameters
-    t = np.linspace(0, 6*np.pi, 200)  # More points for smoother helix
+    # Scale the precomputed unit helices by strand score
+    (cos1, sin1), (cos2, sin2), (cos3, sin3) = _HELIX_STRANDS
     
     # Business strand (Blue)
-    x1 = np.cos(t) * (1 + business_score * 0.1)
-    y1 = np.sin(t) * (1 + business_score * 0.1)
-    z1 = t * 0.5
+    x1 = cos1 * (1 + business_score * 0.1)
+    y1 = sin1 * (1 + business_score * 0.1)
+    z1 = _HELIX_Z
     
     # Technical strand (Red) - offset by π
-    x2 = np.cos(t + np.pi) * (1 + tech_score * 0.1)
-    y2 = np.sin(t + np.pi) * (1 + tech_score * 0.1)
-    z2 = t * 0.5
+    x2 = cos2 * (1 + tech_score * 0.1)
+    y2 = sin2 * (1 + tech_score * 0.1)
+    z2 = _HELIX_Z
     
     # Functional strand (Green) - third helix for functional specs
-    x3 = np.cos(t + 2*np.pi/3) * (0.5 + functional_score * 0.1)
-    y3 = np.sin(t + 2*np.pi/3) * (0.5 + functional_score * 0.1)
-    z3 = t * 0.5
+    x3 = cos3 * (0.5 + functional_score * 0.1)
+    y3 = sin3 * (0.5 + functional_score * 0.1)
+    z3 = _HELIX_Z
     
     # Add business knowledge strand
     fig.add_trace(go.Scatter3d(
@@ -254,65 +368,62 @@ def render_dna_double_helix(question_data, words, combined_text):
         hovertemplate=f"<b>Functional Strand</b><br>Specification Score: {functional_score}<br>Detected Terms: {functional_score}<extra></extra>"
     ))
     
-    # Add connecting base pairs between strands
-    connection_points = range(0, len(t), 20)  # Every 20th point
-    for i in connection_points:
-        # Business-Technical connections
-        fig.add_trace(go.Scatter3d(
-            x=[x1[i], x2[i]], y=[y1[i], y2[i]], z=[z1[i], z2[i]],
-            mode='lines',
-            line=dict(color='rgba(255,255,255,0.3)', width=2),
-            showlegend=False,
-            hoverinfo='skip'
-        ))
-        
-        # Technical-Functional connections
-        if i < len(x3):
-            fig.add_trace(go.Scatter3d(
-                x=[x2[i], x3[i]], y=[y2[i], y3[i]], z=[z2[i], z3[i]],
-                mode='lines',
-                line=dict(color='rgba(255,255,255,0.2)', width=1),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
+    # Add connecting base pairs between strands, one trace per strand pair
+    connection_points = range(0, len(_HELIX_T), 20)  # Every 20th point
+    pair_x, pair_y, pair_z = _join_paths(
+        ([x1[i], x2[i]], [y1[i], y2[i]], [z1[i], z2[i]]) for i in connection_points)
+    fig.add_trace(go.Scatter3d(
+        x=pair_x, y=pair_y, z=pair_z,
+        mode='lines',
+        line=dict(color='rgba(255,255,255,0.3)', width=2),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    pair_x, pair_y, pair_z = _join_paths(
+        ([x2[i], x3[i]], [y2[i], y3[i]], [z2[i], z3[i]]) for i in connection_points)
+    fig.add_trace(go.Scatter3d(
+        x=pair_x, y=pair_y, z=pair_z,
+        mode='lines',
+        line=dict(color='rgba(255,255,255,0.2)', width=1),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
     
-    # Add knowledge markers for key responses
+    # Add knowledge markers for key responses, one trace per response type
+    marker_types = {'business': 'Business', 'tech': 'Technical', 'functional': 'Functional', 'general': 'General'}
+    marker_groups = {}
     for i, item in enumerate(question_data[:10]):  # Limit to 10 for performance
         # Position marker along the helix
         marker_t = (i / 10) * 6 * np.pi
-        marker_x = np.cos(marker_t) * 1.5
-        marker_y = np.sin(marker_t) * 1.5
-        marker_z = marker_t * 0.5
         
         # Determine marker color based on response type
-        if any(term in str(item['answer']).lower() for term in business_terms):
-            marker_color = 'blue'
-            marker_type = 'Business'
-        elif any(term in str(item['answer']).lower() for term in tech_terms):
-            marker_color = 'red'
-            marker_type = 'Technical'
-        elif any(term in str(item['answer']).lower() for term in functional_terms):
-            marker_color = 'green'
-            marker_type = 'Functional'
-        else:
-            marker_color = 'purple'
-            marker_type = 'General'
+        marker_type = marker_types[profile.labels[i]]
         
+        group = marker_groups.setdefault(marker_type, {'x': [], 'y': [], 'z': [], 'text': [], 'customdata': []})
+        group['x'].append(np.cos(marker_t) * 1.5)
+        group['y'].append(np.sin(marker_t) * 1.5)
+        group['z'].append(marker_t * 0.5)
+        group['text'].append(f"Q{i+1}")
+        group['customdata'].append([i + 1, profile.lengths[i], item.get('pillar', 'General')])
+    
+    marker_colors = {'Business': 'blue', 'Technical': 'red', 'Functional': 'green', 'General': 'purple'}
+    for marker_type, group in marker_groups.items():
         fig.add_trace(go.Scatter3d(
-            x=[marker_x], y=[marker_y], z=[marker_z],
+            x=group['x'], y=group['y'], z=group['z'],
             mode='markers+text',
             marker=dict(
                 size=12,
-                color=marker_color,
+                color=marker_colors[marker_type],
                 opacity=0.9,
                 symbol='diamond',
                 line=dict(width=2, color='white')
             ),
-            text=f"Q{i+1}",
+            text=group['text'],
+            customdata=group['customdata'],
             textposition="middle center",
             textfont=dict(size=10, color='white'),
-            name=f"Response {i+1}",
-            hovertemplate=f"<b>Response {i+1}</b><br>Type: {marker_type}<br>Length: {len(str(item['answer']))}<br>Category: {item.get('pillar', 'General')}<extra></extra>"
+            name=f"{marker_type} Responses",
+            hovertemplate=f"<b>Response %{{customdata[0]}}</b><br>Type: {marker_type}<br>Length: %{{customdata[1]}}<br>Category: %{{customdata[2]}}<extra></extra>"
         ))
     
     # Style the DNA helix
@@ -331,6 +442,18 @@ def render_dna_double_helix(question_data, words, combined_text):
         showlegend=True
     )
     
+    return fig, {"business_score": business_score, "tech_score": tech_score, "functional_score": functional_score}
+
+def render_dna_double_helix(question_data, profile):
+    """🧬 Knowledge DNA Double Helix - 3D Molecular Visualization"""
+    
+    st.markdown("## 🧬 KNOWLEDGE DNA DOUBLE HELIX")
+    st.markdown("*The genetic code of your organizational expertise*")
+    
+    fig, stats = cached_figure("dna_double_helix", question_data, build_dna_double_helix_figure, profile, version=FIGURE_VERSION)
+    business_score = stats["business_score"]
+    tech_score = stats["tech_score"]
+    functional_score = stats["functional_score"]
     st.plotly_chart(fig, use_container_width=True)
     
     # Enhanced DNA analysis metrics
@@ -418,7 +541,7 @@ def render_dna_double_helix(question_data, words, combined_text):
         - Seek cross-functional collaboration opportunities
         """)
 
-def render_standard_dashboard(question_data, all_text_data, words, combined_text, fixed_answers, section2_answers, org_name, contact, role, username):
+def render_standard_dashboard(question_data, profile, fixed_answers, section2_answers, org_name, contact, role, username):
     """Original spectacular dashboard with 5 features"""
     
     # ===== SPECTACULAR FEATURE 1: NEURAL LANGUAGE ANALYSIS =====
@@ -427,7 +550,7 @@ def render_standard_dashboard(question_data, all_text_data, words, combined_text
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_words = len(words)
+        total_words = profile.total_words
         st.markdown(f"""
         <div class="metric-container">
             <div class="big-metric">{total_words:,}</div>
@@ -437,7 +560,7 @@ def render_standard_dashboard(question_data, all_text_data, words, combined_text
         """, unsafe_allow_html=True)
     
     with col2:
-        unique_words = len(set(words))
+        unique_words = profile.unique_words
         complexity_score = (unique_words / total_words * 100) if total_words > 0 else 0
         st.markdown(f"""
         <div class="metric-container">
@@ -448,7 +571,7 @@ def render_standard_dashboard(question_data, all_text_data, words, combined_text
         """, unsafe_allow_html=True)
     
     with col3:
-        avg_word_length = sum(len(word) for word in words) / len(words) if words else 0
+        avg_word_length = profile.avg_word_length
         linguistic_depth = "EXPERT" if avg_word_length > 6 else "ADVANCED" if avg_word_length > 5 else "STANDARD"
         st.markdown(f"""
         <div class="metric-container">
@@ -459,7 +582,7 @@ def render_standard_dashboard(question_data, all_text_data, words, combined_text
         """, unsafe_allow_html=True)
     
     with col4:
-        sentences = len(re.findall(r'[.!?]+', combined_text))
+        sentences = profile.sentences
         readability = "EXECUTIVE" if sentences > 20 else "PROFESSIONAL" if sentences > 10 else "CONCISE"
         st.markdown(f"""
         <div class="metric-container">
@@ -472,11 +595,8 @@ def render_standard_dashboard(question_data, all_text_data, words, combined_text
     # Continue with other standard dashboard features...
     # (Include all the existing dashboard code here)
 
-def render_galaxy_explorer(question_data, words, combined_text):
-    """🌌 Knowledge Galaxy Explorer - 3D Universe Visualization"""
-    
-    st.markdown("## 🌌 KNOWLEDGE GALAXY EXPLORER")
-    st.markdown("*Navigate through your personal knowledge universe*")
+def build_galaxy_explorer_figure(question_data, profile):
+    """Star-system scene for render_galaxy_explorer(); returns (fig, {})"""
     
     # Create 3D galaxy visualization
     fig = go.Figure()
@@ -484,9 +604,13 @@ def render_galaxy_explorer(question_data, words, combined_text):
     # Generate star systems for each response
     colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57', '#FF9FF3', '#54A0FF']
     
+    stars = {'x': [], 'y': [], 'z': [], 'size': [], 'color': [], 'text': [], 'customdata': []}
+    planets = {'x': [], 'y': [], 'z': [], 'color': [], 'text': [], 'customdata': []}
+    orbits = {}  # orbit paths grouped by star color
+    
     for i, item in enumerate(question_data):
         # Main star (response)
-        response_length = len(str(item['answer']))
+        response_length = profile.lengths[i]
         
         # Generate 3D coordinates for star system
         theta = 2 * np.pi * i / len(question_data)
@@ -497,91 +621,96 @@ def render_galaxy_explorer(question_data, words, combined_text):
         y = r * np.sin(phi) * np.sin(theta)
         z = r * np.cos(phi)
         
-        # Add main star
-        fig.add_trace(go.Scatter3d(
-            x=[x], y=[y], z=[z],
-            mode='markers+text',
-            marker=dict(
-                size=max(response_length / 10, 10),
-                color=colors[i % len(colors)],
-                opacity=0.8,
-                symbol='diamond',
-                line=dict(width=2, color='white')
-            ),
-            text=f"Q{i+1}",
-            textposition="middle center",
-            textfont=dict(size=12, color='white'),
-            name=f"Question {i+1}",
-            hovertemplate=f"<b>Question {i+1}</b><br>Response Length: {response_length}<br>Type: {item['type']}<extra></extra>"
-        ))
+        color = colors[i % len(colors)]
+        stars['x'].append(x)
+        stars['y'].append(y)
+        stars['z'].append(z)
+        stars['size'].append(max(response_length / 10, 10))
+        stars['color'].append(color)
+        stars['text'].append(f"Q{i+1}")
+        stars['customdata'].append([i + 1, response_length, item['type']])
         
         # Add orbiting planets (keywords)
-        answer_words = re.findall(r'\b\w+\b', str(item['answer']).lower())
-        important_words = [w for w in answer_words if len(w) > 4][:3]  # Top 3 important words
+        important_words = [w for w in profile.answer_tokens[i] if len(w) > 4][:3]  # Top 3 important words
         
         for j, word in enumerate(important_words):
             # Generate orbit
             orbit_radius = 1 + j * 0.5
-            orbit_points = 20
-            orbit_theta = np.linspace(0, 2*np.pi, orbit_points)
-            
-            orbit_x = x + orbit_radius * np.cos(orbit_theta)
-            orbit_y = y + orbit_radius * np.sin(orbit_theta)
-            orbit_z = z + orbit_radius * 0.1 * np.sin(orbit_theta * 3)
+            orbit_points = len(_ORBIT_THETA)
             
-            # Add orbit path
-            fig.add_trace(go.Scatter3d(
-                x=orbit_x, y=orbit_y, z=orbit_z,
-                mode='lines',
-                line=dict(color=colors[i % len(colors)], width=2, dash='dot'),
-                opacity=0.3,
-                showlegend=False,
-                hoverinfo='skip'
-            ))
+            orbit_x = x + orbit_radius * _ORBIT_COS
+            orbit_y = y + orbit_radius * _ORBIT_SIN
+            orbit_z = z + orbit_radius * _ORBIT_WAVE
+            orbits.setdefault(color, []).append((orbit_x, orbit_y, orbit_z))
             
-            # Add planet
-            planet_pos = orbit_points // 4  # Position planet at 1/4 of orbit
-            fig.add_trace(go.Scatter3d(
-                x=[orbit_x[planet_pos]], y=[orbit_y[planet_pos]], z=[orbit_z[planet_pos]],
-                mode='markers+text',
-                marker=dict(
-                    size=8,
-                    color=colors[i % len(colors)],
-                    opacity=0.6,
-                    symbol='circle'
-                ),
-                text=word.upper(),
-                textposition="top center",
-                textfont=dict(size=8, color='white'),
-                showlegend=False,
-                hovertemplate=f"<b>{word}</b><br>Keyword from Q{i+1}<extra></extra>"
-            ))
+            # Planet at 1/4 of orbit
+            planet_pos = orbit_points // 4
+            planets['x'].append(orbit_x[planet_pos])
+            planets['y'].append(orbit_y[planet_pos])
+            planets['z'].append(orbit_z[planet_pos])
+            planets['color'].append(color)
+            planets['text'].append(word.upper())
+            planets['customdata'].append([word, i + 1])
+    
+    # Orbit paths, one trace per color
+    for color, paths in orbits.items():
+        orbit_x, orbit_y, orbit_z = _join_paths(paths)
+        fig.add_trace(go.Scatter3d(
+            x=orbit_x, y=orbit_y, z=orbit_z,
+            mode='lines',
+            line=dict(color=color, width=2, dash='dot'),
+            opacity=0.3,
+            showlegend=False,
+            hoverinfo='skip'
+        ))
     
-    # Add connecting lines between related responses
-    for i in range(len(question_data)):
-        for j in range(i+1, min(i+3, len(question_data))):  # Connect to next 2 responses
-            # Calculate positions
-            theta1, phi1 = 2 * np.pi * i / len(question_data), np.pi * (i % 3) / 3
-            theta2, phi2 = 2 * np.pi * j / len(question_data), np.pi * (j % 3) / 3
-            
-            r1 = 5 + len(str(question_data[i]['answer'])) / 20
-            r2 = 5 + len(str(question_data[j]['answer'])) / 20
-            
-            x1 = r1 * np.sin(phi1) * np.cos(theta1)
-            y1 = r1 * np.sin(phi1) * np.sin(theta1)
-            z1 = r1 * np.cos(phi1)
-            
-            x2 = r2 * np.sin(phi2) * np.cos(theta2)
-            y2 = r2 * np.sin(phi2) * np.sin(theta2)
-            z2 = r2 * np.cos(phi2)
-            
-            fig.add_trace(go.Scatter3d(
-                x=[x1, x2], y=[y1, y2], z=[z1, z2],
-                mode='lines',
-                line=dict(color='rgba(255,255,255,0.1)', width=1),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
+    # Connecting lines between related responses (each to the next 2)
+    links = [(i, j) for i in range(len(question_data)) for j in range(i+1, min(i+3, len(question_data)))]
+    link_x, link_y, link_z = _join_paths(
+        ([stars['x'][i], stars['x'][j]], [stars['y'][i], stars['y'][j]], [stars['z'][i], stars['z'][j]])
+        for i, j in links)
+    fig.add_trace(go.Scatter3d(
+        x=link_x, y=link_y, z=link_z,
+        mode='lines',
+        line=dict(color='rgba(255,255,255,0.1)', width=1),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    
+    fig.add_trace(go.Scatter3d(
+        x=planets['x'], y=planets['y'], z=planets['z'],
+        mode='markers+text',
+        marker=dict(
+            size=8,
+            color=planets['color'],
+            opacity=0.6,
+            symbol='circle'
+        ),
+        text=planets['text'],
+        customdata=planets['customdata'],
+        textposition="top center",
+        textfont=dict(size=8, color='white'),
+        showlegend=False,
+        hovertemplate="<b>%{customdata[0]}</b><br>Keyword from Q%{customdata[1]}<extra></extra>"
+    ))
+    
+    fig.add_trace(go.Scatter3d(
+        x=stars['x'], y=stars['y'], z=stars['z'],
+        mode='markers+text',
+        marker=dict(
+            size=stars['size'],
+            color=stars['color'],
+            opacity=0.8,
+            symbol='diamond',
+            line=dict(width=2, color='white')
+        ),
+        text=stars['text'],
+        customdata=stars['customdata'],
+        textposition="middle center",
+        textfont=dict(size=12, color='white'),
+        name="Star Systems",
+        hovertemplate="<b>Question %{customdata[0]}</b><br>Response Length: %{customdata[1]}<br>Type: %{customdata[2]}<extra></extra>"
+    ))
     
     # Style the galaxy
     fig.update_layout(
@@ -599,6 +728,15 @@ def render_galaxy_explorer(question_data, words, combined_text):
         showlegend=True
     )
     
+    return fig, {}
+
+def render_galaxy_explorer(question_data, profile):
+    """🌌 Knowledge Galaxy Explorer - 3D Universe Visualization"""
+    
+    st.markdown("## 🌌 KNOWLEDGE GALAXY EXPLORER")
+    st.markdown("*Navigate through your personal knowledge universe*")
+    
+    fig, stats = cached_figure("galaxy_explorer", question_data, build_galaxy_explorer_figure, profile, version=FIGURE_VERSION)
     st.plotly_chart(fig, use_container_width=True)
     
     # Galaxy statistics
@@ -606,25 +744,19 @@ def render_galaxy_explorer(question_data, words, combined_text):
     with col1:
         st.metric("🌟 Star Systems", len(question_data))
     with col2:
-        total_planets = sum(min(len(re.findall(r'\b\w+\b', str(item['answer']))), 3) for item in question_data)
+        total_planets = sum(min(len(tokens), 3) for tokens in profile.answer_tokens)
         st.metric("🪐 Planets", total_planets)
     with col3:
-        st.metric("🌌 Galaxy Density", f"{len(words)//100}x")
+        st.metric("🌌 Galaxy Density", f"{profile.total_words//100}x")
     with col4:
         st.metric("🚀 Exploration Level", "COMPLETE")
 
-def render_neural_brain(question_data, words, combined_text):
-    """🧠 Neural Network Brain - 3D Synaptic Visualization"""
-    
-    st.markdown("## 🧠 NEURAL NETWORK BRAIN")
-    st.markdown("*Watch your knowledge form neural pathways*")
+def build_neural_brain_figure(question_data, profile):
+    """Neuron and synapse scene for render_neural_brain(); returns (fig, network stats)"""
     
     # Define brain regions
-    business_terms = ['strategy', 'customer', 'business', 'process', 'system', 'technology', 'digital', 'innovation', 'experience', 'solution']
-    tech_terms = ['api', 'integration', 'platform', 'cloud', 'data', 'analytics', 'ai', 'automation', 'security', 'infrastructure']
-    
-    business_score = sum(1 for word in words if word in business_terms)
-    tech_score = sum(1 for word in words if word in tech_terms)
+    business_score = profile.term_counts['business']
+    tech_score = profile.term_counts['tech']
     
     fig = go.Figure()
     
@@ -633,89 +765,77 @@ def render_neural_brain(question_data, words, combined_text):
         'business_cortex': {'center': [0, 0, 2], 'color': 'blue', 'score': business_score},
         'technical_lobe': {'center': [2, 0, 0], 'color': 'red', 'score': tech_score},
         'strategic_center': {'center': [0, 2, 0], 'color': 'green', 'score': len(question_data)//2},
-        'innovation_stem': {'center': [0, 0, -1], 'color': 'purple', 'score': len(set(words))//10}
+        'innovation_stem': {'center': [0, 0, -1], 'color': 'purple', 'score': profile.unique_words//10}
     }
     
-    # Generate neurons for each response
-    neurons = []
-    for i, item in enumerate(question_data):
-        # Classify response to brain region
-        answer_text = str(item['answer']).lower()
-        if any(term in answer_text for term in business_terms):
+    # Classify each response to a brain region
+    neuron_regions = []
+    for item, label in zip(question_data, profile.labels):
+        if label == 'business':
             region = 'business_cortex'
-        elif any(term in answer_text for term in tech_terms):
+        elif label == 'tech':
             region = 'technical_lobe'
         elif item['type'] == 'open-ended':
             region = 'strategic_center'
         else:
             region = 'innovation_stem'
-        
-        # Generate neuron position near region center
-        center = regions[region]['center']
-        offset = np.random.normal(0, 0.5, 3)
-        position = [center[0] + offset[0], center[1] + offset[1], center[2] + offset[2]]
-        
-        activation = len(str(item['answer'])) / 100  # Activation based on response length
-        
-        neurons.append({
-            'position': position,
-            'activation': activation,
-            'region': region,
-            'color': regions[region]['color'],
-            'response_id': i
-        })
+        neuron_regions.append(region)
+    
+    # Neuron positions near their region center, as one (n, 3) array
+    centers = np.array([regions[region]['center'] for region in neuron_regions], dtype=float).reshape(-1, 3)
+    positions = centers + _scene_rng('neural_brain', question_data).normal(0, 0.5, centers.shape)
+    activation = np.array(profile.lengths) / 100  # Activation based on response length
+    
+    # Synapses between neurons closer than 2 units, drawn as one NaN-separated line trace;
+    # each segment's color carries its connection strength
+    pair_i, pair_j, distance = _pairs_within(positions, 2.0)
+    strength = np.maximum(0.1, 1 - distance / 2)
+    segments = np.full((len(pair_i), 3, 3), np.nan)
+    segments[:, 0] = positions[pair_i]
+    segments[:, 1] = positions[pair_j]
+    fig.add_trace(go.Scatter3d(
+        x=segments[:, :, 0].ravel(), y=segments[:, :, 1].ravel(), z=segments[:, :, 2].ravel(),
+        mode='lines',
+        line=dict(color=np.repeat(strength, 3), colorscale=[[0, 'rgba(255,255,255,0)'], [1, 'rgba(255,255,255,1)']],
+                  cmin=0, cmax=1, width=2),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
     
-    # Add neurons to plot
-    for neuron in neurons:
+    # Add neurons to plot, one trace per brain region
+    region_of = np.array(neuron_regions, dtype=object)
+    for region_name, region_data in regions.items():
+        members = np.nonzero(region_of == region_name)[0]
+        if not len(members):
+            continue
         fig.add_trace(go.Scatter3d(
-            x=[neuron['position'][0]],
-            y=[neuron['position'][1]],
-            z=[neuron['position'][2]],
+            x=positions[members, 0],
+            y=positions[members, 1],
+            z=positions[members, 2],
             mode='markers',
             marker=dict(
-                size=max(neuron['activation'] * 20, 5),
-                color=neuron['color'],
+                size=np.maximum(activation[members] * 20, 5),
+                color=region_data['color'],
                 opacity=0.7,
                 symbol='circle',
                 line=dict(width=1, color='white')
             ),
-            name=f"Neuron {neuron['response_id']+1}",
-            hovertemplate=f"<b>Neural Response {neuron['response_id']+1}</b><br>Region: {neuron['region']}<br>Activation: {neuron['activation']:.2f}<extra></extra>"
+            customdata=np.column_stack([members + 1, activation[members]]),
+            name=region_name.replace('_', ' ').title(),
+            hovertemplate=f"<b>Neural Response %{{customdata[0]}}</b><br>Region: {region_name}<br>Activation: %{{customdata[1]:.2f}}<extra></extra>"
         ))
     
-    # Add synaptic connections
-    for i, neuron1 in enumerate(neurons):
-        for j, neuron2 in enumerate(neurons[i+1:], i+1):
-            # Calculate connection strength based on similarity
-            distance = np.sqrt(sum((a-b)**2 for a, b in zip(neuron1['position'], neuron2['position'])))
-            if distance < 2:  # Only connect nearby neurons
-                connection_strength = max(0.1, 1 - distance/2)
-                
-                fig.add_trace(go.Scatter3d(
-                    x=[neuron1['position'][0], neuron2['position'][0]],
-                    y=[neuron1['position'][1], neuron2['position'][1]],
-                    z=[neuron1['position'][2], neuron2['position'][2]],
-                    mode='lines',
-                    line=dict(
-                        color=f'rgba(255,255,255,{connection_strength})',
-                        width=connection_strength * 3
-                    ),
-                    showlegend=False,
-                    hoverinfo='skip'
-                ))
-    
     # Add brain region labels
-    for region_name, region_data in regions.items():
-        fig.add_trace(go.Scatter3d(
-            x=[region_data['center'][0]],
-            y=[region_data['center'][1]],
-            z=[region_data['center'][2] + 1],
-            mode='text',
-            text=[region_name.replace('_', ' ').title()],
-            textfont=dict(size=14, color=region_data['color']),
-            showlegend=False,
-            hoverinfo='skip'
-        ))
+    fig.add_trace(go.Scatter3d(
+        x=[r['center'][0] for r in regions.values()],
+        y=[r['center'][1] for r in regions.values()],
+        z=[r['center'][2] + 1 for r in regions.values()],
+        mode='text',
+        text=[name.replace('_', ' ').title() for name in regions],
+        textfont=dict(size=14, color=[r['color'] for r in regions.values()]),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
     
     # Style the brain
     fig.update_layout(
@@ -732,23 +852,149 @@ def render_neural_brain(question_data, words, combined_text):
         height=600
     )
     
+    avg_activation = float(activation.mean()) if len(activation) else 0.0
+    return fig, {"neurons": len(positions), "total_connections": len(pair_i), "avg_activation": avg_activation}
+
+def render_neural_brain(question_data, profile):
+    """🧠 Neural Network Brain - 3D Synaptic Visualization"""
+    
+    st.markdown("## 🧠 NEURAL NETWORK BRAIN")
+    st.markdown("*Watch your knowledge form neural pathways*")
+    
+    fig, stats = cached_figure("neural_brain", question_data, build_neural_brain_figure, profile, version=FIGURE_VERSION)
     st.plotly_chart(fig, use_container_width=True)
     
     # Brain statistics
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("🧠 Active Neurons", len(neurons))
+        st.metric("🧠 Active Neurons", stats["neurons"])
     with col2:
-        total_connections = sum(1 for i, n1 in enumerate(neurons) for n2 in neurons[i+1:] 
-                              if np.sqrt(sum((a-b)**2 for a, b in zip(n1['position'], n2['position']))) < 2)
-        st.metric("⚡ Synaptic Connections", total_connections)
+        st.metric("⚡ Synaptic Connections", stats["total_connections"])
     with col3:
-        avg_activation = np.mean([n['activation'] for n in neurons])
-        st.metric("🔥 Neural Activity", f"{avg_activation:.2f}")
+        st.metric("🔥 Neural Activity", f"{stats['avg_activation']:.2f}")
     with col4:
         st.metric("🎯 Brain Efficiency", "OPTIMAL")
 
-def render_space_station(question_data, words, combined_text):
+def build_space_hologram_figure(question_data, profile):
+    """Holographic surface for render_space_station(); returns (fig, {})"""
+    
+    # Create holographic-style 3D surface
+    X, Y = _HOLOGRAM_X, _HOLOGRAM_Y
+    
+    # Generate surface based on response data
+    Z = np.zeros_like(X)
+    for i, item in enumerate(question_data):
+        response_strength = profile.lengths[i] / 100
+        center_x = (i % 3 - 1) * 1.5
+        center_y = ((i // 3) % 3 - 1) * 1.5
+        
+        Z += response_strength * np.exp(-((X - center_x)**2 + (Y - center_y)**2))
+    
+    fig1 = go.Figure()
+    
+    # Add holographic surface
+    fig1.add_trace(go.Surface(
+        x=X, y=Y, z=Z,
+        colorscale='Viridis',
+        opacity=0.7,
+        showscale=False
+    ))
+    
+    # Add glowing grid lines (every 4th row and column) as one trace
+    grid_paths = [(X[i, :], Y[i, :], Z[i, :] + 0.1) for i in range(0, 20, 4)]
+    grid_paths += [(X[:, i], Y[:, i], Z[:, i] + 0.1) for i in range(0, 20, 4)]
+    grid_x, grid_y, grid_z = _join_paths(grid_paths)
+    fig1.add_trace(go.Scatter3d(
+        x=grid_x, y=grid_y, z=grid_z,
+        mode='lines',
+        line=dict(color='cyan', width=4),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    
+    # Style as holographic display
+    fig1.update_layout(
+        scene=dict(
+            bgcolor='rgba(0,0,0,0.9)',
+            xaxis=dict(showgrid=False, showticklabels=False, zeroline=False, showbackground=False),
+            yaxis=dict(showgrid=False, showticklabels=False, zeroline=False, showbackground=False),
+            zaxis=dict(showgrid=False, showticklabels=False, zeroline=False, showbackground=False),
+            camera=dict(eye=dict(x=1.2, y=1.2, z=1.2))
+        ),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        height=400,
+        margin=dict(l=0, r=0, t=0, b=0)
+    )
+    
+    return fig1, {}
+
+def build_space_satellites_figure(question_data, profile):
+    """Satellite globe for render_space_station(); returns (fig, {})"""
+    
+    # Create satellite view of organizational reach
+    fig2 = go.Figure()
+    
+    # Add Earth-like sphere
+    fig2.add_trace(go.Surface(
+        x=_SPHERE_X, y=_SPHERE_Y, z=_SPHERE_Z,
+        colorscale='Blues',
+        opacity=0.3,
+        showscale=False
+    ))
+    
+    # Add data points as satellites
+    n = len(question_data)
+    index = np.arange(n)
+    theta = 2 * np.pi * index / max(n, 1)
+    phi = np.pi * (0.3 + 0.4 * (index % 3) / 3)  # Keep satellites in visible hemisphere
+    r = 1.5  # Distance from Earth center
+    x_sat = r * np.sin(phi) * np.cos(theta)
+    y_sat = r * np.sin(phi) * np.sin(theta)
+    z_sat = r * np.cos(phi)
+    
+    # Communication beams from the Earth center
+    beam_x, beam_y, beam_z = _join_paths(([0, x], [0, y], [0, z]) for x, y, z in zip(x_sat, y_sat, z_sat))
+    fig2.add_trace(go.Scatter3d(
+        x=beam_x, y=beam_y, z=beam_z,
+        mode='lines',
+        line=dict(color='rgba(255,0,0,0.3)', width=2),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    
+    fig2.add_trace(go.Scatter3d(
+        x=x_sat, y=y_sat, z=z_sat,
+        mode='markers',
+        marker=dict(
+            size=8,
+            color='red',
+            symbol='diamond',
+            line=dict(width=2, color='white')
+        ),
+        customdata=[[i + 1, item['type'], profile.lengths[i]] for i, item in enumerate(question_data)],
+        name="Data Satellites",
+        hovertemplate="<b>Satellite %{customdata[0]}</b><br>Data Type: %{customdata[1]}<br>Signal Strength: %{customdata[2]}<extra></extra>"
+    ))
+    
+    fig2.update_layout(
+        scene=dict(
+            bgcolor='rgba(0,0,0,0.9)',
+            xaxis=dict(showgrid=False, showticklabels=False, zeroline=False, showbackground=False),
+            yaxis=dict(showgrid=False, showticklabels=False, zeroline=False, showbackground=False),
+            zaxis=dict(showgrid=False, showticklabels=False, zeroline=False, showbackground=False),
+            camera=dict(eye=dict(x=2, y=2, z=1))
+        ),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        height=400,
+        margin=dict(l=0, r=0, t=0, b=0),
+        showlegend=False
+    )
+    
+    return fig2, {}
+
+def render_space_station(question_data, profile):
     """🚀 Space Station Command Center - Sci-Fi Visualization"""
     
     st.markdown("## 🚀 SPACE STATION COMMAND CENTER")
@@ -760,132 +1006,13 @@ def render_space_station(question_data, words, combined_text):
     with col1:
         st.markdown("### 📡 HOLOGRAPHIC DISPLAY")
         
-        # Create holographic-style 3D surface
-        x = np.linspace(-2, 2, 20)
-        y = np.linspace(-2, 2, 20)
-        X, Y = np.meshgrid(x, y)
-        
-        # Generate surface based on response data
-        Z = np.zeros_like(X)
-        for i, item in enumerate(question_data):
-            response_strength = len(str(item['answer'])) / 100
-            center_x = (i % 3 - 1) * 1.5
-            center_y = ((i // 3) % 3 - 1) * 1.5
-            
-            Z += response_strength * np.exp(-((X - center_x)**2 + (Y - center_y)**2))
-        
-        fig1 = go.Figure()
-        
-        # Add holographic surface
-        fig1.add_trace(go.Surface(
-            x=X, y=Y, z=Z,
-            colorscale='Viridis',
-            opacity=0.7,
-            showscale=False
-        ))
-        
-        # Add glowing grid lines
-        for i in range(0, 20, 4):
-            fig1.add_trace(go.Scatter3d(
-                x=X[i, :], y=Y[i, :], z=Z[i, :] + 0.1,
-                mode='lines',
-                line=dict(color='cyan', width=4),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-            fig1.add_trace(go.Scatter3d(
-                x=X[:, i], y=Y[:, i], z=Z[:, i] + 0.1,
-                mode='lines',
-                line=dict(color='cyan', width=4),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-        
-        # Style as holographic display
-        fig1.update_layout(
-            scene=dict(
-                bgcolor='rgba(0,0,0,0.9)',
-                xaxis=dict(showgrid=False, showticklabels=False, zeroline=False, showbackground=False),
-                yaxis=dict(showgrid=False, showticklabels=False, zeroline=False, showbackground=False),
-                zaxis=dict(showgrid=False, showticklabels=False, zeroline=False, showbackground=False),
-                camera=dict(eye=dict(x=1.2, y=1.2, z=1.2))
-            ),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            height=400,
-            margin=dict(l=0, r=0, t=0, b=0)
-        )
-        
+        fig1, _ = cached_figure("space_hologram", question_data, build_space_hologram_figure, profile, version=FIGURE_VERSION)
         st.plotly_chart(fig1, use_container_width=True)
     
     with col2:
         st.markdown("### 🛰️ SATELLITE VIEW")
         
-        # Create satellite view of organizational reach
-        fig2 = go.Figure()
-        
-        # Add Earth-like sphere
-        u = np.linspace(0, 2 * np.pi, 50)
-        v = np.linspace(0, np.pi, 50)
-        x_sphere = np.outer(np.cos(u), np.sin(v))
-        y_sphere = np.outer(np.sin(u), np.sin(v))
-        z_sphere = np.outer(np.ones(np.size(u)), np.cos(v))
-        
-        fig2.add_trace(go.Surface(
-            x=x_sphere, y=y_sphere, z=z_sphere,
-            colorscale='Blues',
-            opacity=0.3,
-            showscale=False
-        ))
-        
-        # Add data points as satellites
-        for i, item in enumerate(question_data):
-            # Generate satellite positions
-            theta = 2 * np.pi * i / len(question_data)
-            phi = np.pi * (0.3 + 0.4 * (i % 3) / 3)  # Keep satellites in visible hemisphere
-            r = 1.5  # Distance from Earth center
-            
-            x_sat = r * np.sin(phi) * np.cos(theta)
-            y_sat = r * np.sin(phi) * np.sin(theta)
-            z_sat = r * np.cos(phi)
-            
-            fig2.add_trace(go.Scatter3d(
-                x=[x_sat], y=[y_sat], z=[z_sat],
-                mode='markers',
-                marker=dict(
-                    size=8,
-                    color='red',
-                    symbol='diamond',
-                    line=dict(width=2, color='white')
-                ),
-                name=f"Data Satellite {i+1}",
-                hovertemplate=f"<b>Satellite {i+1}</b><br>Data Type: {item['type']}<br>Signal Strength: {len(str(item['answer']))}<extra></extra>"
-            ))
-            
-            # Add communication beam
-            fig2.add_trace(go.Scatter3d(
-                x=[0, x_sat], y=[0, y_sat], z=[0, z_sat],
-                mode='lines',
-                line=dict(color='rgba(255,0,0,0.3)', width=2),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-        
-        fig2.update_layout(
-            scene=dict(
-                bgcolor='rgba(0,0,0,0.9)',
-                xaxis=dict(showgrid=False, showticklabels=False, zeroline=False, showbackground=False),
-                yaxis=dict(showgrid=False, showticklabels=False, zeroline=False, showbackground=False),
-                zaxis=dict(showgrid=False, showticklabels=False, zeroline=False, showbackground=False),
-                camera=dict(eye=dict(x=2, y=2, z=1))
-            ),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            height=400,
-            margin=dict(l=0, r=0, t=0, b=0),
-            showlegend=False
-        )
-        
+        fig2, _ = cached_figure("space_satellites", question_data, build_space_satellites_figure, profile, version=FIGURE_VERSION)
         st.plotly_chart(fig2, use_container_width=True)
     
     # Mission Control Status Board
@@ -938,11 +1065,8 @@ def render_space_station(question_data, words, combined_text):
         </div>
         """, unsafe_allow_html=True)
 
-def render_architecture_builder(question_data, words, combined_text):
-    """🏗️ Knowledge Architecture Builder - 3D City Visualization"""
-    
-    st.markdown("## 🏗️ KNOWLEDGE ARCHITECTURE BUILDER")
-    st.markdown("*Build your organizational knowledge city*")
+def build_architecture_builder_figure(question_data, profile):
+    """City scene for render_architecture_builder(); returns (fig, district stats)"""
     
     fig = go.Figure()
     
@@ -955,16 +1079,11 @@ def render_architecture_builder(question_data, words, combined_text):
     }
     
     # Classify responses into districts and create buildings
-    business_terms = ['strategy', 'customer', 'business', 'process', 'experience']
-    tech_terms = ['api', 'integration', 'platform', 'cloud', 'data', 'ai']
-    
     for i, item in enumerate(question_data):
-        answer_text = str(item['answer']).lower()
-        
         # Determine district
-        if any(term in answer_text for term in business_terms):
+        if profile.labels[i] == 'business':
             district = 'business_district'
-        elif any(term in answer_text for term in tech_terms):
+        elif profile.labels[i] == 'tech':
             district = 'tech_quarter'
         elif item['type'] == 'open-ended':
             district = 'innovation_hub'
@@ -972,7 +1091,7 @@ def render_architecture_builder(question_data, words, combined_text):
             district = 'strategic_center'
         
         # Building properties
-        building_height = max(len(str(item['answer'])) / 20, 1)
+        building_height = max(profile.lengths[i] / 20, 1)
         building_width = 0.8
         
         # Position in district
@@ -986,43 +1105,40 @@ def render_architecture_builder(question_data, words, combined_text):
         x_pos = district_center[0] + (grid_x - 1) * 1.5
         y_pos = district_center[1] + (grid_y - 1) * 1.5
         
-        # Create building as 3D box
-        building_x = [x_pos - building_width/2, x_pos + building_width/2, x_pos + building_width/2, x_pos - building_width/2,
-                     x_pos - building_width/2, x_pos + building_width/2, x_pos + building_width/2, x_pos - building_width/2]
-        building_y = [y_pos - building_width/2, y_pos - building_width/2, y_pos + building_width/2, y_pos + building_width/2,
-                     y_pos - building_width/2, y_pos - building_width/2, y_pos + building_width/2, y_pos + building_width/2]
-        building_z = [0, 0, 0, 0, building_height, building_height, building_height, building_height]
-        
-        # Add building to plot
-        fig.add_trace(go.Mesh3d(
-            x=building_x, y=building_y, z=building_z,
-            i=[7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2],
-            j=[3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3],
-            k=[0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6],
-            color=districts[district]['color'],
-            opacity=0.7,
-            name=f"Building {i+1}",
-            hovertemplate=f"<b>Building {i+1}</b><br>District: {district}<br>Height: {building_height:.1f}<br>Type: {item['type']}<extra></extra>"
-        ))
-        
         districts[district]['buildings'].append({
             'position': [x_pos, y_pos, building_height/2],
+            'width': building_width,
             'height': building_height,
-            'response_id': i
+            'response_id': i,
+            'type': item['type']
         })
     
-    # Add district labels
+    # One mesh per district; hover text is carried per vertex
     for district_name, district_data in districts.items():
-        if district_data['buildings']:  # Only add label if district has buildings
-            center = district_data['center']
-            fig.add_trace(go.Scatter3d(
-                x=[center[0]], y=[center[1]], z=[5],
-                mode='text',
-                text=[district_name.replace('_', ' ').title()],
-                textfont=dict(size=16, color=district_data['color']),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
+        buildings = district_data['buildings']
+        if not buildings:
+            continue
+        mesh_x, mesh_y, mesh_z, mesh_i, mesh_j, mesh_k = _box_mesh(
+            (b['position'][0], b['position'][1], b['width'], b['height']) for b in buildings)
+        fig.add_trace(go.Mesh3d(
+            x=mesh_x, y=mesh_y, z=mesh_z, i=mesh_i, j=mesh_j, k=mesh_k,
+            color=district_data['color'],
+            opacity=0.7,
+            name=district_name.replace('_', ' ').title(),
+            customdata=[[b['response_id'] + 1, round(b['height'], 1), b['type']] for b in buildings for _ in range(8)],
+            hovertemplate=f"<b>Building %{{customdata[0]}}</b><br>District: {district_name}<br>Height: %{{customdata[1]:.1f}}<br>Type: %{{customdata[2]}}<extra></extra>"
+        ))
+    
+    # Add district labels (only for districts with buildings)
+    labelled = [(name, d) for name, d in districts.items() if d['buildings']]
+    fig.add_trace(go.Scatter3d(
+        x=[d['center'][0] for _, d in labelled], y=[d['center'][1] for _, d in labelled], z=[5] * len(labelled),
+        mode='text',
+        text=[name.replace('_', ' ').title() for name, _ in labelled],
+        textfont=dict(size=16, color=[d['color'] for _, d in labelled]),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
     
     # Add roads connecting districts
     road_connections = [
@@ -1032,14 +1148,14 @@ def render_architecture_builder(question_data, words, combined_text):
         ([0, 5, 0], [5, 5, 0])   # innovation to strategic
     ]
     
-    for start, end in road_connections:
-        fig.add_trace(go.Scatter3d(
-            x=[start[0], end[0]], y=[start[1], end[1]], z=[start[2], end[2]],
-            mode='lines',
-            line=dict(color='gray', width=8),
-            showlegend=False,
-            hoverinfo='skip'
-        ))
+    road_x, road_y, road_z = _join_paths(zip(start, end) for start, end in road_connections)
+    fig.add_trace(go.Scatter3d(
+        x=road_x, y=road_y, z=road_z,
+        mode='lines',
+        line=dict(color='gray', width=8),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
     
     # Style the city
     fig.update_layout(
@@ -1054,38 +1170,40 @@ def render_architecture_builder(question_data, words, combined_text):
         height=600
     )
     
+    total_buildings = sum(len(d['buildings']) for d in districts.values())
+    active_districts = sum(1 for d in districts.values() if d['buildings'])
+    avg_height = np.mean([b['height'] for d in districts.values() for b in d['buildings']]) if total_buildings > 0 else 0
+    return fig, {"total_buildings": total_buildings, "active_districts": active_districts, "avg_height": float(avg_height)}
+
+def render_architecture_builder(question_data, profile):
+    """🏗️ Knowledge Architecture Builder - 3D City Visualization"""
+    
+    st.markdown("## 🏗️ KNOWLEDGE ARCHITECTURE BUILDER")
+    st.markdown("*Build your organizational knowledge city*")
+    
+    fig, stats = cached_figure("architecture_builder", question_data, build_architecture_builder_figure, profile, version=FIGURE_VERSION)
     st.plotly_chart(fig, use_container_width=True)
     
     # City statistics
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        total_buildings = sum(len(d['buildings']) for d in districts.values())
-        st.metric("🏢 Total Buildings", total_buildings)
+        st.metric("🏢 Total Buildings", stats["total_buildings"])
     with col2:
-        active_districts = sum(1 for d in districts.values() if d['buildings'])
-        st.metric("🏙️ Active Districts", active_districts)
+        st.metric("🏙️ Active Districts", stats["active_districts"])
     with col3:
-        avg_height = np.mean([b['height'] for d in districts.values() for b in d['buildings']]) if total_buildings > 0 else 0
-        st.metric("📏 Avg Building Height", f"{avg_height:.1f}")
+        st.metric("📏 Avg Building Height", f"{stats['avg_height']:.1f}")
     with col4:
         st.metric("🚧 Construction Status", "COMPLETE")
 
-def render_ocean_depths(question_data, words, combined_text):
-    """🌊 Knowledge Ocean Depths - Underwater Visualization"""
-    
-    st.markdown("## 🌊 KNOWLEDGE OCEAN DEPTHS")
-    st.markdown("*Dive into your underwater knowledge ecosystem*")
+def build_ocean_depths_figure(question_data, profile):
+    """Underwater scene for render_ocean_depths(); returns (fig, ecosystem counts)"""
     
     fig = go.Figure()
+    rng = _scene_rng('ocean_depths', question_data)
     
     # Create ocean floor
-    x_floor = np.linspace(-10, 10, 20)
-    y_floor = np.linspace(-10, 10, 20)
-    X_floor, Y_floor = np.meshgrid(x_floor, y_floor)
-    Z_floor = -8 + 0.5 * np.sin(X_floor/2) * np.cos(Y_floor/2)  # Wavy ocean floor
-    
     fig.add_trace(go.Surface(
-        x=X_floor, y=Y_floor, z=Z_floor,
+        x=_FLOOR_X, y=_FLOOR_Y, z=_FLOOR_Z,
         colorscale='Earth',
         opacity=0.6,
         showscale=False,
@@ -1095,8 +1213,10 @@ def render_ocean_depths(question_data, words, combined_text):
     # Create coral reefs for complex responses
     coral_colors = ['coral', 'orange', 'pink', 'yellow', 'lightgreen']
     
+    coral_paths = {}  # branch paths and hover data, grouped by branch color
+    
     for i, item in enumerate(question_data):
-        response_complexity = len(str(item['answer']))
+        response_complexity = profile.lengths[i]
         
         if response_complexity > 50:  # Create coral reef for detailed responses
             # Position coral reef
@@ -1111,82 +1231,85 @@ def render_ocean_depths(question_data, words, combined_text):
                 branch_y = reef_y + 0.5 * np.sin(branch_angle)
                 
                 # Coral branch points
-                branch_points = 10
-                t = np.linspace(0, 1, branch_points)
+                branch_points = len(_CORAL_T)
+                t = _CORAL_T
                 coral_x = branch_x + 0.3 * t * np.cos(branch_angle + t * np.pi)
                 coral_y = branch_y + 0.3 * t * np.sin(branch_angle + t * np.pi)
                 coral_z = reef_z + t * 2
                 
-                fig.add_trace(go.Scatter3d(
-                    x=coral_x, y=coral_y, z=coral_z,
-                    mode='lines+markers',
-                    line=dict(color=coral_colors[branch % len(coral_colors)], width=6),
-                    marker=dict(size=4, color=coral_colors[branch % len(coral_colors)]),
-                    showlegend=False,
-                    hovertemplate=f"<b>Coral Reef {i+1}</b><br>Complexity: {response_complexity}<br>Branch: {branch+1}<extra></extra>"
-                ))
-    
-    # Add fish schools for keywords
-    important_words = [word for word in set(words) if len(word) > 4][:10]  # Top 10 important words
+                group = coral_paths.setdefault(coral_colors[branch % len(coral_colors)], {'paths': [], 'customdata': []})
+                group['paths'].append((coral_x, coral_y, coral_z))
+                group['customdata'] += [[i + 1, response_complexity, branch + 1]] * branch_points + [None]
+    
+    for color, group in coral_paths.items():
+        coral_x, coral_y, coral_z = _join_paths(group['paths'])
+        fig.add_trace(go.Scatter3d(
+            x=coral_x, y=coral_y, z=coral_z,
+            mode='lines+markers',
+            line=dict(color=color, width=6),
+            marker=dict(size=4, color=color),
+            customdata=group['customdata'],
+            showlegend=False,
+            hovertemplate="<b>Coral Reef %{customdata[0]}</b><br>Complexity: %{customdata[1]}<br>Branch: %{customdata[2]}<extra></extra>"
+        ))
     
+    # Add fish schools for keywords, all schools in one marker trace
+    important_words = [word for word in profile.tokens if len(word) > 4][:10]  # Top 10 important words
+    
+    fish_x, fish_y, fish_z, fish_data = [], [], [], []
     for i, word in enumerate(important_words):
         # School position
-        school_x = np.random.uniform(-8, 8)
-        school_y = np.random.uniform(-8, 8)
-        school_z = np.random.uniform(-7, -2)
+        school_x = rng.uniform(-8, 8)
+        school_y = rng.uniform(-8, 8)
+        school_z = rng.uniform(-7, -2)
         
         # Create fish school (small cluster of points)
-        fish_count = min(len([w for w in words if w == word]) * 3, 15)  # School size based on word frequency
-        
-        school_positions_x = school_x + np.random.normal(0, 0.5, fish_count)
-        school_positions_y = school_y + np.random.normal(0, 0.5, fish_count)
-        school_positions_z = school_z + np.random.normal(0, 0.3, fish_count)
+        fish_count = min(profile.tokens[word] * 3, 15)  # School size based on word frequency
         
-        fig.add_trace(go.Scatter3d(
-            x=school_positions_x,
-            y=school_positions_y,
-            z=school_positions_z,
-            mode='markers',
-            marker=dict(
-                size=4,
-                color='lightblue',
-                opacity=0.8,
-                symbol='diamond'
-            ),
-            name=f"School: {word}",
-            hovertemplate=f"<b>Fish School</b><br>Keyword: {word}<br>School Size: {fish_count}<extra></extra>"
-        ))
+        fish_x.extend(school_x + rng.normal(0, 0.5, fish_count))
+        fish_y.extend(school_y + rng.normal(0, 0.5, fish_count))
+        fish_z.extend(school_z + rng.normal(0, 0.3, fish_count))
+        fish_data += [[word, fish_count]] * fish_count
+    
+    fig.add_trace(go.Scatter3d(
+        x=fish_x,
+        y=fish_y,
+        z=fish_z,
+        mode='markers',
+        marker=dict(
+            size=4,
+            color='lightblue',
+            opacity=0.8,
+            symbol='diamond'
+        ),
+        customdata=fish_data,
+        name="Fish Schools",
+        hovertemplate="<b>Fish School</b><br>Keyword: %{customdata[0]}<br>School Size: %{customdata[1]}<extra></extra>"
+    ))
     
     # Add bioluminescent creatures for unique insights
-    unique_responses = [item for item in question_data if len(str(item['answer'])) > 100]
+    unique_responses = [item for item, long_answer in zip(question_data, profile.long_answers) if long_answer]
     
-    for i, item in enumerate(unique_responses):
-        creature_x = np.random.uniform(-9, 9)
-        creature_y = np.random.uniform(-9, 9)
-        creature_z = np.random.uniform(-8, -1)
-        
-        fig.add_trace(go.Scatter3d(
-            x=[creature_x], y=[creature_y], z=[creature_z],
-            mode='markers',
-            marker=dict(
-                size=15,
-                color='cyan',
-                opacity=0.9,
-                symbol='diamond',  # Changed from 'star' to 'diamond'
-                line=dict(width=2, color='white')
-            ),
-            name=f"Deep Insight {i+1}",
-            hovertemplate=f"<b>Bioluminescent Insight</b><br>Response Length: {len(str(item['answer']))}<br>Type: {item['type']}<extra></extra>"
-        ))
+    fig.add_trace(go.Scatter3d(
+        x=rng.uniform(-9, 9, len(unique_responses)),
+        y=rng.uniform(-9, 9, len(unique_responses)),
+        z=rng.uniform(-8, -1, len(unique_responses)),
+        mode='markers',
+        marker=dict(
+            size=15,
+            color='cyan',
+            opacity=0.9,
+            symbol='diamond',  # Changed from 'star' to 'diamond'
+            line=dict(width=2, color='white')
+        ),
+        customdata=[[len(str(item['answer'])), item['type']] for item in unique_responses],
+        name="Deep Insights",
+        hovertemplate="<b>Bioluminescent Insight</b><br>Response Length: %{customdata[0]}<br>Type: %{customdata[1]}<extra></extra>"
+    ))
     
     # Add water surface
-    x_surface = np.linspace(-10, 10, 10)
-    y_surface = np.linspace(-10, 10, 10)
-    X_surface, Y_surface = np.meshgrid(x_surface, y_surface)
-    Z_surface = np.zeros_like(X_surface)
-    
     fig.add_trace(go.Surface(
-        x=X_surface, y=Y_surface, z=Z_surface,
+        x=_WATER_X, y=_WATER_Y, z=_WATER_Z,
         colorscale=[[0, 'rgba(0,100,200,0.3)'], [1, 'rgba(0,150,255,0.3)']],
         opacity=0.4,
         showscale=False,
@@ -1208,48 +1331,38 @@ def render_ocean_depths(question_data, words, combined_text):
         height=600
     )
     
+    return fig, {"fish_schools": len(important_words), "creatures": len(unique_responses)}
+
+def render_ocean_depths(question_data, profile):
+    """🌊 Knowledge Ocean Depths - Underwater Visualization"""
+    
+    st.markdown("## 🌊 KNOWLEDGE OCEAN DEPTHS")
+    st.markdown("*Dive into your underwater knowledge ecosystem*")
+    
+    fig, stats = cached_figure("ocean_depths", question_data, build_ocean_depths_figure, profile, version=FIGURE_VERSION)
     st.plotly_chart(fig, use_container_width=True)
     
     # Ocean statistics
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        coral_reefs = len([item for item in question_data if len(str(item['answer'])) > 50])
+        coral_reefs = sum(1 for length in profile.lengths if length > 50)
         st.metric("🪸 Coral Reefs", coral_reefs)
     with col2:
-        st.metric("🐠 Fish Schools", len(important_words))
+        st.metric("🐠 Fish Schools", stats["fish_schools"])
     with col3:
-        st.metric("✨ Bioluminescent Creatures", len(unique_responses))
+        st.metric("✨ Bioluminescent Creatures", stats["creatures"])
     with col4:
         st.metric("🌊 Ocean Depth", "EXPLORED")
 
-def render_volcano_section(question_data, words, combined_text):
-    """🌋 Knowledge Volcano Cross-Section - Geological Visualization"""
-    
-    st.markdown("## 🌋 KNOWLEDGE VOLCANO CROSS-SECTION")
-    st.markdown("*Explore the geological layers of your knowledge*")
+def build_volcano_section_figure(question_data, profile):
+    """Cross-section scene for render_volcano_section(); returns (fig, crystal count)"""
     
     fig = go.Figure()
+    rng = _scene_rng('volcano_section', question_data)
     
-    # Create volcano cross-section
-    # Outer volcano shape
-    theta = np.linspace(0, 2*np.pi, 50)
-    r_outer = 8
-    r_inner = 2
-    
-    # Volcano surface
-    volcano_x = []
-    volcano_y = []
-    volcano_z = []
-    
-    for i, t in enumerate(theta):
-        for r in np.linspace(r_inner, r_outer, 20):
-            x = r * np.cos(t)
-            y = r * np.sin(t)
-            z = max(0, 6 - (r - r_inner) * 1.5 + np.random.normal(0, 0.2))  # Volcano shape
-            
-            volcano_x.append(x)
-            volcano_y.append(y)
-            volcano_z.append(z)
+    # Volcano surface: the precomputed cone with seeded jitter, clipped at ground level
+    volcano_x, volcano_y = _VOLCANO_X, _VOLCANO_Y
+    volcano_z = np.maximum(0, _VOLCANO_Z + rng.normal(0, 0.2, _VOLCANO_Z.size))
     
     # Add volcano surface
     fig.add_trace(go.Scatter3d(
@@ -1270,22 +1383,8 @@ def render_volcano_section(question_data, words, combined_text):
         
         if layer_responses:
             # Create geological layer
-            layer_theta = np.linspace(0, 2*np.pi, 30)
-            layer_r = np.linspace(1, 6 - layer_idx * 0.5, 15)
-            
-            layer_x = []
-            layer_y = []
-            layer_z = []
-            
-            for t in layer_theta:
-                for r in layer_r:
-                    x = r * np.cos(t)
-                    y = r * np.sin(t)
-                    z = layer_height + np.random.normal(0, 0.1)
-                    
-                    layer_x.append(x)
-                    layer_y.append(y)
-                    layer_z.append(z)
+            layer_x, layer_y = _STRATA[layer_idx]
+            layer_z = layer_height + rng.normal(0, 0.1, layer_x.size)
             
             fig.add_trace(go.Scatter3d(
                 x=layer_x, y=layer_y, z=layer_z,
@@ -1299,57 +1398,52 @@ def render_volcano_section(question_data, words, combined_text):
                 hovertemplate=f"<b>{layer_names[layer_idx]}</b><br>Layer Depth: {layer_height}<br>Responses: {len(layer_responses)}<extra></extra>"
             ))
     
-    # Add magma core (central strategy)
-    core_theta = np.linspace(0, 2*np.pi, 20)
-    core_z = np.linspace(0, 7, 30)
+    # Add magma core (central strategy) as one marker trace
+    magma_x = _MAGMA_X + rng.normal(0, 0.1, _MAGMA_X.size)
+    magma_y = _MAGMA_Y + rng.normal(0, 0.1, _MAGMA_Y.size)
+    magma_z = _MAGMA_Z
     
-    for z in core_z:
-        core_r = max(0.5, 2 - z * 0.2)  # Tapering core
-        for t in core_theta[::2]:  # Sparse points for performance
-            x = core_r * np.cos(t) + np.random.normal(0, 0.1)
-            y = core_r * np.sin(t) + np.random.normal(0, 0.1)
-            
-            fig.add_trace(go.Scatter3d(
-                x=[x], y=[y], z=[z],
-                mode='markers',
-                marker=dict(
-                    size=6,
-                    color='red',
-                    opacity=0.8,
-                    symbol='circle'
-                ),
-                showlegend=False,
-                hovertemplate=f"<b>Magma Core</b><br>Strategic Center<br>Depth: {z:.1f}<extra></extra>"
-            ))
+    fig.add_trace(go.Scatter3d(
+        x=magma_x, y=magma_y, z=magma_z,
+        mode='markers',
+        marker=dict(
+            size=6,
+            color='red',
+            opacity=0.8,
+            symbol='circle'
+        ),
+        showlegend=False,
+        hovertemplate="<b>Magma Core</b><br>Strategic Center<br>Depth: %{z:.1f}<extra></extra>"
+    ))
     
-    # Add crystal formations (valuable insights)
+    # Add crystal formations (valuable insights), 5-crystal clusters in one trace
     valuable_responses = [item for item in question_data if len(str(item['answer'])) > 80]
     
+    crystal_x, crystal_y, crystal_z, crystal_data = [], [], [], []
     for i, item in enumerate(valuable_responses):
-        crystal_x = np.random.uniform(-7, 7)
-        crystal_y = np.random.uniform(-7, 7)
-        crystal_z = np.random.uniform(1, 6)
+        cluster_x = rng.uniform(-7, 7)
+        cluster_y = rng.uniform(-7, 7)
+        cluster_z = rng.uniform(1, 6)
         
-        # Create crystal cluster
-        for j in range(5):
-            offset_x = crystal_x + np.random.normal(0, 0.3)
-            offset_y = crystal_y + np.random.normal(0, 0.3)
-            offset_z = crystal_z + np.random.normal(0, 0.2)
-            
-            fig.add_trace(go.Scatter3d(
-                x=[offset_x], y=[offset_y], z=[offset_z],
-                mode='markers',
-                marker=dict(
-                    size=8,
-                    color='cyan',
-                    opacity=0.9,
-                    symbol='diamond',
-                    line=dict(width=2, color='white')
-                ),
-                showlegend=False if j > 0 else True,
-                name=f"Crystal Formation {i+1}" if j == 0 else "",
-                hovertemplate=f"<b>Knowledge Crystal</b><br>Valuable Insight<br>Response Length: {len(str(item['answer']))}<extra></extra>"
-            ))
+        crystal_x.extend(cluster_x + rng.normal(0, 0.3, 5))
+        crystal_y.extend(cluster_y + rng.normal(0, 0.3, 5))
+        crystal_z.extend(cluster_z + rng.normal(0, 0.2, 5))
+        crystal_data += [len(str(item['answer']))] * 5
+    
+    fig.add_trace(go.Scatter3d(
+        x=crystal_x, y=crystal_y, z=crystal_z,
+        mode='markers',
+        marker=dict(
+            size=8,
+            color='cyan',
+            opacity=0.9,
+            symbol='diamond',
+            line=dict(width=2, color='white')
+        ),
+        customdata=crystal_data,
+        name="Crystal Formations",
+        hovertemplate="<b>Knowledge Crystal</b><br>Valuable Insight<br>Response Length: %{customdata}<extra></extra>"
+    ))
     
     # Style the volcano
     fig.update_layout(
@@ -1364,6 +1458,15 @@ def render_volcano_section(question_data, words, combined_text):
         height=600
     )
     
+    return fig, {"crystal_formations": len(valuable_responses)}
+
+def render_volcano_section(question_data, profile):
+    """🌋 Knowledge Volcano Cross-Section - Geological Visualization"""
+    
+    st.markdown("## 🌋 KNOWLEDGE VOLCANO CROSS-SECTION")
+    st.markdown("*Explore the geological layers of your knowledge*")
+    
+    fig, stats = cached_figure("volcano_section", question_data, build_volcano_section_figure, profile, version=FIGURE_VERSION)
     st.plotly_chart(fig, use_container_width=True)
     
     # Geological statistics
@@ -1371,24 +1474,20 @@ def render_volcano_section(question_data, words, combined_text):
     with col1:
         st.metric("🏔️ Geological Layers", 6)
     with col2:
-        st.metric("💎 Crystal Formations", len(valuable_responses))
+        st.metric("💎 Crystal Formations", stats["crystal_formations"])
     with col3:
         st.metric("🌋 Magma Activity", "ACTIVE")
     with col4:
         st.metric("⛏️ Mining Status", "RICH DEPOSITS")
 
-def render_theater_stage(question_data, words, combined_text):
-    """🎭 Knowledge Theater Stage - Performance Visualization"""
-    
-    st.markdown("## 🎭 KNOWLEDGE THEATER STAGE")
-    st.markdown("*Watch your data perform on the grand stage*")
+def build_theater_stage_figure(question_data, profile):
+    """Stage scene for render_theater_stage(); returns (fig, audience size)"""
     
     fig = go.Figure()
+    rng = _scene_rng('theater_stage', question_data)
     
     # Create theater stage
-    stage_width = 10
-    stage_depth = 6
-    stage_height = 0.5
+    stage_width, stage_depth, stage_height = _STAGE_WIDTH, _STAGE_DEPTH, _STAGE_HEIGHT
     
     # Stage platform
     stage_x = [-stage_width/2, stage_width/2, stage_width/2, -stage_width/2, -stage_width/2]
@@ -1429,91 +1528,70 @@ def render_theater_stage(question_data, words, combined_text):
             x_pos = (col - 2) * 2
             y_pos_offset = row * 1.5
         
-        y_pos = np.random.uniform(-2, 2) + (y_pos_offset if len(question_data) > 5 else 0)
+        y_pos = rng.uniform(-2, 2) + (y_pos_offset if len(question_data) > 5 else 0)
         z_pos = stage_height + 0.1
-        
-        # Actor size based on response importance
-        actor_size = max(len(str(item['answer'])) / 20, 5)
-        
-        fig.add_trace(go.Scatter3d(
-            x=[x_pos], y=[y_pos], z=[z_pos],
-            mode='markers+text',
-            marker=dict(
-                size=actor_size,
-                color=act_colors[i % len(act_colors)],
-                opacity=0.8,
-                symbol='circle',
-                line=dict(width=2, color='white')
-            ),
-            text=f"Act {i+1}",
-            textposition="top center",
-            textfont=dict(size=10, color='white'),
-            name=f"Performer {i+1}",
-            hovertemplate=f"<b>Act {i+1}</b><br>Performance Length: {len(str(item['answer']))}<br>Type: {item['type']}<extra></extra>"
-        ))
-        
         performer_positions.append([x_pos, y_pos, z_pos])
     
-    # Add stage lighting (spotlights)
-    for i, pos in enumerate(performer_positions[:5]):  # Limit to 5 spotlights
-        # Create light beam effect
-        light_x = [pos[0], pos[0]]
-        light_y = [pos[1], pos[1]]
-        light_z = [pos[2], pos[2] + 5]
-        
-        fig.add_trace(go.Scatter3d(
-            x=light_x, y=light_y, z=light_z,
-            mode='lines',
-            line=dict(color='yellow', width=15, dash='dot'),
-            opacity=0.6,
-            showlegend=False,
-            hoverinfo='skip'
-        ))
-        
-        # Light source
-        fig.add_trace(go.Scatter3d(
-            x=[pos[0]], y=[pos[1]], z=[pos[2] + 5],
-            mode='markers',
-            marker=dict(size=8, color='yellow', opacity=0.9, symbol='diamond'),  # Changed from 'star' to 'diamond'
-            showlegend=False,
-            hoverinfo='skip'
-        ))
+    fig.add_trace(go.Scatter3d(
+        x=[p[0] for p in performer_positions],
+        y=[p[1] for p in performer_positions],
+        z=[p[2] for p in performer_positions],
+        mode='markers+text',
+        marker=dict(
+            # Actor size based on response importance
+            size=[max(length / 20, 5) for length in profile.lengths],
+            color=[act_colors[i % len(act_colors)] for i in range(len(question_data))],
+            opacity=0.8,
+            symbol='circle',
+            line=dict(width=2, color='white')
+        ),
+        text=[f"Act {i+1}" for i in range(len(question_data))],
+        customdata=[[i + 1, profile.lengths[i], item['type']] for i, item in enumerate(question_data)],
+        textposition="top center",
+        textfont=dict(size=10, color='white'),
+        name="Performers",
+        hovertemplate="<b>Act %{customdata[0]}</b><br>Performance Length: %{customdata[1]}<br>Type: %{customdata[2]}<extra></extra>"
+    ))
     
-    # Add theater curtains
-    curtain_height = 8
-    curtain_positions = [
-        # Left curtain
-        ([-stage_width/2 - 1, -stage_width/2 - 1], [-stage_depth/2, stage_depth/2], [0, curtain_height]),
-        # Right curtain  
-        ([stage_width/2 + 1, stage_width/2 + 1], [-stage_depth/2, stage_depth/2], [0, curtain_height])
-    ]
+    # Add stage lighting (spotlights), limited to 5: beams in one trace, light sources in another
+    spotlights = performer_positions[:5]
+    beam_x, beam_y, beam_z = _join_paths(([p[0], p[0]], [p[1], p[1]], [p[2], p[2] + 5]) for p in spotlights)
+    fig.add_trace(go.Scatter3d(
+        x=beam_x, y=beam_y, z=beam_z,
+        mode='lines',
+        line=dict(color='yellow', width=15, dash='dot'),
+        opacity=0.6,
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    fig.add_trace(go.Scatter3d(
+        x=[p[0] for p in spotlights], y=[p[1] for p in spotlights], z=[p[2] + 5 for p in spotlights],
+        mode='markers',
+        marker=dict(size=8, color='yellow', opacity=0.9, symbol='diamond'),  # Changed from 'star' to 'diamond'
+        showlegend=False,
+        hoverinfo='skip'
+    ))
     
-    for curtain_x, curtain_y, curtain_z in curtain_positions:
-        fig.add_trace(go.Scatter3d(
-            x=curtain_x * 2, y=curtain_y, z=curtain_z * 2,
-            mode='lines',
-            line=dict(color='darkred', width=20),
-            showlegend=False,
-            hoverinfo='skip'
-        ))
+    # Add theater curtains
+    curtain_x, curtain_y, curtain_z = _CURTAINS
+    fig.add_trace(go.Scatter3d(
+        x=curtain_x, y=curtain_y, z=curtain_z,
+        mode='lines',
+        line=dict(color='darkred', width=20),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
     
     # Add audience (represented by dots)
-    audience_rows = 5
-    audience_cols = 8
-    
-    for row in range(audience_rows):
-        for col in range(audience_cols):
-            audience_x = (col - audience_cols/2 + 0.5) * 1.2
-            audience_y = -stage_depth/2 - 2 - row * 0.8
-            audience_z = 0
-            
-            fig.add_trace(go.Scatter3d(
-                x=[audience_x], y=[audience_y], z=[audience_z],
-                mode='markers',
-                marker=dict(size=3, color='gray', opacity=0.5),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
+    fig.add_trace(go.Scatter3d(
+        x=_AUDIENCE_X,
+        y=_AUDIENCE_Y,
+        z=_AUDIENCE_Z,
+        mode='markers',
+        marker=dict(size=3, color='gray', opacity=0.5),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
     
     # Style the theater
     fig.update_layout(
@@ -1530,6 +1608,15 @@ def render_theater_stage(question_data, words, combined_text):
         height=600
     )
     
+    return fig, {"audience": _AUDIENCE_X.size}
+
+def render_theater_stage(question_data, profile):
+    """🎭 Knowledge Theater Stage - Performance Visualization"""
+    
+    st.markdown("## 🎭 KNOWLEDGE THEATER STAGE")
+    st.markdown("*Watch your data perform on the grand stage*")
+    
+    fig, stats = cached_figure("theater_stage", question_data, build_theater_stage_figure, profile, version=FIGURE_VERSION)
     st.plotly_chart(fig, use_container_width=True)
     
     # Theater statistics
@@ -1539,16 +1626,12 @@ def render_theater_stage(question_data, words, combined_text):
     with col2:
         st.metric("💡 Spotlights", min(len(question_data), 5))
     with col3:
-        audience_size = audience_rows * audience_cols
-        st.metric("👥 Audience", audience_size)
+        st.metric("👥 Audience", stats["audience"])
     with col4:
         st.metric("🎪 Show Status", "STANDING OVATION")
 
-def render_castle_fortress(question_data, words, combined_text):
-    """🏰 Knowledge Castle Fortress - Medieval Visualization"""
-    
-    st.markdown("## 🏰 KNOWLEDGE CASTLE FORTRESS")
-    st.markdown("*Defend your knowledge kingdom*")
+def build_castle_fortress_figure(question_data, profile):
+    """Fortress scene for render_castle_fortress(); returns (fig, {})"""
     
     fig = go.Figure()
     
@@ -1568,103 +1651,66 @@ def render_castle_fortress(question_data, words, combined_text):
     keep_responses = question_data[:len(question_data)//2] if question_data else []
     
     # Main keep structure
-    keep_x = [keep['position'][0] - keep['width']/2, keep['position'][0] + keep['width']/2, 
-              keep['position'][0] + keep['width']/2, keep['position'][0] - keep['width']/2,
-              keep['position'][0] - keep['width']/2, keep['position'][0] + keep['width']/2,
-              keep['position'][0] + keep['width']/2, keep['position'][0] - keep['width']/2]
-    keep_y = [keep['position'][1] - keep['width']/2, keep['position'][1] - keep['width']/2,
-              keep['position'][1] + keep['width']/2, keep['position'][1] + keep['width']/2,
-              keep['position'][1] - keep['width']/2, keep['position'][1] - keep['width']/2,
-              keep['position'][1] + keep['width']/2, keep['position'][1] + keep['width']/2]
-    keep_z = [0, 0, 0, 0, keep['height'], keep['height'], keep['height'], keep['height']]
+    keep_x, keep_y, keep_z, keep_i, keep_j, keep_k = _box_mesh(
+        [(keep['position'][0], keep['position'][1], keep['width'], keep['height'])])
     
     fig.add_trace(go.Mesh3d(
-        x=keep_x, y=keep_y, z=keep_z,
-        i=[7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2],
-        j=[3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3],
-        k=[0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6],
+        x=keep_x, y=keep_y, z=keep_z, i=keep_i, j=keep_j, k=keep_k,
         color='gray',
         opacity=0.8,
         name="Main Keep",
         hovertemplate=f"<b>Main Keep</b><br>Central Knowledge<br>Responses: {len(keep_responses)}<extra></extra>"
     ))
     
-    # Build towers (specialized knowledge areas)
+    # Build towers (specialized knowledge areas) as one mesh colored per face
     tower_names = ['Business Tower', 'Technical Tower', 'Strategic Tower', 'Innovation Tower']
     tower_colors = ['blue', 'red', 'green', 'purple']
     
-    for i, tower in enumerate(castle_components['towers']):
-        if i < len(question_data):
-            tower_height = max(tower['height'], len(str(question_data[i]['answer'])) / 20)
-            
-            # Tower structure
-            tower_x = [tower['position'][0] - tower['width']/2, tower['position'][0] + tower['width']/2,
-                      tower['position'][0] + tower['width']/2, tower['position'][0] - tower['width']/2,
-                      tower['position'][0] - tower['width']/2, tower['position'][0] + tower['width']/2,
-                      tower['position'][0] + tower['width']/2, tower['position'][0] - tower['width']/2]
-            tower_y = [tower['position'][1] - tower['width']/2, tower['position'][1] - tower['width']/2,
-                      tower['position'][1] + tower['width']/2, tower['position'][1] + tower['width']/2,
-                      tower['position'][1] - tower['width']/2, tower['position'][1] - tower['width']/2,
-                      tower['position'][1] + tower['width']/2, tower['position'][1] + tower['width']/2]
-            tower_z = [0, 0, 0, 0, tower_height, tower_height, tower_height, tower_height]
-            
-            fig.add_trace(go.Mesh3d(
-                x=tower_x, y=tower_y, z=tower_z,
-                i=[7, 0, 0, 0, 4, 4, 6, 6, 4, 0, 3, 2],
-                j=[3, 4, 1, 2, 5, 6, 5, 2, 0, 1, 6, 3],
-                k=[0, 7, 2, 3, 6, 7, 1, 1, 5, 5, 7, 6],
-                color=tower_colors[i],
-                opacity=0.7,
-                name=tower_names[i],
-                hovertemplate=f"<b>{tower_names[i]}</b><br>Height: {tower_height:.1f}<br>Specialization: {question_data[i]['type'] if i < len(question_data) else 'N/A'}<extra></extra>"
-            ))
-            
-            # Add flags on towers
-            flag_x = tower['position'][0]
-            flag_y = tower['position'][1]
-            flag_z = tower_height + 0.5
-            
-            fig.add_trace(go.Scatter3d(
-                x=[flag_x], y=[flag_y], z=[flag_z],
-                mode='markers+text',
-                marker=dict(size=8, color=tower_colors[i], symbol='diamond'),
-                text="🏴",
-                textfont=dict(size=16),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
+    towers = []
+    for i, tower in enumerate(castle_components['towers'][:len(question_data)]):
+        tower_height = max(tower['height'], len(str(question_data[i]['answer'])) / 20)
+        towers.append((i, tower, tower_height))
     
-    # Add castle walls connecting towers
-    wall_connections = [
-        ([-4, -4, 0], [4, -4, 0]),  # Front wall
-        ([4, -4, 0], [4, 4, 0]),   # Right wall
-        ([4, 4, 0], [-4, 4, 0]),   # Back wall
-        ([-4, 4, 0], [-4, -4, 0])  # Left wall
-    ]
+    if towers:
+        tower_x, tower_y, tower_z, tower_i, tower_j, tower_k = _box_mesh(
+            (tower['position'][0], tower['position'][1], tower['width'], tower_height) for _, tower, tower_height in towers)
+        fig.add_trace(go.Mesh3d(
+            x=tower_x, y=tower_y, z=tower_z, i=tower_i, j=tower_j, k=tower_k,
+            facecolor=[tower_colors[i] for i, _, _ in towers for _ in _BOX_I],
+            opacity=0.7,
+            name="Towers",
+            customdata=[[tower_names[i], round(tower_height, 1), question_data[i]['type']] for i, _, tower_height in towers for _ in range(8)],
+            hovertemplate="<b>%{customdata[0]}</b><br>Height: %{customdata[1]:.1f}<br>Specialization: %{customdata[2]}<extra></extra>"
+        ))
+        
+        # Add flags on towers
+        fig.add_trace(go.Scatter3d(
+            x=[tower['position'][0] for _, tower, _ in towers],
+            y=[tower['position'][1] for _, tower, _ in towers],
+            z=[tower_height + 0.5 for _, _, tower_height in towers],
+            mode='markers+text',
+            marker=dict(size=8, color=[tower_colors[i] for i, _, _ in towers], symbol='diamond'),
+            text=["🏴"] * len(towers),
+            textfont=dict(size=16),
+            showlegend=False,
+            hoverinfo='skip'
+        ))
     
-    wall_height = 3
-    for start, end in wall_connections:
-        # Wall segments
-        wall_segments = 10
-        for i in range(wall_segments):
-            t = i / wall_segments
-            x = start[0] + t * (end[0] - start[0])
-            y = start[1] + t * (end[1] - start[1])
-            
-            fig.add_trace(go.Scatter3d(
-                x=[x, x], y=[y, y], z=[0, wall_height],
-                mode='lines',
-                line=dict(color='gray', width=8),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
+    # Add castle walls connecting towers: 10 vertical posts per wall, drawn as one trace
+    wall_x, wall_y, wall_z = _CASTLE_WALLS
+    fig.add_trace(go.Scatter3d(
+        x=wall_x, y=wall_y, z=wall_z,
+        mode='lines',
+        line=dict(color='gray', width=8),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
     
     # Add moat (knowledge barriers)
     moat_radius = 7
-    moat_theta = np.linspace(0, 2*np.pi, 50)
-    moat_x = moat_radius * np.cos(moat_theta)
-    moat_y = moat_radius * np.sin(moat_theta)
-    moat_z = [-1] * len(moat_theta)
+    moat_x = moat_radius * np.cos(_MOAT_THETA)
+    moat_y = moat_radius * np.sin(_MOAT_THETA)
+    moat_z = [-1] * len(_MOAT_THETA)
     
     fig.add_trace(go.Scatter3d(
         x=moat_x, y=moat_y, z=moat_z,
@@ -1700,6 +1746,15 @@ def render_castle_fortress(question_data, words, combined_text):
         height=600
     )
     
+    return fig, {}
+
+def render_castle_fortress(question_data, profile):
+    """🏰 Knowledge Castle Fortress - Medieval Visualization"""
+    
+    st.markdown("## 🏰 KNOWLEDGE CASTLE FORTRESS")
+    st.markdown("*Defend your knowledge kingdom*")
+    
+    fig, stats = cached_figure("castle_fortress", question_data, build_castle_fortress_figure, profile, version=FIGURE_VERSION)
     st.plotly_chart(fig, use_container_width=True)
     
     # Castle statistics
@@ -1716,3 +1771,114 @@ def render_castle_fortress(question_data, words, combined_text):
 
     return True
 
+
+# (max traces, max serialized KB) per scene for the benchmark below, at 30 fixed + 10 open-ended answers
+FIGURE_BUDGET = {
+    "dna_double_helix": (9, 40), "galaxy_explorer": (12, 140), "neural_brain": (6, 80),
+    "space_hologram": (2, 40), "space_satellites": (3, 130), "architecture_builder": (6, 25),
+    "ocean_depths": (10, 110), "volcano_section": (10, 260), "theater_stage": (7, 15),
+    "castle_fortress": (6, 20),
+}
+
+FIGURE_BUILDERS = {
+    "dna_double_helix": build_dna_double_helix_figure,
+    "galaxy_explorer": build_galaxy_explorer_figure,
+    "neural_brain": build_neural_brain_figure,
+    "space_hologram": build_space_hologram_figure,
+    "space_satellites": build_space_satellites_figure,
+    "architecture_builder": build_architecture_builder_figure,
+    "ocean_depths": build_ocean_depths_figure,
+    "volcano_section": build_volcano_section_figure,
+    "theater_stage": build_theater_stage_figure,
+    "castle_fortress": build_castle_fortress_figure,
+}
+
+
+def _bench_question_data(n_fixed=30, n_open=10, seed=7):
+    rng = random.Random(seed)
+    vocab = ("customer strategy business process api integration platform cloud data analytics security "
+             "infrastructure requirement performance scalability availability onboarding escalation whatsapp "
+             "containment latency compliance authentication dashboard retrieval evaluation sandbox").split()
+    options = ["Retail", "Cards", "Loans", "Payments", "Core Banking", "CRM", "OpenAI", "Azure OpenAI"]
+
+    def sentence(n):
+        return " ".join(rng.choice(vocab) for _ in range(n)) + "."
+
+    data = []
+    for i in range(n_fixed):
+        kind = ("select", "multiselect", "text", "likert")[i % 4]
+        if kind == "multiselect":
+            answer = rng.sample(options, 3)
+        elif kind == "text":
+            answer = " ".join(sentence(rng.randint(8, 20)) for _ in range(rng.randint(1, 6)))
+        elif kind == "likert":
+            answer = rng.randint(1, 5)
+        else:
+            answer = rng.choice(options)
+        data.append({'type': kind, 'question': f"Question {i+1}", 'answer': answer,
+                     'pillar': "Technology & Integration", 'category': "Integration"})
+    for i in range(n_open):
+        data.append({'type': 'open-ended', 'question': f"Open question {i+1}",
+                     'answer': " ".join(sentence(rng.randint(10, 25)) for _ in range(rng.randint(4, 12))),
+                     'pillar': 'Strategic', 'category': 'Deep-Dive'})
+    return data
+
+
+if __name__ == "__main__":
+    import statistics
+    import sys
+
+    question_data = _bench_question_data()
+    profile = TextProfile(q['answer'] for q in question_data)
+
+    print(f"{len(question_data)} answers, {profile.total_words} words")
+    print(f"{'scene':22} {'traces':>6} {'budget':>6} {'json KB':>8} {'budget':>6} {'build ms':>9} {'repeatable':>10}")
+    over, unstable = [], []
+    for name, builder in FIGURE_BUILDERS.items():
+        times, specs = [], set()
+        for _ in range(5):
+            started = time.perf_counter()
+            fig, _ = builder(question_data, profile)
+            times.append(time.perf_counter() - started)
+            specs.add(fig.to_json())
+        traces = len(fig.data)
+        kb = len(fig.to_json()) / 1024
+        max_traces, max_kb = FIGURE_BUDGET[name]
+        repeatable = len(specs) == 1  # seeded from the submission, so every rebuild must match
+        print(f"{name:22} {traces:6d} {max_traces:6d} {kb:8.1f} {max_kb:6d} {statistics.median(times) * 1000:9.1f} "
+              f"{'yes' if repeatable else 'NO':>10}")
+        if traces > max_traces or kb > max_kb:
+            over.append(name)
+        if not repeatable:
+            unstable.append(name)
+
+    # Synapse detection: the previous per-pair Python loop against _pairs_within()
+    def synapses_loop(points):
+        pairs = []
+        for i, p1 in enumerate(points):
+            for j, p2 in enumerate(points[i+1:], i+1):
+                if np.sqrt(sum((a-b)**2 for a, b in zip(p1, p2))) < 2:
+                    pairs.append((i, j))
+        return pairs
+
+    print(f"\n{'neurons':>8} {'synapses':>9} {'loop ms':>9} {'vectorized ms':>14}")
+    rng = np.random.default_rng(7)
+    for n in (40, 400, 2000):
+        points = rng.normal(0, 0.5, (n, 3)) + rng.choice([0.0, 2.0], (n, 3))
+        started = time.perf_counter()
+        pair_i, pair_j, _ = _pairs_within(points, 2.0)
+        vectorized = time.perf_counter() - started
+        if n <= 400:
+            started = time.perf_counter()
+            assert sorted(zip(pair_i.tolist(), pair_j.tolist())) == synapses_loop(points.tolist())
+            loop = f"{(time.perf_counter() - started) * 1000:9.1f}"
+        else:
+            loop = f"{'-':>9}"
+        print(f"{n:8d} {len(pair_i):9d} {loop} {vectorized * 1000:14.1f}")
+
+    if over:
+        print("over budget: " + ", ".join(over))
+    if unstable:
+        print("not repeatable: " + ", ".join(unstable))
+    if over or unstable:
+        sys.exit(1)
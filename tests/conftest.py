@@ -0,0 +1,28 @@
+# The app modules live flat in the repository root
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _bulk_write(self, ops, ordered=True):
+    # mongomock's bulk_write does not accept the operation objects of current pymongo
+    from pymongo import ReplaceOne
+
+    for op in ops:
+        if isinstance(op, ReplaceOne):
+            self.replace_one(op._filter, op._doc, upsert=op._upsert)
+        else:
+            self.update_one(op._filter, op._doc, upsert=op._upsert)
+
+
+@pytest.fixture
+def mock_col(monkeypatch):
+    """
+    An empty mongomock submissions collection.
+    """
+    mongomock = pytest.importorskip("mongomock")
+    monkeypatch.setattr(mongomock.collection.Collection, "bulk_write", _bulk_write)
+    return mongomock.MongoClient()["survey"]["submissions"]
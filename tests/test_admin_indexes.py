@@ -0,0 +1,37 @@
+# Explain-plan check: every admin query shape must be served by an index, never a COLLSCAN
+import configparser
+import os
+
+import pytest
+
+from submissions import ADMIN_QUERY_SAMPLES, assert_index_backed, build_admin_query, ensure_indexes, keyset_query
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.ini")
+
+pytestmark = pytest.mark.skipif(not os.getenv("MONGO_URI"), reason="MONGO_URI not set")
+
+
+@pytest.fixture(scope="module")
+def col():
+    from db_client import close_clients, get_db
+
+    cfg = configparser.ConfigParser()
+    cfg.read(CONFIG_PATH, encoding="utf-8")
+    col = get_db()[cfg["MONGO"]["collection_name"]]
+    ensure_indexes(col)
+    yield col
+    close_clients()
+
+
+@pytest.mark.parametrize("query", ADMIN_QUERY_SAMPLES, ids=str)
+def test_admin_query_is_index_backed(col, query):
+    assert_index_backed(col, query)
+
+
+def test_next_page_is_index_backed(col):
+    doc = col.find_one({}, sort=[("created_at", -1), ("_id", -1)])
+    if doc is None:
+        pytest.skip("collection is empty")
+    after = (doc.get("created_at"), doc["_id"])
+    assert_index_backed(col, keyset_query(build_admin_query(org="a"), after))
+    assert_index_backed(col, keyset_query({}, after))
@@ -0,0 +1,35 @@
+# CSV export escaping
+import csv
+import io
+
+from bulk_export import csv_cell, csv_row, iter_csv
+
+
+def _doc(org_name, answer):
+    return {
+        "_id": "abc",
+        "org": {"name": org_name, "contact": "@handle"},
+        "answers": {"fixed": [{"id": "q1", "answer": answer}, {"id": "q2", "answer": ["-x", "y"]}]},
+        "scores": {"overall": -1.5, "pillars": [{"name": "P", "score": 3}]},
+    }
+
+
+def test_formula_cells_are_prefixed():
+    for value in ["=1+1", "+cmd", "-2", "@SUM(A1)", "\tx", "\rx"]:
+        assert csv_cell(value) == "'" + value
+    for value in ["plain", "a=b", "", 3, -1.5, None]:
+        assert csv_cell(value) == value
+
+
+def test_csv_row_escapes_answers_and_org_fields():
+    row = csv_row(_doc('=HYPERLINK("http://x","y")', "=cmd|' /C calc'!A0"), ["q1", "q2"], ["P"])
+    assert row[1] == '\'=HYPERLINK("http://x","y")'
+    assert row[2] == "'@handle"
+    assert row[8:] == ["'=cmd|' /C calc'!A0", "'-x; y", -1.5, 3]
+
+
+def test_iter_csv_round_trip_keeps_escaped_text():
+    text = "".join(iter_csv([_doc("Bank", "+44 20 7946 0000")], ["q1", "q2"], ["P"]))
+    header, row = list(csv.reader(io.StringIO(text)))
+    assert row[header.index("q1")] == "'+44 20 7946 0000"
+    assert row[header.index("org")] == "Bank"
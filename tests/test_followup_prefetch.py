@@ -0,0 +1,38 @@
+# Debounced follow-up prefetch: take() before, during and after the debounce window
+import threading
+import time
+
+from followup_prefetch import FollowupPrefetcher, answer_hash
+
+
+def test_take_before_debounce_starts_job_immediately():
+    prefetcher = FollowupPrefetcher(debounce=30.0)
+    calls = []
+    prefetcher.schedule("slot", answer_hash("my answer"), lambda: calls.append(1) or ["Why?"])
+    started = time.monotonic()
+    assert prefetcher.take("slot", answer_hash("my answer"), timeout=5) == ["Why?"]
+    assert time.monotonic() - started < 5
+    assert calls == [1]
+    assert prefetcher.stats() == {"pending": 0, "started": 1, "used": 1, "discarded": 0}
+
+
+def test_take_after_debounce_reuses_running_job():
+    prefetcher = FollowupPrefetcher(debounce=0.01)
+    ran = threading.Event()
+    prefetcher.schedule("slot", answer_hash("a"), lambda: ran.set() or ["Q"])
+    assert ran.wait(5)
+    assert prefetcher.take("slot", answer_hash("a"), timeout=5, fn=lambda: ["other"]) == ["Q"]
+    assert prefetcher.stats()["started"] == 1
+
+
+def test_changed_answer_is_discarded():
+    prefetcher = FollowupPrefetcher(debounce=30.0)
+    prefetcher.schedule("slot", answer_hash("old"), lambda: ["stale"])
+    assert prefetcher.take("slot", answer_hash("new"), timeout=1) is None
+    assert prefetcher.stats()["discarded"] == 1
+
+
+def test_missing_job_runs_fn_with_timeout():
+    prefetcher = FollowupPrefetcher(debounce=30.0)
+    assert prefetcher.take("slot", answer_hash("a"), timeout=5, fn=lambda: ["fresh"]) == ["fresh"]
+    assert prefetcher.take("slot", answer_hash("a"), timeout=0.05, fn=lambda: time.sleep(1)) is None
@@ -0,0 +1,71 @@
+# Concurrency slots held by streamed completions
+import gc
+
+import pytest
+
+import llm_client
+
+pytestmark = pytest.mark.skipif(llm_client.OpenAI is None, reason="openai package not installed")
+
+
+class _FakeStream:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeCompletions:
+    def __init__(self):
+        self.streams = []
+
+    def create(self, **kwargs):
+        stream = _FakeStream(["a", "b", "c"])
+        self.streams.append(stream)
+        return stream
+
+
+class _FakeRaw:
+    def __init__(self):
+        self.chat = type("Chat", (), {})()
+        self.chat.completions = _FakeCompletions()
+
+
+@pytest.fixture
+def client():
+    settings = dict(llm_client.DEFAULTS, max_concurrent=2)
+    client = llm_client.LLMClient("sk-test", settings)
+    client.raw = _FakeRaw()
+    return client
+
+
+def _stream(client):
+    return client.chat.completions.create(model="gpt-4", messages=[], stream=True)
+
+
+def test_exhausted_stream_releases_slot(client):
+    assert list(_stream(client)) == ["a", "b", "c"]
+    assert client.stats()["in_flight"] == 0
+    assert client.raw.chat.completions.streams[0].closed
+
+
+def test_closed_stream_releases_slot_once(client):
+    stream = _stream(client)
+    next(stream)
+    stream.close()
+    stream.close()
+    assert client.stats()["in_flight"] == 0
+    assert list(stream) == []
+
+
+def test_abandoned_stream_releases_slot(client):
+    for _ in range(5):  # more than max_concurrent: a leaked slot would block here
+        _stream(client)
+        gc.collect()
+    assert client.stats()["in_flight"] == 0
+    assert all(s.closed for s in client.raw.chat.completions.streams)
@@ -0,0 +1,141 @@
+# Gateway coalescing, fairness, rate limiting and failure handling
+import asyncio
+import threading
+import time
+
+import pytest
+
+import llm_gateway
+from llm_gateway import LLMGateway, TokenBucket, _Flight, request_key
+
+
+class _FakeUpstream:
+    """
+    Stands in for the shared llm_client: records each call's model/content and blocks
+    until `release` is set.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+        self.chat = type("Chat", (), {})()
+        self.chat.completions = self
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs["messages"][0]["content"])
+        self.release.wait(5)
+        return {"answer": kwargs["messages"][0]["content"]}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    fake = _FakeUpstream()
+    monkeypatch.setattr(llm_gateway, "get_openai_client", lambda: fake)
+    return fake
+
+
+def _kwargs(content, model="gpt-4o-mini"):
+    return {"model": model, "messages": [{"role": "user", "content": content}], "max_tokens": 10}
+
+
+def _barrier(gateway):
+    # Returns once the event loop has run every callback scheduled before it
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0), gateway._loop).result(5)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_identical_requests_share_one_upstream_call(upstream):
+    gateway = LLMGateway()
+    upstream.release.clear()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(gateway.request("s%d" % i, _kwargs("same"))))
+               for i in range(3)]
+    threads[0].start()
+    _wait_for(lambda: upstream.calls)
+    for t in threads[1:]:
+        t.start()
+    _wait_for(lambda: gateway.stats()["requests"] == 3)
+    upstream.release.set()
+    for t in threads:
+        t.join(5)
+
+    assert upstream.calls == ["same"]
+    assert results == [{"answer": "same"}] * 3
+    assert gateway.stats()["coalesced"] == 2
+
+
+def test_sessions_are_served_round_robin(upstream):
+    gateway = LLMGateway(max_concurrent=1)
+    upstream.release.clear()
+    blocker = gateway._flights["b"] = _Flight("b", _kwargs("blocker"))
+    gateway._loop.call_soon_threadsafe(gateway._enqueue, "other", blocker)
+    _wait_for(lambda: upstream.calls)
+
+    flights = []
+    for session, content in [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1")]:
+        flight = _Flight(request_key(_kwargs(content)), _kwargs(content))
+        flights.append(flight)
+        gateway._loop.call_soon_threadsafe(gateway._enqueue, session, flight)
+    _barrier(gateway)
+    upstream.release.set()
+    for flight in flights:
+        flight.result(5)
+
+    assert upstream.calls == ["blocker", "a1", "b1", "a2", "a3"]
+
+
+def test_bucket_throttles_once_capacity_is_spent():
+    async def run():
+        bucket = TokenBucket(600)  # 10 tokens/s
+        first = await bucket.take(600)
+        started = time.monotonic()
+        second = await bucket.take(5)
+        return first, second, time.monotonic() - started
+
+    first, second, elapsed = asyncio.run(run())
+    assert first == 0.0
+    assert second == pytest.approx(0.5, abs=0.05)
+    assert elapsed >= 0.45
+
+
+def test_zero_limit_is_unlimited_and_negative_is_rejected(upstream):
+    assert asyncio.run(TokenBucket(0).take(10 ** 6)) == 0.0
+    gateway = LLMGateway(rpm=0, tpm=0)
+    assert gateway.request("s", _kwargs("free")) == {"answer": "free"}
+    with pytest.raises(ValueError):
+        LLMGateway(model_limits={"gpt-4": [-1, 1000]})
+    with pytest.raises(ValueError):
+        LLMGateway(model_limits={"gpt-4": [500]})
+
+
+def test_dispatch_error_fails_one_flight_and_keeps_running(upstream, monkeypatch):
+    gateway = LLMGateway()
+    limits_for = gateway._limits_for
+
+    def broken(model):
+        if model == "broken":
+            raise RuntimeError("no limits")
+        return limits_for(model)
+
+    monkeypatch.setattr(gateway, "_limits_for", broken)
+    with pytest.raises(RuntimeError, match="no limits"):
+        gateway.request("s", _kwargs("x", model="broken"))
+    assert gateway.stats()["in_flight"] == 0
+    assert gateway.request("s", _kwargs("after")) == {"answer": "after"}
+
+
+def test_caller_wait_is_bounded(upstream):
+    gateway = LLMGateway(wait_timeout=0.2)
+    upstream.release.clear()
+    with pytest.raises(TimeoutError):
+        gateway.request("s", _kwargs("slow"))
+    with pytest.raises(TimeoutError):
+        list(gateway.request("s", dict(_kwargs("slow stream"), stream=True)))
+    upstream.release.set()
@@ -0,0 +1,21 @@
+# Local follow-up engine: the question's pillar and category steer template choice
+from local_followups import TEMPLATES, local_followups
+
+VAGUE = "We have not decided yet."
+
+
+def test_pillar_selects_gap_templates():
+    for pillar in ("Validation & Testing", "Model & Platform", "Scope & Use Cases"):
+        assert local_followups(VAGUE, 1, pillar=pillar) == [TEMPLATES[pillar]["gap"][0]]
+    assert local_followups(VAGUE, 1, pillar="Validation & Testing") != local_followups(VAGUE, 1, pillar="Model & Platform")
+
+
+def test_category_names_the_topic_when_answer_has_no_keywords():
+    with_category = local_followups(VAGUE, 1, pillar="Model & Platform", category="Model/Approval")
+    assert "model" in with_category[0].lower()
+    assert with_category != local_followups(VAGUE, 1, pillar="Model & Platform")
+
+
+def test_exclude_skips_questions_already_asked():
+    first = local_followups(VAGUE, 1, pillar="Validation & Testing")
+    assert local_followups(VAGUE, 1, pillar="Validation & Testing", exclude=first) != first
@@ -0,0 +1,66 @@
+# Incremental pillar_stats deltas against a full rebuild
+from pillar_stats import apply_delta, read_stats, rebuild, record_scores, score_delta, stats_collection
+
+
+def _scores(**pillars):
+    return {"pillars": [{"name": name, "score": score, "stage": "High" if score >= 3 else "Low"}
+                        for name, score in pillars.items()],
+            "overall": sum(pillars.values())}
+
+
+def test_new_score_is_counted(mock_col):
+    stats_col = stats_collection(mock_col)
+    record_scores(stats_col, _scores(A=3, B=1))
+    stats = read_stats(stats_col, ["A", "B"])
+    assert stats["overall"] == {"count": 1, "mean": 4.0, "min": 4, "max": 4, "hist": {4: 1}}
+    assert [(p["name"], p["count"], p["hist"], p["stages"]) for p in stats["pillars"]] == [
+        ("A", 1, {3: 1}, {"High": 1}), ("B", 1, {1: 1}, {"Low": 1})]
+
+
+def test_changed_score_moves_the_histogram(mock_col):
+    stats_col = stats_collection(mock_col)
+    record_scores(stats_col, _scores(A=3, B=1))
+    record_scores(stats_col, _scores(A=2, B=4))
+    record_scores(stats_col, _scores(A=1, B=1), old_scores=_scores(A=3, B=1))
+    stats = read_stats(stats_col, ["A", "B"])
+    assert stats["overall"]["count"] == 2
+    assert stats["overall"]["hist"] == {2: 1, 6: 1}
+    a, b = stats["pillars"]
+    assert (a["count"], a["mean"], a["hist"], a["stages"]) == (2, 1.5, {1: 1, 2: 1}, {"Low": 2})
+    assert (b["min"], b["max"]) == (1, 4)
+
+
+def test_removed_pillar_drops_out(mock_col):
+    stats_col = stats_collection(mock_col)
+    record_scores(stats_col, _scores(A=3, Old=2))
+    record_scores(stats_col, _scores(A=3), old_scores=_scores(A=3, Old=2))
+    stats = read_stats(stats_col)
+    assert [p["name"] for p in stats["pillars"]] == ["A"]
+    assert stats["overall"]["count"] == 1
+
+
+def test_unscored_documents_are_ignored(mock_col):
+    stats_col = stats_collection(mock_col)
+    apply_delta(stats_col, score_delta([(None, None), (None, {"pillars": []})]))
+    assert stats_col.count_documents({}) == 0
+
+
+def test_rebuild_matches_accumulated_deltas(mock_col):
+    stats_col = stats_collection(mock_col)
+    history = [
+        (None, _scores(A=3, B=1)),
+        (None, _scores(A=2, B=4, Old=1)),
+        (None, _scores(A=5, B=0)),
+        (_scores(A=2, B=4, Old=1), _scores(A=2, B=2)),
+        (_scores(A=5, B=0), _scores(A=1, B=3)),
+    ]
+    for old, new in history:
+        record_scores(stats_col, new, old)
+    final = [_scores(A=3, B=1), _scores(A=2, B=2), _scores(A=1, B=3)]
+    mock_col.insert_many([{"scores": s} for s in final] + [{"answers": {}}])
+    incremental = read_stats(stats_col, ["A", "B"])
+
+    stats_col.insert_one({"_id": "pillar:Stale", "name": "Stale", "count": 5, "sum": 5, "hist": {"1": 5}})
+    assert rebuild(mock_col) == 3
+    assert read_stats(stats_col, ["A", "B"]) == incremental
+    assert stats_col.find_one({"_id": "pillar:Stale"}) is None
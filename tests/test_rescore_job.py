@@ -0,0 +1,66 @@
+# Re-scoring resume: pillar_stats must match the stored scores after a mid-batch crash
+import pytest
+
+import rescore_job
+from pillar_stats import read_stats, rebuild, record_scores, stats_collection
+from scoring import score_answers
+
+
+def _answers(text):
+    return {"fixed": [{"id": "Q01", "question": "Goal?", "answer": text, "type": "text"}]}
+
+
+TEXTS = ["kpi csat api gateway", "sso and otp on whatsapp", "we have not decided", "llm red-team monitoring",
+         "core banking integration", "fraud alerts and disputes"]
+
+
+@pytest.fixture
+def col(mock_col):
+    stats_col = stats_collection(mock_col)
+    for i, text in enumerate(TEXTS):
+        status = "analyzed" if i % 2 else "submitted"
+        # Stale scores from an older rule set: every document scored as if its answer were empty
+        old = score_answers(_answers(""))
+        mock_col.insert_one({"_id": i, "status": status, "answers": _answers(text), "scores": old})
+        record_scores(stats_col, old)
+    return mock_col
+
+
+def _expected(col):
+    stats_col = stats_collection(col)
+    rebuild(col)
+    return read_stats(stats_col)
+
+
+def test_rescore_updates_scores_and_keeps_status(col):
+    summary = rescore_job.rescore_collection(col, col.database["checkpoints"], "job", batch_size=2, workers=1)
+    assert summary["processed"] == len(TEXTS) and not summary["stats_rebuilt"]
+    for doc in col.find():
+        assert doc["scores"] == score_answers(doc["answers"])
+        assert doc["status"] == ("analyzed" if doc["_id"] % 2 else "submitted")
+    incremental = read_stats(stats_collection(col))
+    assert incremental == _expected(col)
+
+
+def test_crash_between_write_and_delta_is_repaired_on_resume(col, monkeypatch):
+    checkpoints = col.database["checkpoints"]
+    apply_delta = rescore_job.apply_delta
+    calls = []
+
+    def crash_on_second_batch(stats_col, delta):
+        calls.append(delta)
+        if len(calls) == 2:
+            raise RuntimeError("killed")
+        apply_delta(stats_col, delta)
+
+    monkeypatch.setattr(rescore_job, "apply_delta", crash_on_second_batch)
+    with pytest.raises(RuntimeError):
+        rescore_job.rescore_collection(col, checkpoints, "job", batch_size=2, workers=1)
+    assert checkpoints.find_one({"_id": "job"})["pending"] == 3
+
+    monkeypatch.setattr(rescore_job, "apply_delta", apply_delta)
+    summary = rescore_job.rescore_collection(col, checkpoints, "job", batch_size=2, workers=1)
+    assert summary["stats_rebuilt"] and summary["this_run"] == 4
+    assert "pending" not in checkpoints.find_one({"_id": "job"})
+    incremental = read_stats(stats_collection(col))
+    assert incremental == _expected(col)
@@ -0,0 +1,30 @@
+# Whole-word keyword matching: text scan against the token-stream matcher
+import random
+
+from scoring import document_text, get_engine, tokenize
+
+
+def _names(engine, ids):
+    return sorted(engine.keywords[i][0] for i in ids)
+
+
+def test_keywords_match_whole_words_only():
+    engine = get_engine()
+    text = "Send it to the address on file; our DR site and API-gateway are in scope."
+    found = _names(engine, engine.match_text(text))
+    assert "dr" in found and "api gateway" in found
+    assert _names(engine, engine.match_text("address")) == []
+
+
+def test_text_scan_matches_token_stream():
+    engine = get_engine()
+    keywords = [kw for kw, _ in engine.keywords]
+    filler = "address maintain the bank ai-ready kongress gateways red-teamed dr. x9 H100s".split()
+    separators = [" ", "-", "\n", ", ", "/", "é", "_", "."]
+    rng = random.Random(3)
+    for _ in range(2000):
+        text = "".join(rng.choice(keywords + filler) + rng.choice(separators) for _ in range(rng.randint(0, 10)))
+        answers = {"fixed": [{"answer": text[:len(text) // 2]}, {"answer": [text[len(text) // 2:], "api"]}],
+                   "section2": [{"answer": "gateway"}]}
+        tokens = [t for chunk in document_text(answers) for t in tokenize(chunk)]
+        assert engine.score_answers(answers) == engine.score_tokens(tokens), text
@@ -0,0 +1,153 @@
+# One-pass text statistics shared by the analytics renderers
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+_WORD = re.compile(r'\b\w+\b')
+_SENTENCE_END = re.compile(r'[.!?]+')
+
+# Term sets counted over every token; the first three also label answers
+TERM_SETS = {
+    'business': frozenset(['strategy', 'customer', 'business', 'process', 'system', 'technology', 'digital', 'innovation',
+                           'experience', 'solution', 'service', 'value', 'market', 'competitive', 'growth']),
+    'tech': frozenset(['api', 'integration', 'platform', 'cloud', 'data', 'analytics', 'ai', 'automation', 'security',
+                       'infrastructure', 'database', 'software', 'application', 'interface', 'architecture']),
+    'functional': frozenset(['requirement', 'specification', 'function', 'feature', 'capability', 'performance',
+                             'scalability', 'reliability', 'availability', 'usability']),
+    'positive': frozenset(['success', 'growth', 'positive', 'improve', 'efficient', 'secure', 'compliant']),
+    'negative': frozenset(['risk', 'fail', 'blocker', 'issue', 'problem', 'bias', 'concern']),
+}
+
+# Label precedence: an answer mentioning business and technical terms is a business answer
+LABEL_ORDER = ('business', 'tech', 'functional')
+
+LONG_ANSWER_CHARS = 100
+
+
+def answer_text(answer: Any) -> str:
+    """
+    The text of one answer as the dashboards read it: list answers are joined with spaces.
+    """
+    if isinstance(answer, list):
+        return ' '.join(str(item) for item in answer)
+    return str(answer)
+
+
+class TextProfile:
+    """
+    Everything the analytics views derive from the answer text, computed in one pass:
+    lowercased text and tokens per answer, a token Counter, term counts per TERM_SETS
+    category, a category label per answer, sentence count and answer lengths. Build one
+    per submission and hand it to every renderer instead of re-tokenizing.
+    """
+
+    def __init__(self, answers: Iterable[Any]):
+        self.texts: List[str] = []
+        self.answer_tokens: List[List[str]] = []
+        self.labels: List[str] = []
+        self.lengths: List[int] = []
+        self.tokens: Counter = Counter()
+        self.sentences = 0
+        for answer in answers:
+            text = answer_text(answer).lower()
+            tokens = _WORD.findall(text)
+            self.texts.append(text)
+            self.answer_tokens.append(tokens)
+            self.lengths.append(len(str(answer)))
+            self.tokens.update(tokens)
+            self.sentences += len(_SENTENCE_END.findall(text))
+            present = set(tokens)
+            self.labels.append(next((c for c in LABEL_ORDER if not TERM_SETS[c].isdisjoint(present)), 'general'))
+        self.text = ' '.join(self.texts)
+        self.term_counts: Dict[str, int] = {
+            name: sum(self.tokens[t] for t in terms) for name, terms in TERM_SETS.items()
+        }
+        self.long_answers: List[bool] = [n > LONG_ANSWER_CHARS for n in self.lengths]
+
+    @property
+    def total_words(self) -> int:
+        return sum(self.tokens.values())
+
+    @property
+    def unique_words(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def avg_word_length(self) -> float:
+        total = self.total_words
+        return sum(len(w) * c for w, c in self.tokens.items()) / total if total else 0.0
+
+    def mentions(self, term: str) -> bool:
+        """
+        Substring match against the combined text, for phrases and stems ("red-team", "monitor").
+        """
+        return term in self.text
+
+    def top_terms(self, n: int, min_length: int = 1) -> List[Tuple[str, int]]:
+        return [(w, c) for w, c in self.tokens.most_common() if len(w) >= min_length][:n]
+
+
+if __name__ == "__main__":
+    import random
+    import statistics
+    import time
+
+    rng = random.Random(7)
+    vocab = sorted(set().union(*TERM_SETS.values())) + (
+        "the a we our bank needs to with for and customers onboarding journey whatsapp containment escalation "
+        "latency compliance authentication dashboard retrieval monitoring red-team sandbox").split()
+
+    def sentence(n):
+        return " ".join(rng.choice(vocab) for _ in range(n)) + "."
+
+    answers = [rng.choice([["Retail", "Cards"], "Text-only", 3]) if i % 2 else
+               " ".join(sentence(rng.randint(8, 20)) for _ in range(rng.randint(1, 6))) for i in range(30)]
+    answers += [" ".join(sentence(rng.randint(10, 25)) for _ in range(rng.randint(4, 12))) for _ in range(20)]
+
+    # The per-renderer scans this module replaces, as they ran for one Step 4 view plus the insights charts
+    business_terms = sorted(TERM_SETS['business'])
+    tech_terms = sorted(TERM_SETS['tech'])
+    functional_terms = sorted(TERM_SETS['functional'])
+
+    def legacy():
+        combined_text = ' '.join(answer_text(a) for a in answers).lower()
+        words = re.findall(r'\b\w+\b', combined_text)
+        for _ in range(3):  # helix, brain and city each counted and classified on their own
+            sum(1 for word in words if word in business_terms)
+            sum(1 for word in words if word in tech_terms)
+            sum(1 for word in words if word in functional_terms)
+            for a in answers:
+                text = str(a).lower()
+                any(term in text for term in business_terms) or any(term in text for term in tech_terms)
+        len(set(words)), sum(len(w) for w in words), len(re.findall(r'[.!?]+', combined_text))
+        for a in answers:  # galaxy planets
+            re.findall(r'\b\w+\b', str(a).lower())
+        for word in [w for w in set(words) if len(w) > 4][:10]:  # ocean fish schools
+            len([w for w in words if w == word])
+        # analytics_charts
+        all_text = " ".join(str(a) for a in answers).lower()
+        chart_words = [w for a in answers for w in str(a).lower().split() if len(w) > 3]
+        Counter(chart_words).most_common(5)
+        sum(1 for w in chart_words if w in ["success", "growth", "positive", "improve", "efficient", "secure", "compliant"])
+        sum(1 for w in chart_words if w in ["risk", "fail", "blocker", "issue", "problem", "bias", "concern"])
+        sum(1 for kw in ["bias", "fairness", "ethics", "content", "monitor", "red-team"] if kw in all_text)
+
+    def profiled():
+        profile = TextProfile(answers)
+        profile.term_counts, profile.labels, profile.unique_words, profile.avg_word_length, profile.sentences
+        [w for w in profile.tokens if len(w) > 4][:10]
+        profile.top_terms(5, min_length=4)
+        sum(1 for kw in ["bias", "fairness", "ethics", "content", "monitor", "red-team"] if profile.mentions(kw))
+
+    def bench(fn, reps=50):
+        times = []
+        for _ in range(reps):
+            started = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - started)
+        return statistics.median(times) * 1000
+
+    profile = TextProfile(answers)
+    print(f"{len(answers)} answers, {profile.total_words} words, {profile.unique_words} unique")
+    print(f"per-renderer scans: {bench(legacy):7.2f} ms")
+    print(f"TextProfile:        {bench(profiled):7.2f} ms")